@@ -1,16 +1,25 @@
 """Módulo de implementação do esquema de autenticação Bearer JWT."""
+from typing import Mapping, Optional
+
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
 # CORREÇÃO: As importações relativas '..' foram trocadas por absolutas a partir de 'app'.
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models import User
 # A importação abaixo está correta, pois é relativa dentro do mesmo pacote.
-from .auth_handler import decode_jwt
+from .auth_handler import verify_token
+from .user_cache import UserSnapshot, cache_user, get_cached_user
 
 class JWTBearer(HTTPBearer):
-    """Verifica o token JWT Bearer."""
+    """
+    Verifica o token JWT Bearer e devolve as claims já validadas.
+    [OTIMIZAÇÃO DE PERFORMANCE] O token é decodificado uma única vez por
+    requisição (e reaproveitado do cache entre requisições); get_current_user
+    recebe as claims prontas em vez de decodificar de novo.
+    """
     def __init__(self, auto_error: bool = False): # <--- MUDANÇA: auto_error=False
         super().__init__(auto_error=auto_error)
 
@@ -24,34 +33,84 @@ class JWTBearer(HTTPBearer):
         if not credentials.scheme == "Bearer":
             raise HTTPException(status_code=401, detail="Esquema de autenticação inválido.")
 
-        if not self.verify_jwt(credentials.credentials):
+        payload = self.verify_jwt(credentials.credentials)
+        if payload is None:
             raise HTTPException(status_code=401, detail="Token inválido ou expirado.")
 
-        return credentials.credentials
-
-    def verify_jwt(self, jwtoken: str) -> bool:
-        payload = decode_jwt(jwtoken)
-        return payload is not None
+        return payload
 
-def get_current_user(token: str = Depends(JWTBearer()), db: Session = Depends(get_db)):
-    payload = decode_jwt(token)
-    if payload is None:
-        raise HTTPException(status_code=401, detail="Token inválido ou expirado") # CORREÇÃO
+    def verify_jwt(self, jwtoken: str) -> Optional[Mapping]:
+        return verify_token(jwtoken)
 
+def _user_id_from_claims(payload: Mapping) -> int:
     user_id_str = payload.get("sub")
     if user_id_str is None:
         raise HTTPException(status_code=401, detail="Token inválido: identificador ausente") # CORREÇÃO
 
     try:
-        user_id = int(user_id_str)
+        return int(user_id_str)
     except (ValueError, TypeError) as exc:
         raise HTTPException(
             status_code=401, # CORREÇÃO
             detail='Token inválido: formato de identificador incorreto'
         ) from exc
 
+def get_current_user(payload: Mapping = Depends(JWTBearer()), db: Session = Depends(get_db)):
+    """
+    [OTIMIZAÇÃO DE PERFORMANCE - CACHE DO USUÁRIO AUTENTICADO]
+    Retorna um UserSnapshot somente leitura. Dentro do TTL configurado, o
+    SELECT em users (a query mais repetida da API) não é executado.
+    """
+    user_id = _user_id_from_claims(payload)
+
+    snapshot = get_cached_user(user_id)
+    if snapshot is not None:
+        return snapshot
+
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(status_code=401, detail="Usuário não encontrado") # CORREÇÃO
 
+    return cache_user(user)
+
+def get_current_user_for_update(
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """Entrega o User anexado à sessão da requisição, para endpoints que o alteram."""
+    if isinstance(current_user, User) and object_session(current_user) is db:
+        return current_user
+
+    user = db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado")
+
+    return user
+
+async def get_current_user_async(
+    payload: Mapping = Depends(JWTBearer()),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Versão de get_current_user para os routers assíncronos (DB_MODE=async)."""
+    user_id = _user_id_from_claims(payload)
+
+    snapshot = get_cached_user(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    user = await db.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado")
+
+    return cache_user(user)
+
+async def get_current_user_for_update_async(
+    current_user: UserSnapshot = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Versão de get_current_user_for_update para os routers assíncronos."""
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado")
+
     return user
@@ -1,13 +1,33 @@
+import time
 from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 # 2. Importações de bibliotecas de terceiros (em ordem alfabética)
 import bcrypt
-from jose import jwt
+
+from app.auth.hashing_pool import password_hashing_pool
+from app.utils.cache import TTLCache
 
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Cache de tokens já verificados (assinatura + claims)
+TOKEN_CACHE_MAX_SIZE = 4096
+TOKEN_CACHE_TTL_SECONDS = 60
+
+_verified_tokens = TTLCache(max_size=TOKEN_CACHE_MAX_SIZE, ttl_seconds=TOKEN_CACHE_TTL_SECONDS)
+
+
+def _jwt():
+    """
+    Importa o python-jose no primeiro token emitido ou verificado: a importação
+    carrega o backend do cryptography (~40 ms) e rotas como /health não precisam dele.
+    """
+    from jose import jwt  # pylint: disable=import-outside-toplevel
+    return jwt
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica a senha usando bcrypt diretamente"""
@@ -32,15 +52,26 @@ def get_password_hash(password: str) -> str:
         raise
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password executado no pool limitado de bcrypt (pode lançar HashingPoolSaturated)."""
+    return await password_hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash executado no pool limitado de bcrypt (pode lançar HashingPoolSaturated)."""
+    return await password_hashing_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _jwt().encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_jwt(token: str):
+    jwt = _jwt()
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
@@ -48,3 +79,30 @@ def decode_jwt(token: str):
         return None
     except jwt.JWTError:
         return None
+
+
+def verify_token(token: str) -> Optional[Mapping]:
+    """
+    [OTIMIZAÇÃO DE PERFORMANCE - CACHE DE TOKENS VERIFICADOS]
+    Decodifica e valida o token no máximo uma vez por TTL. A entrada nunca vive
+    além do 'exp' do próprio token, então um token expirado não é aceito do cache.
+    Retorna as claims como mapeamento somente leitura (compartilhado entre requisições).
+    """
+    claims = _verified_tokens.get(token)
+    if claims is not None:
+        return claims
+
+    payload = decode_jwt(token)
+    if payload is None:
+        return None
+
+    claims = MappingProxyType(payload)
+    expires_at = payload.get("exp")
+    remaining = expires_at - time.time() if isinstance(expires_at, (int, float)) else None
+    _verified_tokens.set(token, claims, remaining)
+    return claims
+
+
+def clear_token_cache():
+    """Esvazia o cache de tokens verificados (ex.: troca de SECRET_KEY, testes)."""
+    _verified_tokens.clear()
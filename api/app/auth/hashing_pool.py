@@ -0,0 +1,76 @@
+"""Pool limitado de threads para as operações de bcrypt."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from app.database import settings
+
+
+class HashingPoolSaturated(RuntimeError):
+    """A fila do pool de hashing está cheia; a requisição deve falhar rápido."""
+
+
+class PasswordHashingPool:
+    """
+    [OTIMIZAÇÃO DE PERFORMANCE - BCRYPT FORA DO THREADPOOL PRINCIPAL]
+    Cada hash/verificação de bcrypt custa dezenas de milissegundos de CPU.
+    Executá-los aqui limita quantos rodam ao mesmo tempo (max_workers) e quantos
+    podem esperar na fila (max_pending); acima disso HashingPoolSaturated é
+    lançada na hora, em vez de acumular requisições e travar o restante da API.
+    Threads bastam: o bcrypt libera o GIL durante o cálculo do hash.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+            return self._executor
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func: Callable, *args):
+        """Executa func(*args) no pool e aguarda o resultado sem bloquear o event loop."""
+        if self.max_workers <= 0:
+            return func(*args)
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HashingPoolSaturated("Fila de hashing de senhas cheia")
+            self._pending += 1
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Libera a vaga só quando a thread termina, mesmo se a requisição for cancelada
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hashing_pool = PasswordHashingPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,61 @@
+"""Cache por processo dos dados do usuário autenticado."""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.database import settings
+from app.models import User
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    Cópia imutável e desacoplada da sessão de um User.
+    Suficiente para endpoints de leitura (id, pontos, streak...). Endpoints que
+    alteram o usuário devem usar get_current_user_for_update.
+    """
+    id: int
+    email: str
+    username: str
+    total_points: int
+    current_streak: int
+    last_activity_date: Optional[datetime]
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            total_points=user.total_points or 0,
+            current_streak=user.current_streak or 0,
+            last_activity_date=user.last_activity_date,
+            created_at=user.created_at,
+        )
+
+
+_user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def get_cached_user(user_id: int) -> Optional[UserSnapshot]:
+    return _user_cache.get(user_id)
+
+
+def cache_user(user: User) -> UserSnapshot:
+    snapshot = UserSnapshot.from_model(user)
+    _user_cache.set(user.id, snapshot)
+    return snapshot
+
+
+def invalidate_user_cache(user_id: int):
+    """Deve ser chamada após o commit de qualquer escrita que altere o usuário."""
+    _user_cache.pop(user_id)
+
+
+def clear_user_cache():
+    _user_cache.clear()
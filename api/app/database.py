@@ -1,8 +1,14 @@
 """Módulo de configuração da base de dados e gestão de sessões."""
+import threading
+from typing import Literal, Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.utils.metrics import request_metrics
+from app.utils.pool_monitor import InstrumentedAsyncQueuePool, InstrumentedQueuePool, PoolMonitor
+
 #MODO 1: AMBIENTE DE TESTES / QA (Local)
 #SQLALCHEMY_DATABASE_URL = "sqlite:///./studystreak.db"
 # ==============================================================================
@@ -13,6 +19,41 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     DATABASE_URL: str
 
+    # "sync": routers com Session no threadpool | "async": AsyncSession (aiosqlite/asyncpg)
+    DB_MODE: Literal["sync", "async"] = "sync"
+    # Opcional: por padrão é derivada de DATABASE_URL (ver to_async_url)
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Pool de conexões: some (workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW)) e compare
+    # com o max_connections do Postgres antes de escalar horizontalmente
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Conexões retidas além deste tempo são logadas (0 desliga). A pilha do checkout
+    # só é capturada com DB_LEAK_CAPTURE_STACKS, que custa ~0,1 ms por checkout
+    DB_LEAK_THRESHOLD_SECONDS: float = 30.0
+    DB_LEAK_CAPTURE_STACKS: bool = False
+
+    # Middleware de métricas por requisição e GET /metrics (formato Prometheus)
+    METRICS_ENABLED: bool = True
+
+    # Caminho rápido de serialização de GET /tasks/ e /users/dashboard (app/utils/fast_json.py)
+    FAST_JSON_ENABLED: bool = False
+
+    # Cache do usuário autenticado (app/auth/user_cache.py)
+    USER_CACHE_TTL_SECONDS: float = 5.0
+    USER_CACHE_MAX_SIZE: int = 2048
+
+    # Serverless (api/vercel.json): não cria o esquema na importação de app.main.
+    # O esquema e os dados padrão ficam a cargo de `alembic upgrade head`
+    COLD_START_MODE: bool = False
+
+    # Pool dedicado ao bcrypt (app/auth/hashing_pool.py); 0 workers = execução inline
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
     class Config:
         env_file = ".env"
 
@@ -21,13 +62,77 @@ SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 # ==============================================================================
 
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    # O argumento 'connect_args' é específico e necessário para o SQLite.
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
+def pool_options(url: str, async_engine: bool = False) -> dict:
+    """
+    Parâmetros de pool a partir de Settings. SQLite em memória mantém o pool
+    padrão do dialeto (uma única conexão compartilhada).
+    """
+    if ":memory:" in url or "mode=memory" in url:
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+# Métricas expostas em GET /health/pool
+pool_monitor = PoolMonitor(
+    leak_threshold_seconds=settings.DB_LEAK_THRESHOLD_SECONDS,
+    capture_stacks=settings.DB_LEAK_CAPTURE_STACKS,
+)
+async_pool_monitor = PoolMonitor(
+    leak_threshold_seconds=settings.DB_LEAK_THRESHOLD_SECONDS,
+    capture_stacks=settings.DB_LEAK_CAPTURE_STACKS,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Cria o engine no primeiro uso. create_engine não conecta, mas importa o
+    driver e monta o pool: em um cold start, isso fica para a primeira
+    requisição que realmente acessa o banco.
+    """
+    global _engine  # pylint: disable=global-statement
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(
+                    SQLALCHEMY_DATABASE_URL,
+                    # O argumento 'connect_args' é específico e necessário para o SQLite.
+                    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {},
+                    **pool_options(SQLALCHEMY_DATABASE_URL)
+                )
+                pool_monitor.attach(_engine)
+                request_metrics.attach(_engine)
+    return _engine
+
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker que só obtém o engine (get_engine) ao abrir a primeira sessão."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
+
+
+def __getattr__(name):
+    # `from app.database import engine` continua funcionando (scripts e código
+    # antigo), mas o engine só é criado quando alguém pede por ele
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 Base = declarative_base()
 
@@ -37,3 +142,56 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ==============================================================================
+# MODO ASSÍNCRONO (DB_MODE=async)
+# O engine assíncrono só é criado no primeiro uso: em modo síncrono, drivers como
+# aiosqlite/asyncpg nem precisam estar instalados.
+# ==============================================================================
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+_async_engine = None
+_async_session_factory = None
+
+
+def to_async_url(url: str) -> str:
+    """Troca o driver síncrono da URL pelo equivalente assíncrono."""
+    scheme, separator, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"Sem driver assíncrono conhecido para '{dialect}'")
+    return f"{ASYNC_DRIVERS[dialect]}{separator}{rest}"
+
+
+def get_async_engine():
+    global _async_engine  # pylint: disable=global-statement
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine  # pylint: disable=import-outside-toplevel
+
+        url = settings.ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+        _async_engine = create_async_engine(url, **pool_options(url, async_engine=True))
+        async_pool_monitor.attach(_async_engine.sync_engine)
+        request_metrics.attach(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_async_session_factory():
+    global _async_session_factory  # pylint: disable=global-statement
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker  # pylint: disable=import-outside-toplevel
+
+        # expire_on_commit=False: acessar atributos após o commit não pode disparar I/O implícito
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
@@ -1,13 +1,33 @@
 """Módulo principal da aplicação FastAPI."""
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-
-from app.database import engine, get_db
-from app.models import Base, Subject as SubjectModel, Task as TaskModel
+from sqlalchemy import inspect
+
+from app.database import (
+    SessionLocal,
+    async_pool_monitor,
+    get_async_engine,
+    get_engine,
+    pool_monitor,
+    settings,
+)
+from app.models import Base
 from app.routers import auth, subjects, tasks, users
 from app.services.badge_service import initialize_badges
-
-Base.metadata.create_all(bind=engine)
+from app.utils.metrics import METRICS_CONTENT_TYPE, MetricsMiddleware, request_metrics
+
+# Em COLD_START_MODE a importação não toca o banco: o esquema vem de
+# `alembic upgrade head`, rodado no deploy e não a cada instância.
+# Fora dele, só um banco vazio (teste/desenvolvimento) é criado aqui: em um
+# banco que já tem tabelas (gerenciado pelo Alembic ou anterior a ele) o
+# create_all acrescentaria só as tabelas novas, sem as colunas novas das
+# existentes, e o `alembic upgrade head` seguinte falharia
+if not settings.COLD_START_MODE and not inspect(get_engine()).get_table_names():
+    Base.metadata.create_all(bind=get_engine())
+    # Sem Alembic, a migração 0006 não roda: os badges padrão vêm daqui
+    # (um SELECT dos nomes; só insere os que faltam)
+    with SessionLocal() as db:
+        initialize_badges(db)
 
 app = FastAPI(
     title="StudyStreak API",
@@ -29,59 +49,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Adicionado por último = camada mais externa: mede também o CORS e as respostas de erro
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=request_metrics)
+
+# DB_MODE=async troca os routers de dados pelas versões com AsyncSession
+# (mesmos caminhos e contratos); auth já é assíncrono nos dois modos
+if settings.DB_MODE == "async":
+    from app.routers.aio import subjects, tasks, users  # noqa: F811  pylint: disable=ungrouped-imports
+
 app.include_router(auth.router)
 app.include_router(tasks.router)
 app.include_router(users.router)
 app.include_router(subjects.router)
 
-@app.on_event("startup")
-def startup_event():
-    """Inicializa dados padrão na startup, como as badges."""
-    db = next(get_db())
-    initialize_badges(db)
-    migrate_subjects(db)
-
-def migrate_subjects(db):
-    """
-    Migração: garante que todas as tarefas tenham disciplina
-    e cria registros Subject a partir dos dados existentes.
-    """
-    from sqlalchemy import or_
-
-    # 1. Atribuir "Geral" a tarefas sem disciplina
-    tasks_without_subject = db.query(TaskModel).filter(
-        or_(TaskModel.subject == None, TaskModel.subject == "")  # noqa: E711
-    ).all()
-
-    for task in tasks_without_subject:
-        task.subject = "Geral"
-
-    if tasks_without_subject:
-        db.commit()
-
-    # 2. Criar registros Subject a partir dos subjects distintos das tarefas
-    # Agrupa por (owner_id, subject) para criar disciplinas por usuário
-    distinct_subjects = db.query(
-        TaskModel.owner_id, TaskModel.subject
-    ).filter(
-        TaskModel.subject.isnot(None),
-        TaskModel.subject != ""
-    ).distinct().all()
-
-    for owner_id, subject_name in distinct_subjects:
-        existing = db.query(SubjectModel).filter(
-            SubjectModel.owner_id == owner_id,
-            SubjectModel.name == subject_name
-        ).first()
-
-        if not existing:
-            db_subject = SubjectModel(name=subject_name, owner_id=owner_id)
-            db.add(db_subject)
-
-    db.commit()
-
 @app.get("/")
 def read_root():
     """Endpoint raiz da API."""
@@ -96,3 +80,25 @@ def read_root():
 def health_check():
     """Endpoint para verificação de saúde da API."""
     return {"status": "healthy", "message": "API está funcionando corretamente"}
+
+@app.get("/health/pool")
+def pool_health():
+    """
+    Estado do pool de conexões: tamanho, conexões em uso, overflow, tempos de
+    espera por conexão e conexões retidas além do limite (com a pilha do checkout,
+    se DB_LEAK_CAPTURE_STACKS estiver ligado).
+    """
+    data = {"status": "healthy", **pool_monitor.snapshot(get_engine())}
+    if settings.DB_MODE == "async":
+        data["async"] = async_pool_monitor.snapshot(get_async_engine().sync_engine)
+    if data["leaks"] or data.get("async", {}).get("leaks"):
+        data["status"] = "degraded"
+    return data
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Métricas do processo no formato de exposição do Prometheus: latência,
+    tamanho da resposta, comandos SQL e tempo de banco por rota.
+    """
+    return Response(request_metrics.render(), media_type=METRICS_CONTENT_TYPE)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -20,6 +20,27 @@ class User(Base):
     tasks = relationship("Task", back_populates="owner")
     badges = relationship("UserBadge", back_populates="user")
     subjects = relationship("Subject", back_populates="owner")
+    stats = relationship("UserStats", back_populates="user", uselist=False)
+
+
+class UserStats(Base):
+    """
+    [OTIMIZAÇÃO DE PERFORMANCE - CONTADORES DESNORMALIZADOS]
+    Totais por usuário mantidos incrementalmente na mesma transação das escritas
+    em tarefas (ver app/services/stats_service.py). Badges e dashboard leem esta
+    linha pela chave primária em vez de rodar COUNT/SUM sobre todo o histórico.
+    """
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    completed_count = Column(Integer, default=0, nullable=False)
+    pending_count = Column(Integer, default=0, nullable=False)
+    task_points = Column(Integer, default=0, nullable=False)
+    # Versão monotônica dos dados do usuário (tarefas, disciplinas, pontuação);
+    # incrementada a cada escrita e usada como ETag nas leituras (app/utils/etag.py)
+    data_version = Column(Integer, default=0, nullable=False)
+
+    user = relationship("User", back_populates="stats")
 
 
 class Task(Base):
@@ -39,6 +60,21 @@ class Task(Base):
     owner_id = Column(Integer, ForeignKey("users.id"))
     owner = relationship("User", back_populates="tasks")
 
+    # [OTIMIZAÇÃO DE PERFORMANCE - ÍNDICES DOS CAMINHOS QUENTES]
+    # Toda query de tarefas filtra por owner_id; os índices compostos seguem a
+    # ordem WHERE -> ORDER BY (due_date ASC, weight DESC, id) da listagem.
+    # Mantidos em sincronia com migrations/versions/0002_task_hot_path_indexes.py
+    __table_args__ = (
+        Index("ix_tasks_owner_due_weight", owner_id, due_date, weight.desc(), id),
+        Index("ix_tasks_owner_completed_due", owner_id, is_completed, due_date, weight.desc()),
+        Index("ix_tasks_owner_subject", owner_id, subject),
+        Index(
+            "ix_tasks_owner_pending_due", owner_id, due_date, weight.desc(),
+            postgresql_where=is_completed == False,  # noqa: E712
+            sqlite_where=is_completed == False,  # noqa: E712
+        ),
+    )
+
 
 class Badge(Base):
     __tablename__ = "badges"
@@ -49,6 +85,7 @@ class Badge(Base):
     icon = Column(String)
     points_required = Column(Integer, default=0)
     tasks_required = Column(Integer, default=0)
+    streak_required = Column(Integer, default=0)
 
     user_badges = relationship("UserBadge", back_populates="badge")
 
@@ -64,6 +101,10 @@ class UserBadge(Base):
     user = relationship("User", back_populates="badges")
     badge = relationship("Badge", back_populates="user_badges")
 
+    __table_args__ = (
+        Index("ix_user_badges_user_badge", user_id, badge_id),
+    )
+
 
 class Subject(Base):
     __tablename__ = "subjects"
@@ -74,3 +115,7 @@ class Subject(Base):
 
     owner_id = Column(Integer, ForeignKey("users.id"))
     owner = relationship("User", back_populates="subjects")
+
+    __table_args__ = (
+        Index("ix_subjects_owner_name", owner_id, name),
+    )
@@ -0,0 +1,92 @@
+"""Versão assíncrona do router de disciplinas (DB_MODE=async)."""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.auth_bearer import get_current_user_async
+from app.database import get_async_db
+from app.models import Subject as SubjectModel
+from app.models import User
+from app.schemas import Subject, SubjectCreate
+from app.services.stats_service import get_user_stats_async, touch_user_data
+from app.utils.etag import conditional_get_async
+
+router = APIRouter(prefix="/subjects", tags=["Subjects"])
+
+
+@router.post("/", response_model=Subject, status_code=status.HTTP_201_CREATED)
+async def create_subject(
+    subject: SubjectCreate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Cria uma nova disciplina para o usuário"""
+    existing = await db.scalar(
+        select(SubjectModel.id).where(
+            SubjectModel.owner_id == current_user.id,
+            SubjectModel.name == subject.name
+        )
+    )
+
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Disciplina com este nome já existe"
+        )
+
+    db_subject = SubjectModel(
+        name=subject.name,
+        owner_id=current_user.id
+    )
+
+    db.add(db_subject)
+    touch_user_data(await get_user_stats_async(current_user.id, db))
+    await db.commit()
+    await db.refresh(db_subject)
+
+    return db_subject
+
+
+@router.get(
+    "/", response_model=List[Subject],
+    dependencies=[Depends(conditional_get_async("subjects"))]
+)
+async def list_subjects(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Lista todas as disciplinas do usuário"""
+    subjects = await db.scalars(
+        select(SubjectModel).where(
+            SubjectModel.owner_id == current_user.id
+        ).order_by(SubjectModel.name.asc())
+    )
+
+    return subjects.all()
+
+
+@router.delete("/{subject_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_subject(
+    subject_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Deleta uma disciplina do usuário"""
+    subject = await db.scalar(
+        select(SubjectModel).where(
+            SubjectModel.id == subject_id,
+            SubjectModel.owner_id == current_user.id
+        )
+    )
+
+    if not subject:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Disciplina não encontrada"
+        )
+
+    await db.delete(subject)
+    touch_user_data(await get_user_stats_async(current_user.id, db))
+    await db.commit()
@@ -0,0 +1,336 @@
+"""
+Versão assíncrona do router de tarefas (DB_MODE=async).
+Mesmos caminhos, contratos e regras de app/routers/tasks.py, mas com AsyncSession:
+as requisições esperam o banco no event loop em vez de ocupar uma thread do pool.
+"""
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.auth_bearer import get_current_user_async, get_current_user_for_update_async
+from app.database import get_async_db
+from app.models import Task as TaskModel
+from app.models import User
+from app.schemas import (
+    Task,
+    TaskBatchResponse,
+    TaskBulkCreate,
+    TaskBulkResult,
+    TaskCompleteBatch,
+    TaskCreate,
+    TaskFilterParams,
+    TaskResponse,
+    TaskUpdate,
+)
+from app.services.score_service import (
+    process_task_completion_async,
+    process_tasks_completion_async,
+)
+from app.services.stats_service import (
+    get_user_stats_async,
+    record_task_created,
+    record_task_deleted,
+    touch_user_data,
+)
+from app.services.task_service import (
+    check_completion_batch,
+    create_tasks_bulk_async,
+    user_tasks_query,
+    validate_bulk_tasks,
+)
+from app.utils.etag import conditional_get_async
+from app.utils.export import (
+    CSV_EXPORT_VARY,
+    EXPORT_VARY,
+    ExportPlan,
+    csv_export_plan_dependency,
+    export_plan_dependency,
+    export_tasks_generator_async,
+    gzip_chunks_async,
+    tasks_export_query,
+)
+from app.utils.fast_json import (
+    fast_json_enabled,
+    json_response,
+    task_columns,
+    task_list_adapter,
+)
+from app.utils.fieldsets import task_fields_dependency
+from app.utils.pagination import (
+    TASK_CURSOR_FIELDS,
+    InvalidCursorError,
+    encode_task_cursor,
+    task_keyset_order,
+    task_keyset_segments,
+)
+
+router = APIRouter(prefix="/tasks", tags=["Tasks"])
+
+async def get_task_for_user_dependency(
+    task_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+) -> TaskModel:
+    """Dependência para buscar uma tarefa específica do usuário logado."""
+    task = await db.scalar(
+        select(TaskModel).where(
+            TaskModel.id == task_id,
+            TaskModel.owner_id == current_user.id
+        )
+    )
+
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tarefa não encontrada"
+        )
+    return task
+
+@router.post("/", response_model=Task, status_code=status.HTTP_201_CREATED)
+async def create_task(
+    task: TaskCreate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Cria uma nova tarefa para o usuário"""
+    stats = await get_user_stats_async(current_user.id, db)
+
+    db_task = TaskModel(
+        **task.dict(),
+        owner_id=current_user.id
+    )
+
+    db.add(db_task)
+    record_task_created(stats)
+    await db.commit()
+    await db.refresh(db_task)
+
+    return db_task
+
+@router.post("/bulk", response_model=TaskBulkResult, status_code=status.HTTP_201_CREATED)
+async def create_tasks_in_bulk(
+    payload: TaskBulkCreate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Cria várias tarefas de uma vez, numa única transação (ver a versão síncrona)."""
+    tasks, errors = validate_bulk_tasks(payload.tasks)
+
+    if errors and not payload.partial:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors
+        )
+
+    created = await create_tasks_bulk_async(current_user.id, tasks, db) if tasks else []
+    return {"created": created, "errors": errors}
+
+@router.get(
+    "/", response_model=List[Task],
+    dependencies=[Depends(conditional_get_async("tasks"))]
+)
+async def list_tasks(
+    response: Response,
+    filters: TaskFilterParams = Depends(),
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields_dependency),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Lista as tarefas do usuário com filtros opcionais.
+    Quando a página vem cheia, o cabeçalho X-Next-Cursor traz o cursor da próxima.
+    Com fields, cada tarefa traz só os campos pedidos (e o id).
+    """
+    fast_json = fields is not None or fast_json_enabled()
+    query = select(*task_columns(fields, extra=TASK_CURSOR_FIELDS)) if fast_json else select(TaskModel)
+    query = query.where(TaskModel.owner_id == current_user.id)
+
+    if filters.subject:
+        query = query.where(TaskModel.subject == filters.subject)
+
+    if filters.completed is not None:
+        query = query.where(TaskModel.is_completed == filters.completed)
+
+    query = query.order_by(*task_keyset_order())
+
+    if filters.cursor:
+        try:
+            segments = task_keyset_segments(filters.cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            ) from exc
+        pages = [query.where(condition) for condition in segments]
+    else:
+        pages = [query.offset(filters.skip)]
+
+    tasks = []
+    for page in pages:
+        result = await db.execute(page.limit(filters.limit - len(tasks)))
+        tasks += result.all() if fast_json else result.scalars().all()
+        if len(tasks) == filters.limit:
+            break
+
+    if len(tasks) == filters.limit:
+        response.headers["X-Next-Cursor"] = encode_task_cursor(tasks[-1])
+
+    if fast_json:
+        return json_response(task_list_adapter(fields), tasks, response)
+    return tasks
+
+@router.get(
+    "/export", dependencies=[Depends(conditional_get_async("tasks-export", vary=EXPORT_VARY))]
+)
+async def export_tasks(
+    response: Response,
+    plan: ExportPlan = Depends(export_plan_dependency),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Exporta todas as tarefas do usuário (CSV ou NDJSON, opcionalmente em gzip), em blocos."""
+    return _export_response(plan, response, current_user.id, db)
+
+@router.get(
+    "/export.csv",
+    dependencies=[Depends(conditional_get_async("tasks-export", vary=CSV_EXPORT_VARY))]
+)
+async def export_tasks_csv(
+    response: Response,
+    plan: ExportPlan = Depends(csv_export_plan_dependency),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Exporta as tarefas em CSV, qualquer que seja o Accept (gzip só pelo Accept-Encoding)."""
+    return _export_response(plan, response, current_user.id, db)
+
+def _export_response(
+    plan: ExportPlan, response: Response, user_id: int, db: AsyncSession
+) -> StreamingResponse:
+    query = tasks_export_query(user_id)
+    bind = db.bind
+
+    async def rows():
+        # Sessão própria: a da requisição é fechada antes do fim do streaming
+        async with AsyncSession(bind) as export_db:
+            async for row in await export_db.stream(query):
+                yield row
+
+    chunks = export_tasks_generator_async(rows(), encoder=plan.encoder)
+    if plan.compressed:
+        chunks = gzip_chunks_async(chunks)
+
+    streaming = StreamingResponse(chunks, media_type=plan.media_type, headers=plan.headers())
+    # ETag e Vary vêm da dependência condicional; numa Response própria o FastAPI não os copia
+    streaming.headers.raw.extend(response.headers.raw)
+    return streaming
+
+@router.patch("/complete", response_model=TaskBatchResponse)
+async def complete_tasks(
+    payload: TaskCompleteBatch,
+    current_user: User = Depends(get_current_user_for_update_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Conclui várias tarefas de uma vez ("marcar todas como feitas"), com uma
+    única avaliação de streak e badges e um único commit. O lote é recusado
+    inteiro se algum id não existir (404) ou já estiver concluído (400).
+    """
+    task_ids = list(dict.fromkeys(payload.task_ids))
+    tasks = (await db.scalars(user_tasks_query(current_user.id, task_ids))).all()
+    missing, already_completed = check_completion_batch(task_ids, tasks)
+
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tarefas não encontradas: {missing}"
+        )
+    if already_completed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tarefas já concluídas: {already_completed}"
+        )
+
+    return await process_tasks_completion_async(current_user, tasks, db)
+
+@router.get(
+    "/{task_id:int}", response_model=Task,
+    dependencies=[Depends(get_task_for_user_dependency), Depends(conditional_get_async("task"))]
+)
+async def get_task(
+    task: TaskModel = Depends(get_task_for_user_dependency)
+):
+    """Busca uma tarefa específica do usuário"""
+    return task
+
+@router.patch("/{task_id:int}/complete", response_model=TaskResponse)
+async def complete_task(
+    task: TaskModel = Depends(get_task_for_user_dependency),
+    current_user: User = Depends(get_current_user_for_update_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Marca uma tarefa como concluída delegando para a camada de serviço"""
+    if task.is_completed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tarefa já foi concluída"
+        )
+
+    return await process_task_completion_async(current_user, task, db)
+
+@router.delete("/{task_id:int}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task(
+    task: TaskModel = Depends(get_task_for_user_dependency),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Deleta uma tarefa do usuário"""
+    stats = await get_user_stats_async(task.owner_id, db)
+    record_task_deleted(stats, task)
+    await db.delete(task)
+    await db.commit()
+
+@router.put("/{task_id:int}", response_model=Task)
+async def update_task(
+    task_data: TaskUpdate,
+    task: TaskModel = Depends(get_task_for_user_dependency),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Atualiza uma tarefa do usuário"""
+    update_dict = task_data.dict(exclude_unset=True)
+
+    if not update_dict:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nenhum campo para atualizar"
+        )
+
+    stats = await get_user_stats_async(task.owner_id, db)
+    for field, value in update_dict.items():
+        setattr(task, field, value)
+    touch_user_data(stats)
+
+    await db.commit()
+    await db.refresh(task)
+
+    return task
+
+@router.get(
+    "/subjects/list", response_model=List[str],
+    dependencies=[Depends(conditional_get_async("task-subjects"))]
+)
+async def list_subjects(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Lista todas as disciplinas distintas das tarefas do usuário"""
+    subjects = await db.scalars(
+        select(TaskModel.subject).where(
+            TaskModel.owner_id == current_user.id,
+            TaskModel.subject.isnot(None)
+        ).distinct()
+    )
+
+    return subjects.all()
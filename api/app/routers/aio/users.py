@@ -0,0 +1,104 @@
+"""Versão assíncrona do router de utilizadores (DB_MODE=async)."""
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.auth.auth_bearer import get_current_user_async
+from app.database import get_async_db
+from app.models import User as UserModel
+from app.models import UserBadge as UserBadgeModel
+from app.schemas import TasksBySubject, User, UserDashboard, UserStats
+from app.services.stats_service import (
+    build_user_summary,
+    get_user_stats_async,
+    subject_rollup_query,
+    user_summary_query,
+)
+from app.utils.etag import conditional_get_async
+from app.utils.fast_json import (
+    as_dicts,
+    dashboard_adapter,
+    dashboard_badges_query,
+    dashboard_tasks_query,
+    fast_json_enabled,
+    json_response,
+)
+from app.utils.fieldsets import task_fields_dependency
+
+router = APIRouter(prefix="/users", tags=["Users"])
+
+
+@router.get("/me", response_model=User)
+async def get_current_user_info(current_user: UserModel = Depends(get_current_user_async)):
+    """Retorna informações do usuário atual."""
+    return current_user
+
+
+@router.get(
+    "/dashboard", response_model=UserDashboard,
+    dependencies=[Depends(conditional_get_async("dashboard"))]
+)
+async def get_user_dashboard(
+    response: Response,
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields_dependency),
+    current_user: UserModel = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Retorna dashboard completo do usuário. Com fields, recorta as tarefas."""
+    # O usuário vem do banco: o current_user é o snapshot em cache
+    if fields is not None or fast_json_enabled():
+        return json_response(dashboard_adapter(fields), {
+            "user": await db.get(UserModel, current_user.id),
+            "tasks": as_dicts(await db.execute(dashboard_tasks_query(current_user.id, fields))),
+            "badges": (await db.scalars(dashboard_badges_query(current_user.id))).all(),
+        }, response)
+
+    # AsyncSession não faz lazy load implícito: tudo o que a resposta serializa
+    # (tarefas, badges e a badge de cada conquista) é carregado aqui, em lote
+    user_full = await db.scalar(
+        select(UserModel).options(
+            selectinload(UserModel.tasks),
+            selectinload(UserModel.badges).selectinload(UserBadgeModel.badge)
+        ).where(UserModel.id == current_user.id)
+    )
+
+    return {
+        "user": user_full,
+        "tasks": user_full.tasks,
+        "badges": user_full.badges
+    }
+
+
+@router.get(
+    "/stats", response_model=UserStats,
+    dependencies=[Depends(conditional_get_async("stats"))]
+)
+async def get_user_stats_summary(
+    current_user: UserModel = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Totais do usuário e taxa de conclusão em uma única query, sem carregar tarefas."""
+    row = (await db.execute(user_summary_query(current_user.id))).one()
+
+    if row.completed_count is None:
+        stats = await get_user_stats_async(current_user.id, db)
+        await db.commit()
+        return build_user_summary(row, stats)
+
+    return build_user_summary(row)
+
+
+@router.get(
+    "/stats/by-subject", response_model=List[TasksBySubject],
+    dependencies=[Depends(conditional_get_async("stats-by-subject"))]
+)
+async def get_stats_by_subject(
+    current_user: UserModel = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Tarefas, conclusões e pontos por disciplina (um único GROUP BY)."""
+    rows = (await db.execute(subject_rollup_query(current_user.id))).mappings().all()
+    return rows
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 # CORREÇÃO: Importações alteradas para absolutas
-from app.auth.auth_handler import create_access_token, get_password_hash, verify_password
+from app.auth.auth_handler import create_access_token, get_password_hash_async, verify_password_async
+from app.auth.hashing_pool import HashingPoolSaturated
+from app.auth.user_cache import invalidate_user_cache
 from app.database import get_db
 from app.models import User as UserModel
 from app.schemas import Token, User, UserCreate, UserLogin
@@ -23,30 +26,69 @@ def _validate_user_creation(user_data: UserCreate, db: Session):
             detail="Nome de usuário já existe"
         )
 
+def _save_user(db_user: UserModel, db: Session) -> UserModel:
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    # IDs podem ser reaproveitados (ex.: SQLite após exclusões): nunca servir um snapshot antigo
+    invalidate_user_cache(db_user.id)
+    return db_user
+
+def _validate_and_release(user_data: UserCreate, db: Session):
+    _validate_user_creation(user_data, db)
+    # Devolve a conexão ao pool: não faz sentido segurá-la durante o bcrypt.
+    # A sessão continua utilizável e reabre uma conexão no commit do cadastro.
+    db.close()
+
+def _find_user_and_release(email: str, db: Session):
+    """Busca o usuário e libera a conexão antes do bcrypt (o objeto segue carregado)."""
+    user = db.query(UserModel).filter(UserModel.email == email).first()
+    db.close()
+    return user
+
+def _hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Servidor ocupado, tente novamente em instantes",
+        headers={"Retry-After": "1"}
+    )
+
+# [OTIMIZAÇÃO DE PERFORMANCE - BCRYPT FORA DO THREADPOOL PRINCIPAL]
+# Os handlers são assíncronos: o acesso ao banco vai para o threadpool padrão e o
+# bcrypt para o pool dedicado e limitado, sem segurar uma thread nem uma conexão
+# do banco enquanto o hash roda.
+
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     """Registra um novo usuário após validar os dados."""
-    _validate_user_creation(user, db)
+    await run_in_threadpool(_validate_and_release, user, db)
+
+    try:
+        hashed_password = await get_password_hash_async(user.password)
+    except HashingPoolSaturated as exc:
+        raise _hashing_unavailable() from exc
 
-    hashed_password = get_password_hash(user.password)
     db_user = UserModel(
         email=user.email,
         username=user.username,
         hashed_password=hashed_password
     )
 
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-
-    return db_user
+    return await run_in_threadpool(_save_user, db_user, db)
 
 @router.post("/login", response_model=Token)
-def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """Autentica um usuário e retorna token JWT"""
-    user = db.query(UserModel).filter(UserModel.email == user_credentials.email).first()
+    user = await run_in_threadpool(_find_user_and_release, user_credentials.email, db)
+
+    try:
+        valid = user is not None and await verify_password_async(
+            user_credentials.password, user.hashed_password
+        )
+    except HashingPoolSaturated as exc:
+        raise _hashing_unavailable() from exc
 
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas"
@@ -8,6 +8,8 @@ from app.database import get_db
 from app.models import Subject as SubjectModel
 from app.models import User
 from app.schemas import Subject, SubjectCreate
+from app.services.stats_service import get_user_stats, touch_user_data
+from app.utils.etag import conditional_get
 
 router = APIRouter(prefix="/subjects", tags=["Subjects"])
 
@@ -37,13 +39,17 @@ def create_subject(
     )
 
     db.add(db_subject)
+    touch_user_data(get_user_stats(current_user.id, db))
     db.commit()
     db.refresh(db_subject)
 
     return db_subject
 
 
-@router.get("/", response_model=List[Subject])
+@router.get(
+    "/", response_model=List[Subject],
+    dependencies=[Depends(conditional_get("subjects"))]
+)
 def list_subjects(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -75,4 +81,5 @@ def delete_subject(
         )
 
     db.delete(subject)
+    touch_user_data(get_user_stats(current_user.id, db))
     db.commit()
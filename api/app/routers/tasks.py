@@ -1,15 +1,63 @@
-from typing import List
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 # CORREÇÃO: Importações alteradas para absolutas
-from app.auth.auth_bearer import get_current_user
+from app.auth.auth_bearer import get_current_user, get_current_user_for_update
 from app.database import get_db
 from app.models import Task as TaskModel
 from app.models import User
-from app.schemas import Task, TaskCreate, TaskFilterParams, TaskResponse, TaskUpdate
-from app.services.score_service import process_task_completion
+from app.schemas import (
+    Task,
+    TaskBatchResponse,
+    TaskBulkCreate,
+    TaskBulkResult,
+    TaskCompleteBatch,
+    TaskCreate,
+    TaskFilterParams,
+    TaskResponse,
+    TaskUpdate,
+)
+from app.services.score_service import process_task_completion, process_tasks_completion
+from app.services.stats_service import (
+    get_user_stats,
+    record_task_created,
+    record_task_deleted,
+    touch_user_data,
+)
+from app.services.task_service import (
+    check_completion_batch,
+    create_tasks_bulk,
+    user_tasks_query,
+    validate_bulk_tasks,
+)
+from app.utils.etag import conditional_get
+from app.utils.export import (
+    CSV_EXPORT_VARY,
+    EXPORT_VARY,
+    ExportPlan,
+    csv_export_plan_dependency,
+    export_plan_dependency,
+    export_tasks_generator,
+    gzip_chunks,
+    tasks_export_query,
+)
+from app.utils.fast_json import (
+    fast_json_enabled,
+    json_response,
+    task_columns,
+    task_list_adapter,
+)
+from app.utils.fieldsets import task_fields_dependency
+from app.utils.pagination import (
+    TASK_CURSOR_FIELDS,
+    InvalidCursorError,
+    encode_task_cursor,
+    task_keyset_order,
+    task_keyset_segments,
+)
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -38,25 +86,64 @@ def create_task(
     db: Session = Depends(get_db)
 ):
     """Cria uma nova tarefa para o usuário"""
+    stats = get_user_stats(current_user.id, db)
+
     db_task = TaskModel(
         **task.dict(),
         owner_id=current_user.id
     )
 
     db.add(db_task)
+    record_task_created(stats)
     db.commit()
     db.refresh(db_task)
 
     return db_task
 
-@router.get("/", response_model=List[Task])
+@router.post("/bulk", response_model=TaskBulkResult, status_code=status.HTTP_201_CREATED)
+def create_tasks_in_bulk(
+    payload: TaskBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Cria várias tarefas de uma vez (ex.: importação do cronograma do semestre),
+    numa única transação. Com partial=false (padrão), qualquer item inválido
+    rejeita o lote com 422; com partial=true, os válidos são criados e os
+    inválidos voltam em "errors" com seu índice.
+    """
+    tasks, errors = validate_bulk_tasks(payload.tasks)
+
+    if errors and not payload.partial:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors
+        )
+
+    created = create_tasks_bulk(current_user.id, tasks, db) if tasks else []
+    return {"created": created, "errors": errors}
+
+@router.get(
+    "/", response_model=List[Task],
+    dependencies=[Depends(conditional_get("tasks"))]
+)
 def list_tasks(
+    response: Response,
     filters: TaskFilterParams = Depends(),
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields_dependency),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Lista as tarefas do usuário com filtros opcionais"""
-    query = db.query(TaskModel).filter(TaskModel.owner_id == current_user.id)
+    """
+    Lista as tarefas do usuário com filtros opcionais.
+    Quando a página vem cheia, o cabeçalho X-Next-Cursor traz o cursor da próxima.
+    Com fields, cada tarefa traz só os campos pedidos (e o id).
+    """
+    # Com campos esparsos ou FAST_JSON_ENABLED, lê só as colunas necessárias
+    # (linhas, sem objetos ORM), incluindo as do cursor da próxima página
+    fast_json = fields is not None or fast_json_enabled()
+    query = db.query(*task_columns(fields, extra=TASK_CURSOR_FIELDS)) if fast_json else db.query(TaskModel)
+    query = query.filter(TaskModel.owner_id == current_user.id)
 
     # [OTIMIZAÇÃO DE PERFORMANCE - GARGALO #2]
     # Refatoração: Aplicamos os filtros diretamente no objeto Query (SQL WHERE)
@@ -69,14 +156,116 @@ def list_tasks(
         query = query.filter(TaskModel.is_completed == filters.completed)
 
     # [OTIMIZAÇÃO DE PERFORMANCE - GARGALO #3]
-    # Ordenação feita no banco para aproveitar índices (quando existirem)
-    query = query.order_by(TaskModel.due_date.asc(), TaskModel.weight.desc())
+    # Ordenação feita no banco para aproveitar índices (quando existirem).
+    # O desempate por id torna a ordem total, requisito da paginação por cursor.
+    query = query.order_by(*task_keyset_order())
 
-    # Paginação via SQL (LIMIT/OFFSET) para evitar carregar a tabela inteira
-    tasks = query.offset(filters.skip).limit(filters.limit).all()
+    if filters.cursor:
+        try:
+            segments = task_keyset_segments(filters.cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            ) from exc
+        # Quase toda página cabe no primeiro trecho; só a que cruza o fim das
+        # tarefas com prazo é completada com as sem prazo (uma query a mais)
+        tasks = []
+        for condition in segments:
+            tasks += query.filter(condition).limit(filters.limit - len(tasks)).all()
+            if len(tasks) == filters.limit:
+                break
+    else:
+        # Paginação legada via SQL (LIMIT/OFFSET), mantida para clientes antigos
+        tasks = query.offset(filters.skip).limit(filters.limit).all()
+
+    if len(tasks) == filters.limit:
+        response.headers["X-Next-Cursor"] = encode_task_cursor(tasks[-1])
+
+    if fast_json:
+        return json_response(task_list_adapter(fields), tasks, response)
     return tasks
 
-@router.get("/{task_id}", response_model=Task)
+@router.get(
+    "/export", dependencies=[Depends(conditional_get("tasks-export", vary=EXPORT_VARY))]
+)
+def export_tasks(
+    response: Response,
+    plan: ExportPlan = Depends(export_plan_dependency),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Exporta todas as tarefas do usuário (CSV ou NDJSON, opcionalmente em gzip),
+    transmitidas em blocos. A memória fica constante: as linhas vêm do banco em
+    lotes (yield_per), e cada bloco é codificado e comprimido antes do próximo.
+    """
+    return _export_response(plan, response, current_user.id, db)
+
+@router.get(
+    "/export.csv", dependencies=[Depends(conditional_get("tasks-export", vary=CSV_EXPORT_VARY))]
+)
+def export_tasks_csv(
+    response: Response,
+    plan: ExportPlan = Depends(csv_export_plan_dependency),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Exporta as tarefas em CSV, qualquer que seja o Accept (gzip só pelo Accept-Encoding)."""
+    return _export_response(plan, response, current_user.id, db)
+
+def _export_response(
+    plan: ExportPlan, response: Response, user_id: int, db: Session
+) -> StreamingResponse:
+    query = tasks_export_query(user_id)
+    bind = db.get_bind()
+
+    def rows():
+        # Sessão própria: a da requisição é fechada antes do fim do streaming
+        with Session(bind) as export_db:
+            yield from export_db.execute(query)
+
+    chunks = export_tasks_generator(rows(), encoder=plan.encoder)
+    if plan.compressed:
+        chunks = gzip_chunks(chunks)
+
+    streaming = StreamingResponse(chunks, media_type=plan.media_type, headers=plan.headers())
+    # ETag e Vary vêm da dependência condicional; numa Response própria o FastAPI não os copia
+    streaming.headers.raw.extend(response.headers.raw)
+    return streaming
+
+@router.patch("/complete", response_model=TaskBatchResponse)
+def complete_tasks(
+    payload: TaskCompleteBatch,
+    current_user: User = Depends(get_current_user_for_update),
+    db: Session = Depends(get_db)
+):
+    """
+    Conclui várias tarefas de uma vez ("marcar todas como feitas"), com uma
+    única avaliação de streak e badges e um único commit. O lote é recusado
+    inteiro se algum id não existir (404) ou já estiver concluído (400).
+    """
+    task_ids = list(dict.fromkeys(payload.task_ids))
+    tasks = db.scalars(user_tasks_query(current_user.id, task_ids)).all()
+    missing, already_completed = check_completion_batch(task_ids, tasks)
+
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tarefas não encontradas: {missing}"
+        )
+    if already_completed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tarefas já concluídas: {already_completed}"
+        )
+
+    return process_tasks_completion(current_user, tasks, db)
+
+@router.get(
+    "/{task_id}", response_model=Task,
+    dependencies=[Depends(get_task_for_user_dependency), Depends(conditional_get("task"))]
+)
 def get_task(
     task: TaskModel = Depends(get_task_for_user_dependency)
 ):
@@ -86,7 +275,7 @@ def get_task(
 @router.patch("/{task_id}/complete", response_model=TaskResponse)
 def complete_task(
     task: TaskModel = Depends(get_task_for_user_dependency),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_for_update),
     db: Session = Depends(get_db)
 ):
     """Marca uma tarefa como concluída delegando para a camada de serviço"""
@@ -105,6 +294,8 @@ def delete_task(
     db: Session = Depends(get_db)
 ):
     """Deleta uma tarefa do usuário"""
+    stats = get_user_stats(task.owner_id, db)
+    record_task_deleted(stats, task)
     db.delete(task)
     db.commit()
 
@@ -123,15 +314,20 @@ def update_task(
             detail="Nenhum campo para atualizar"
         )
 
+    stats = get_user_stats(task.owner_id, db)
     for field, value in update_dict.items():
         setattr(task, field, value)
+    touch_user_data(stats)
 
     db.commit()
     db.refresh(task)
 
     return task
 
-@router.get("/subjects/list", response_model=List[str])
+@router.get(
+    "/subjects/list", response_model=List[str],
+    dependencies=[Depends(conditional_get("task-subjects"))]
+)
 def list_subjects(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
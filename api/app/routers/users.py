@@ -1,14 +1,31 @@
 """Módulo com os endpoints para informações de utilizadores."""
-from fastapi import APIRouter, Depends
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func 
 
 # CORREÇÃO: Importações alteradas para absolutas
 from app.auth.auth_bearer import get_current_user
 from app.database import get_db
 from app.models import User as UserModel
-from app.models import Task
-from app.schemas import User, UserDashboard
+from app.models import UserBadge as UserBadgeModel
+from app.schemas import TasksBySubject, User, UserDashboard, UserStats
+from app.services.stats_service import (
+    build_user_summary,
+    get_user_stats,
+    subject_rollup_query,
+    user_summary_query,
+)
+from app.utils.etag import conditional_get
+from app.utils.fast_json import (
+    as_dicts,
+    dashboard_adapter,
+    dashboard_badges_query,
+    dashboard_tasks_query,
+    fast_json_enabled,
+    json_response,
+)
+from app.utils.fieldsets import task_fields_dependency
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -19,38 +36,96 @@ def get_current_user_info(current_user: UserModel = Depends(get_current_user)):
     return current_user
 
 
-@router.get("/dashboard", response_model=UserDashboard)
+@router.get(
+    "/dashboard", response_model=UserDashboard,
+    dependencies=[Depends(conditional_get("dashboard"))]
+)
 def get_user_dashboard(
+    response: Response,
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields_dependency),
     current_user: UserModel = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Retorna dashboard completo do usuário (Otimizado)."""
+    """Retorna dashboard completo do usuário (Otimizado). Com fields, recorta as tarefas."""
+
+    # Com campos esparsos ou FAST_JSON_ENABLED: tarefas como linhas (só as colunas
+    # pedidas) e conquistas em outra query, codificadas direto para bytes JSON.
+    # O print da média (legado, só no log) fica no caminho padrão. O usuário vem
+    # do banco, como no caminho padrão: o current_user é o snapshot em cache
+    # e pode estar desatualizado em relação ao ETag (data_version)
+    if fields is not None or fast_json_enabled():
+        return json_response(dashboard_adapter(fields), {
+            "user": db.get(UserModel, current_user.id),
+            "tasks": as_dicts(db.execute(dashboard_tasks_query(current_user.id, fields))),
+            "badges": db.scalars(dashboard_badges_query(current_user.id)).all(),
+        }, response)
 
     # 1. OTIMIZAÇÃO GARGALO #4 (N+1):
     # Recarrega o usuário trazendo Tarefas e Badges em uma única Query (Eager Loading)
-    # Isso evita queries extras quando acessamos .tasks e .badges depois.
+    # Isso evita queries extras quando acessamos .tasks e .badges depois
+    # (inclusive a Badge de cada conquista, serializada na resposta).
     user_full = db.query(UserModel).options(
         joinedload(UserModel.tasks),
-        joinedload(UserModel.badges)
+        joinedload(UserModel.badges).joinedload(UserBadgeModel.badge)
     ).filter(UserModel.id == current_user.id).first()
 
+    _print_average(current_user.id, db)
+
+    # Retorna o objeto carregado de forma otimizada
+    return {
+        "user": user_full,
+        "tasks": user_full.tasks,
+        "badges": user_full.badges
+    }
+
+
+def _print_average(user_id: int, db: Session):
     # 2. OTIMIZAÇÃO GARGALO #1 (Soma em Memória):
-    # Faz a soma dos pontos diretamente no Banco de Dados (SQL SUM)
-    # Em vez de: sum(t.points_awarded for t in tasks)
-    total_task_points = db.query(func.sum(Task.points_awarded))\
-        .filter(Task.owner_id == current_user.id).scalar() or 0
+    # Os totais vêm da linha desnormalizada UserStats (leitura pela chave primária),
+    # em vez de: sum(t.points_awarded for t in tasks) ou um SUM sobre todo o histórico
+    stats = get_user_stats(user_id, db)
+    total_task_points = stats.task_points
 
     # Lógica de visualização (apenas print)
-    tasks_count = len(user_full.tasks)
+    tasks_count = stats.completed_count + stats.pending_count
     if tasks_count > 0:
         average = total_task_points / tasks_count
         print(f"Média: {average:.2f}")
     else:
         print("Média: 0 (Sem tarefas)")
 
-    # Retorna o objeto carregado de forma otimizada
-    return {
-        "user": user_full,
-        "tasks": user_full.tasks,
-        "badges": user_full.badges
-    }
\ No newline at end of file
+
+@router.get(
+    "/stats", response_model=UserStats,
+    dependencies=[Depends(conditional_get("stats"))]
+)
+def get_user_stats_summary(
+    current_user: UserModel = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Totais do usuário e taxa de conclusão em uma única query, sem carregar
+    tarefas: custo e payload fixos, independentes do tamanho do histórico.
+    """
+    row = db.execute(user_summary_query(current_user.id)).one()
+
+    # Linha de estatísticas ainda inexistente (usuário nunca tocado): reconstrói uma vez
+    if row.completed_count is None:
+        stats = get_user_stats(current_user.id, db)
+        db.commit()
+        return build_user_summary(row, stats)
+
+    return build_user_summary(row)
+
+
+@router.get(
+    "/stats/by-subject", response_model=List[TasksBySubject],
+    dependencies=[Depends(conditional_get("stats-by-subject"))]
+)
+def get_stats_by_subject(
+    current_user: UserModel = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Tarefas, conclusões e pontos por disciplina (um único GROUP BY)."""
+    rows = db.execute(subject_rollup_query(current_user.id)).mappings().all()
+    return rows
@@ -1,6 +1,6 @@
 """Módulo de definição dos schemas de dados com Pydantic."""
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, EmailStr, validator
 
@@ -46,6 +46,9 @@ class TaskFilterParams(BaseModel):
     limit: int = Field(100, ge=1, le=100, description="Limite de registros")
     completed: Optional[bool] = None
     subject: Optional[str] = None  # <--- CORREÇÃO: Campo adicionado
+    cursor: Optional[str] = Field(
+        None, description="Cursor opaco (X-Next-Cursor) para paginação keyset; ignora 'skip'"
+    )
 
 
 class TaskBase(BaseModel):
@@ -100,12 +103,34 @@ class Task(TaskBase):
         from_attributes = True
 
 
+# Limite de itens por POST /tasks/bulk (um semestre inteiro cabe com folga)
+TASK_BULK_MAX_ITEMS = 500
+
+
+class TaskBulkCreate(BaseModel):
+    # Itens crus: cada um é validado como TaskCreate separadamente, para que os
+    # erros possam ser reportados por item (partial=true) em vez de rejeitar tudo
+    tasks: List[Dict[str, Any]] = Field(..., min_length=1, max_length=TASK_BULK_MAX_ITEMS)
+    partial: bool = False
+
+
+class TaskBulkItemError(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class TaskBulkResult(BaseModel):
+    created: List[Task]
+    errors: List[TaskBulkItemError] = []
+
+
 class BadgeBase(BaseModel):
     name: str
     description: str
     icon: str
     points_required: int = 0
     tasks_required: int = 0
+    streak_required: int = 0
 
 
 class Badge(BadgeBase):
@@ -148,6 +173,18 @@ class TaskResponse(BaseModel):
     badges_earned: List[Badge] = []
 
 
+class TaskCompleteBatch(BaseModel):
+    task_ids: List[int] = Field(..., min_length=1, max_length=TASK_BULK_MAX_ITEMS)
+
+
+class TaskBatchResponse(BaseModel):
+    """Resultado agregado de PATCH /tasks/complete (mesmos campos de TaskResponse)."""
+    tasks: List[Task]
+    points_earned: int
+    streak_updated: bool
+    badges_earned: List[Badge] = []
+
+
 class UserDashboard(BaseModel):
     user: User
     tasks: List[Task]
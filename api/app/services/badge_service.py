@@ -1,96 +1,205 @@
-from typing import List
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Optional
 
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 # CORREÇÃO: Importações alteradas para absolutas
-from app.models import Badge, Task, User, UserBadge
+from app.models import Badge, User, UserBadge
+from app.services.stats_service import get_user_stats
+
+# Limite de segurança: outros workers só enxergam mudanças feitas por este
+# processo depois de expirar o catálogo em memória.
+BADGE_CATALOG_TTL_SECONDS = 300
+
+# Badges padrão. Em produção são criados pela migração 0006; esta lista serve
+# a initialize_badges (bancos de teste e de desenvolvimento sem Alembic).
+DEFAULT_BADGES = (
+    {"name": "Primeira Tarefa", "description": "Completou sua primeira tarefa",
+     "icon": "🎯", "tasks_required": 1},
+    {"name": "Streak Iniciante", "description": "Manteve um streak de 3 dias",
+     "icon": "🔥", "streak_required": 3},
+    {"name": "Estudioso", "description": "Completou 10 tarefas",
+     "icon": "📚", "tasks_required": 10},
+    {"name": "Dedicado", "description": "Acumulou 100 pontos",
+     "icon": "⭐", "points_required": 100},
+    {"name": "Streak Master", "description": "Manteve um streak de 7 dias",
+     "icon": "🏆", "streak_required": 7},
+    {"name": "Centena", "description": "Completou 100 tarefas",
+     "icon": "💯", "tasks_required": 100},
+    {"name": "Milhar", "description": "Acumulou 1000 pontos",
+     "icon": "💎", "points_required": 1000},
+)
 
 def initialize_badges(db: Session):
-    """Cria os badges padrão no banco de dados se eles não existirem."""
-    default_badges = [
-        {
-            "name": "Primeira Tarefa", "description": "Completou sua primeira tarefa",
-            "icon": "🎯", "tasks_required": 1
-        },
-        {
-            "name": "Streak Iniciante",
-            "description": "Manteve um streak de 3 dias",
-            "icon": "🔥", "points_required": 0
-            },
-        {
-            "name": "Estudioso",
-            "description": "Completou 10 tarefas",
-            "icon": "📚",
-            "tasks_required": 10
-            },
-        {
-            "name": "Dedicado",
-            "description": "Acumulou 100 pontos",
-            "icon": "⭐",
-            "points_required": 100
-            },
-        {
-            "name": "Streak Master",
-            "description": "Manteve um streak de 7 dias",
-            "icon": "🏆",
-            "points_required": 0
-            },
-        {
-            "name": "Centena",
-            "description": "Completou 100 tarefas",
-            "icon": "💯",
-            "tasks_required": 100
-            },
-        {
-            "name": "Milhar",
-            "description": "Acumulou 1000 pontos",
-            "icon": "💎",
-            "points_required": 1000
-            },
-    ]
-
-    for badge_data in default_badges:
-        existing_badge = db.query(Badge).filter(Badge.name == badge_data["name"]).first()
-        if not existing_badge:
-            badge = Badge(**badge_data)
-            db.add(badge)
+    """
+    Cria os badges padrão no banco de dados se eles não existirem.
+    Um SELECT dos nomes já cadastrados e um único INSERT com os que faltam,
+    em vez de uma consulta por badge.
+    """
+    names = [badge["name"] for badge in DEFAULT_BADGES]
+    existing = set(db.scalars(select(Badge.name).where(Badge.name.in_(names))))
+
+    missing = [badge for badge in DEFAULT_BADGES if badge["name"] not in existing]
+    if missing:
+        db.add_all(Badge(**badge_data) for badge_data in missing)
 
     db.commit()
 
 
-def check_and_award_badges(user: User, db: Session) -> List[Badge]:
+@dataclass(frozen=True)
+class CatalogBadge:
+    """Cópia imutável de um Badge, segura para compartilhar entre requisições."""
+    id: int
+    name: str
+    description: str
+    icon: str
+    points_required: int
+    tasks_required: int
+    streak_required: int
+
+
+@dataclass(frozen=True)
+class ThresholdIndex:
+    """Badges de um critério ordenados pelo limiar, para busca com bisect."""
+    thresholds: tuple
+    badges: tuple
+
+    @classmethod
+    def build(cls, badges, attribute: str) -> "ThresholdIndex":
+        ranked = sorted(
+            (getattr(badge, attribute), badge) for badge in badges
+            if getattr(badge, attribute) > 0
+        )
+        return cls(
+            thresholds=tuple(threshold for threshold, _ in ranked),
+            badges=tuple(badge for _, badge in ranked),
+        )
+
+    def reachable(self, value: int) -> tuple:
+        """Badges cujo limiar já foi atingido: O(log n) para achar o corte."""
+        return self.badges[:bisect_right(self.thresholds, value)]
+
+
+@dataclass(frozen=True)
+class BadgeCatalog:
+    by_points: ThresholdIndex
+    by_tasks: ThresholdIndex
+    by_streak: ThresholdIndex
+    loaded_at: float
+
+    @classmethod
+    def load(cls, db: Session) -> "BadgeCatalog":
+        badges = [
+            CatalogBadge(
+                id=badge.id, name=badge.name, description=badge.description, icon=badge.icon,
+                points_required=badge.points_required or 0,
+                tasks_required=badge.tasks_required or 0,
+                streak_required=badge.streak_required or 0,
+            )
+            for badge in db.query(Badge).all()
+        ]
+        return cls(
+            by_points=ThresholdIndex.build(badges, "points_required"),
+            by_tasks=ThresholdIndex.build(badges, "tasks_required"),
+            by_streak=ThresholdIndex.build(badges, "streak_required"),
+            loaded_at=time.monotonic(),
+        )
+
+
+_catalog: Optional[BadgeCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_badge_catalog(db: Session) -> BadgeCatalog:
+    """
+    [OTIMIZAÇÃO DE PERFORMANCE - CATÁLOGO EM MEMÓRIA]
+    Carrega os badges uma vez por processo em vez de rodar Badge.all() a cada
+    conclusão de tarefa. Recarrega quando invalidado ou após o TTL.
+    """
+    global _catalog  # pylint: disable=global-statement
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - catalog.loaded_at < BADGE_CATALOG_TTL_SECONDS:
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is None or _catalog is catalog:
+            _catalog = BadgeCatalog.load(db)
+        return _catalog
+
+
+def invalidate_badge_catalog():
+    """Descarta o catálogo em memória; a próxima leitura recarrega do banco."""
+    global _catalog  # pylint: disable=global-statement
+    with _catalog_lock:
+        _catalog = None
+
+
+def _mark_catalog_stale(session: Optional[Session]):
+    invalidate_badge_catalog()
+    # Invalida de novo no fim da transação: outra requisição pode ter recarregado
+    # o catálogo antes do commit, ainda sem enxergar a alteração.
+    if session is not None:
+        session.info["badge_catalog_stale"] = True
+
+
+@event.listens_for(Badge, "after_insert")
+@event.listens_for(Badge, "after_update")
+@event.listens_for(Badge, "after_delete")
+def _on_badge_flush(_mapper, _connection, target):
+    _mark_catalog_stale(Session.object_session(target))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_badge_bulk_write(orm_execute_state):
+    """Captura db.query(Badge).update()/delete() e insert()/update()/delete(Badge)."""
+    if orm_execute_state.is_select:
+        return
+    if any(mapper.class_ is Badge for mapper in orm_execute_state.all_mappers):
+        _mark_catalog_stale(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _on_transaction_end(session):
+    if session.info.pop("badge_catalog_stale", False):
+        invalidate_badge_catalog()
+
+
+def check_and_award_badges(user: User, db: Session) -> List[CatalogBadge]:
     """
     Verifica e concede badges baseadas nas conquistas do usuário.
     Não realiza commit, apenas adiciona à sessão.
+    Só avalia badges cujo limiar já foi atingido (bisect nos limiares ordenados).
     """
-    awarded_badges = []
-    all_badges = db.query(Badge).all()
+    catalog = get_badge_catalog(db)
     user_badge_ids = {ub.badge_id for ub in user.badges}
 
+    # [OTIMIZAÇÃO DE PERFORMANCE - CONTADORES DESNORMALIZADOS]
+    # Leitura O(1) da linha UserStats em vez de COUNT(*) sobre o histórico do usuário
+    completed_tasks_count = get_user_stats(user.id, db).completed_count
 
-    completed_tasks_count = db.query(Task).filter(
-        Task.owner_id == user.id, Task.is_completed == True
-    ).count()
-
-    for badge in all_badges:
-        if badge.id in user_badge_ids:
-            continue
+    candidates = {
+        badge.id: badge
+        for badge in (
+            *catalog.by_points.reachable(user.total_points or 0),
+            *catalog.by_tasks.reachable(completed_tasks_count),
+            *catalog.by_streak.reachable(user.current_streak or 0),
+        )
+        if badge.id not in user_badge_ids
+    }
 
-        should_award = False
+    awarded_badges = [candidates[badge_id] for badge_id in sorted(candidates)]
+    for badge in awarded_badges:
+        db.add(UserBadge(user_id=user.id, badge_id=badge.id))
 
-        # Verificações de condições para ganhar o badge
-        if badge.points_required > 0 and user.total_points >= badge.points_required:
-            should_award = True
-        elif badge.tasks_required > 0 and completed_tasks_count >= badge.tasks_required:
-            should_award = True
-        elif badge.name == "Streak Iniciante" and user.current_streak >= 3:
-            should_award = True
-        elif badge.name == "Streak Master" and user.current_streak >= 7:
-            should_award = True
+    return awarded_badges
 
-        if should_award:
-            user_badge = UserBadge(user_id=user.id, badge_id=badge.id)
-            db.add(user_badge)
-            awarded_badges.append(badge)
 
-    return awarded_badges
+async def check_and_award_badges_async(user: User, db: AsyncSession) -> List[CatalogBadge]:
+    """Versão assíncrona de check_and_award_badges (DB_MODE=async)."""
+    return await db.run_sync(lambda session: check_and_award_badges(user, session))
@@ -1,11 +1,16 @@
 from datetime import date, datetime
 from functools import lru_cache
+from typing import List
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 # CORREÇÃO: Importações alteradas para absolutas
+from app.auth.user_cache import invalidate_user_cache
 from app.models import Task, User
+from app.schemas import Task as TaskSchema
 from app.services.badge_service import check_and_award_badges
+from app.services.stats_service import apply_task_delta, get_user_stats, record_task_completed
 
 @lru_cache(maxsize=128)
 def calculate_task_points(weight: int, completed_on_time: bool = True) -> int:
@@ -58,18 +63,21 @@ def process_task_completion(user: User, task: Task, db: Session) -> dict:
     Orquestra todo o processo de completar uma tarefa:
     1. Marca a tarefa como concluída.
     2. Atribui pontos.
-    3. Atualiza o streak.
+    3. Atualiza o streak e os contadores desnormalizados (UserStats).
     4. Verifica e concede badges.
-    5. Realiza um único commit no banco de dados.
+    5. Realiza um único commit no banco de dados e invalida o cache do usuário.
     """
+    stats = get_user_stats(user.id, db)
     task.is_completed = True
 
     points_earned = award_points_for_task(user, task, db)
     streak_updated = update_user_streak(user, db)
+    record_task_completed(stats, points_earned)
     db.flush()
     badges_earned = check_and_award_badges(user, db)
 
     db.commit()
+    invalidate_user_cache(user.id)
 
     return {
         "task": task,
@@ -77,3 +85,49 @@ def process_task_completion(user: User, task: Task, db: Session) -> dict:
         "streak_updated": streak_updated,
         "badges_earned": badges_earned
     }
+
+
+async def process_task_completion_async(user: User, task: Task, db: AsyncSession) -> dict:
+    """
+    Versão assíncrona de process_task_completion (DB_MODE=async).
+    Reaproveita a mesma regra de negócio via AsyncSession.run_sync: os objetos
+    carregados pela AsyncSession são os mesmos vistos pela sessão síncrona.
+    """
+    return await db.run_sync(lambda session: process_task_completion(user, task, session))
+
+
+def process_tasks_completion(user: User, tasks: List[Task], db: Session) -> dict:
+    """
+    Conclui várias tarefas numa única passada ("marcar todas como feitas"):
+    pontos calculados por tarefa, mas streak, contadores e badges avaliados uma
+    só vez sobre o estado final, com um único commit.
+    """
+    stats = get_user_stats(user.id, db)
+
+    points_earned = 0
+    for task in tasks:
+        task.is_completed = True
+        points_earned += award_points_for_task(user, task, db)
+
+    streak_updated = update_user_streak(user, db)
+    apply_task_delta(stats, completed=len(tasks), pending=-len(tasks), points=points_earned)
+    db.flush()
+    badges_earned = check_and_award_badges(user, db)
+
+    # Serializa antes do commit: depois dele cada tarefa expirada seria
+    # recarregada com um SELECT próprio
+    completed = [TaskSchema.model_validate(task) for task in tasks]
+    db.commit()
+    invalidate_user_cache(user.id)
+
+    return {
+        "tasks": completed,
+        "points_earned": points_earned,
+        "streak_updated": streak_updated,
+        "badges_earned": badges_earned
+    }
+
+
+async def process_tasks_completion_async(user: User, tasks: List[Task], db: AsyncSession) -> dict:
+    """Versão assíncrona de process_tasks_completion (DB_MODE=async)."""
+    return await db.run_sync(lambda session: process_tasks_completion(user, tasks, session))
@@ -0,0 +1,145 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Task, User, UserBadge, UserStats
+
+
+def _rebuild_user_stats(user_id: int, db: Session) -> UserStats:
+    """
+    Reconstrói os contadores a partir da tabela de tarefas (uma única agregação).
+    Só acontece na primeira vez que o usuário é tocado sem linha de estatísticas.
+    """
+    completed_expr = func.coalesce(func.sum(case((Task.is_completed == True, 1), else_=0)), 0)  # noqa: E712
+    total, completed, points = db.query(
+        func.count(Task.id),
+        completed_expr,
+        func.coalesce(func.sum(Task.points_awarded), 0),
+    ).filter(Task.owner_id == user_id).one()
+
+    stats = UserStats(
+        user_id=user_id,
+        completed_count=completed,
+        pending_count=total - completed,
+        task_points=points,
+    )
+
+    # Savepoint: se outra requisição criou a linha ao mesmo tempo, reaproveita a dela
+    try:
+        with db.begin_nested():
+            db.add(stats)
+    except IntegrityError:
+        stats = db.get(UserStats, user_id, populate_existing=True)
+
+    return stats
+
+
+def get_user_stats(user_id: int, db: Session) -> UserStats:
+    """
+    Retorna a linha de estatísticas do usuário (leitura O(1) pela chave primária).
+    Deve ser chamada ANTES de alterar tarefas na sessão, para que uma eventual
+    reconstrução enxergue o estado anterior à escrita.
+    """
+    stats = db.get(UserStats, user_id)
+    if stats is None:
+        stats = _rebuild_user_stats(user_id, db)
+    return stats
+
+
+async def get_user_stats_async(user_id: int, db: AsyncSession) -> UserStats:
+    """Versão assíncrona de get_user_stats (DB_MODE=async)."""
+    return await db.run_sync(lambda session: get_user_stats(user_id, session))
+
+
+def apply_task_delta(stats: UserStats, completed: int = 0, pending: int = 0, points: int = 0):
+    """
+    Aplica variações aos contadores e incrementa a versão dos dados. Não realiza commit.
+    Os incrementos são expressões SQL (col = col + n), então escritas concorrentes
+    do mesmo usuário não se sobrescrevem.
+    """
+    if completed:
+        stats.completed_count = UserStats.completed_count + completed
+    if pending:
+        stats.pending_count = UserStats.pending_count + pending
+    if points:
+        stats.task_points = UserStats.task_points + points
+    touch_user_data(stats)
+
+
+def touch_user_data(stats: UserStats):
+    """
+    Incrementa a versão dos dados do usuário (invalida os ETags emitidos).
+    Toda escrita em tarefas, disciplinas ou pontuação deve passar por aqui,
+    diretamente ou via apply_task_delta. Não realiza commit.
+    """
+    stats.data_version = UserStats.data_version + 1
+
+
+def record_task_created(stats: UserStats):
+    """Nova tarefa entra como pendente."""
+    apply_task_delta(stats, pending=1)
+
+
+def record_task_completed(stats: UserStats, points: int):
+    """Tarefa sai de pendente para concluída, somando os pontos recebidos."""
+    apply_task_delta(stats, completed=1, pending=-1, points=points)
+
+
+def record_task_deleted(stats: UserStats, task: Task):
+    """Remove a contribuição da tarefa excluída dos contadores."""
+    if task.is_completed:
+        apply_task_delta(stats, completed=-1, points=-(task.points_awarded or 0))
+    else:
+        apply_task_delta(stats, pending=-1, points=-(task.points_awarded or 0))
+
+
+def user_summary_query(user_id: int):
+    """
+    Resumo do usuário em um único SELECT: pontos e streak (users), contadores
+    (user_stats, linha desnormalizada) e total de badges (subquery escalar).
+    Nenhuma tarefa é lida; as colunas de user_stats vêm NULL se a linha não existir.
+    """
+    badges_count = select(func.count(UserBadge.id))\
+        .where(UserBadge.user_id == User.id)\
+        .scalar_subquery()
+
+    return select(
+        User.total_points,
+        User.current_streak,
+        UserStats.completed_count,
+        UserStats.pending_count,
+        badges_count.label("badges_count"),
+    ).outerjoin(UserStats, UserStats.user_id == User.id).where(User.id == user_id)
+
+
+def build_user_summary(row, stats: UserStats = None) -> dict:
+    """Monta a resposta de /users/stats; stats substitui a linha ausente no SELECT."""
+    completed = stats.completed_count if stats is not None else row.completed_count
+    pending = stats.pending_count if stats is not None else row.pending_count
+    total = completed + pending
+
+    return {
+        "total_tasks": total,
+        "completed_tasks": completed,
+        "pending_tasks": pending,
+        "total_points": row.total_points or 0,
+        "current_streak": row.current_streak or 0,
+        "badges_count": row.badges_count,
+        "completion_rate": round(completed / total * 100, 2) if total else 0.0,
+    }
+
+
+def subject_rollup_query(user_id: int):
+    """Totais por disciplina em um único GROUP BY (coberto por ix_tasks_owner_subject)."""
+    completed_expr = func.coalesce(func.sum(case((Task.is_completed == True, 1), else_=0)), 0)  # noqa: E712
+
+    return select(
+        Task.subject.label("subject"),
+        func.count(Task.id).label("total_tasks"),
+        completed_expr.label("completed_tasks"),
+        func.coalesce(func.sum(Task.points_awarded), 0).label("total_points"),
+    ).where(
+        Task.owner_id == user_id,
+        Task.subject.isnot(None)
+    ).group_by(Task.subject).order_by(Task.subject.asc())
@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Task
+from app.schemas import Task as TaskSchema
+from app.schemas import TaskCreate
+from app.services.stats_service import apply_task_delta, get_user_stats
+
+
+def validate_bulk_tasks(items: List[Dict[str, Any]]) -> Tuple[List[TaskCreate], List[dict]]:
+    """
+    Valida cada item como TaskCreate, isoladamente.
+    Retorna as tarefas válidas (na ordem recebida) e os erros por índice.
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append(TaskCreate.model_validate(item))
+        except ValidationError as exc:
+            errors.append({
+                "index": index,
+                "errors": [
+                    {"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]}
+                    for error in exc.errors()
+                ],
+            })
+    return valid, errors
+
+
+def create_tasks_bulk(user_id: int, tasks: List[TaskCreate], db: Session) -> List[TaskSchema]:
+    """
+    Insere todas as tarefas numa única transação, com INSERT ... RETURNING em
+    lotes de várias linhas (insertmanyvalues do SQLAlchemy), em vez de um
+    INSERT + commit + refresh por tarefa. Os contadores são ajustados uma vez.
+    """
+    stats = get_user_stats(user_id, db)
+
+    # O PostgreSQL não garante a ordem das linhas do RETURNING; lá
+    # sort_by_parameter_order as devolve na ordem enviada, ainda em lotes.
+    # No SQLite ele força um INSERT por linha, e não é preciso: os ids de um
+    # mesmo INSERT multi-linha seguem a ordem dos VALUES, então basta ordenar por id
+    sqlite = db.get_bind().dialect.name == "sqlite"
+    created = db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=not sqlite),
+        [{**task.dict(), "owner_id": user_id} for task in tasks],
+    ).all()
+    if sqlite:
+        created = sorted(created, key=lambda task: task.id)
+
+    apply_task_delta(stats, pending=len(created))
+    # Serializa antes do commit: depois dele os objetos expiram e cada um
+    # seria recarregado com um SELECT próprio
+    result = [TaskSchema.model_validate(task) for task in created]
+    db.commit()
+
+    return result
+
+
+async def create_tasks_bulk_async(
+    user_id: int, tasks: List[TaskCreate], db: AsyncSession
+) -> List[TaskSchema]:
+    """Versão assíncrona de create_tasks_bulk (DB_MODE=async)."""
+    return await db.run_sync(lambda session: create_tasks_bulk(user_id, tasks, session))
+
+
+def user_tasks_query(user_id: int, task_ids: List[int]):
+    """Tarefas do usuário entre task_ids, numa única consulta (IN pela chave primária)."""
+    return select(Task).where(
+        Task.owner_id == user_id,
+        Task.id.in_(task_ids)
+    ).order_by(Task.id)
+
+
+def check_completion_batch(task_ids: List[int], tasks: List[Task]) -> Tuple[List[int], List[int]]:
+    """
+    Compara os ids pedidos com as tarefas encontradas.
+    Retorna (ids inexistentes ou de outro usuário, ids já concluídos).
+    """
+    found = {task.id for task in tasks}
+    missing = [task_id for task_id in task_ids if task_id not in found]
+    already_completed = [task.id for task in tasks if task.is_completed]
+    return missing, already_completed
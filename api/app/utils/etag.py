@@ -0,0 +1,101 @@
+"""
+GETs condicionais (ETag / If-None-Match) a partir da versão dos dados do usuário.
+
+O ETag combina o escopo da rota, o usuário, user_stats.data_version, o caminho
+(ex.: o id em /tasks/{task_id}) e a query string (filtros e paginação mudam a
+representação). Com If-None-Match igual,
+a rota responde 304 após uma única leitura pela chave primária de user_stats,
+sem consultar as tabelas de tarefas nem serializar a resposta.
+"""
+import zlib
+from typing import Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.auth.auth_bearer import get_current_user, get_current_user_async
+from app.database import get_async_db, get_db
+from app.models import User, UserStats
+
+
+def make_etag(scope: str, user_id: int, version: int, query: str = "", path: str = "") -> str:
+    """ETag fraco: a mesma versão pode ser serializada com bytes diferentes (ex.: gzip)."""
+    params = "&".join(sorted(query.split("&"))) if query else ""
+    return f'W/"{scope}-{user_id}-{version}-{zlib.crc32(f"{path}?{params}".encode()):08x}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparação fraca (RFC 9110): ignora o prefixo W/ e aceita listas e '*'."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _apply(request: Request, response: Response, scope: str, user_id: int, version: int,
+           vary: Tuple[str, ...] = ()):
+    # Cabeçalhos que mudam a representação (ex.: Accept) entram no ETag como a query string
+    variant = [request.url.query] + [f"{name}={request.headers.get(name, '')}" for name in vary]
+    query = "&".join(part for part in variant if part)
+    etag = make_etag(scope, user_id, version, query, request.url.path)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if vary:
+        headers["Vary"] = ", ".join(vary)
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+
+
+def _version_query(user_id: int):
+    """
+    Sem linha em user_stats = nenhuma escrita desde a criação da tabela (versão 0):
+    a primeira escrita cria a linha com versão 0 e já a incrementa para 1.
+    """
+    return select(func.coalesce(
+        select(UserStats.data_version).where(UserStats.user_id == user_id).scalar_subquery(), 0
+    ))
+
+
+def conditional_get(scope: str, vary: Tuple[str, ...] = ()):
+    """
+    Dependência para rotas de leitura: define ETag na resposta ou interrompe a
+    requisição com 304 quando o cliente já tem a versão atual.
+    vary lista os cabeçalhos de requisição que escolhem a representação.
+    Uso: @router.get(..., dependencies=[Depends(conditional_get("tasks"))])
+
+    Rotas de um recurso devem listar a dependência que o busca antes desta,
+    para que um id inexistente responda 404 e não 304.
+    """
+    def dependency(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+    ):
+        version = db.scalar(_version_query(current_user.id))
+        _apply(request, response, scope, current_user.id, version, vary)
+
+    return dependency
+
+
+def conditional_get_async(scope: str, vary: Tuple[str, ...] = ()):
+    """Versão de conditional_get para os routers assíncronos (DB_MODE=async)."""
+    async def dependency(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        version = await db.scalar(_version_query(current_user.id))
+        _apply(request, response, scope, current_user.id, version, vary)
+
+    return dependency
@@ -1,15 +1,241 @@
-from typing import Iterator
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional
+
+from fastapi import HTTPException, Query, Request, status
+from sqlalchemy import select
+
 from app.models import Task
 
-def export_tasks_generator(tasks: list[Task]) -> Iterator[str]:
+CSV_HEADER = ("ID", "Title", "Points", "Status")
+# Linhas por bloco enviado ao cliente (e por lote lido do cursor no servidor)
+EXPORT_CHUNK_ROWS = 1000
+# Nível 6 (padrão do gzip): bom equilíbrio entre CPU e tamanho para texto repetitivo
+GZIP_LEVEL = 6
+
+
+def tasks_export_query(user_id: int):
     """
-    [OTIMIZAÇÃO DE MEMÓRIA]
-    Gera linhas formatadas para relatório sob demanda.
-    Substitui a criação de uma lista gigante de strings na memória.
+    Apenas as colunas do CSV (sem objetos ORM). yield_per liga stream_results:
+    as linhas vêm de um cursor no servidor, em lotes de EXPORT_CHUNK_ROWS.
     """
-    yield "ID,Title,Points,Status\n"  # Cabeçalho
+    return select(
+        Task.id, Task.title, Task.points_awarded, Task.is_completed
+    ).where(
+        Task.owner_id == user_id
+    ).order_by(Task.id).execution_options(yield_per=EXPORT_CHUNK_ROWS)
 
-    for task in tasks:
+
+class CsvEncoder:
+    """Formato padrão: CSV com cabeçalho, escapado pelo módulo csv."""
+    name = "csv"
+    media_type = "text/csv"
+
+    def __init__(self, buffer: io.StringIO):
+        # csv.writer cuida de aspas, vírgulas e quebras de linha dentro dos títulos
+        self.writer = csv.writer(buffer, lineterminator="\n")
+        self.writer.writerow(CSV_HEADER)
+
+    def write(self, task):
         status = "Completed" if task.is_completed else "Pending"
-        # O 'yield' retorna a string e libera a memória dela imediatamente após o uso
-        yield f"{task.id},{task.title},{task.points_awarded},{status}\n"
\ No newline at end of file
+        self.writer.writerow((task.id, task.title, task.points_awarded, status))
+
+
+class NdjsonEncoder:
+    """Um objeto JSON por linha (newline-delimited JSON), com os campos do modelo."""
+    name = "ndjson"
+    media_type = "application/x-ndjson"
+
+    def __init__(self, buffer: io.StringIO):
+        self.buffer = buffer
+
+    def write(self, task):
+        self.buffer.write(json.dumps({
+            "id": task.id,
+            "title": task.title,
+            "points_awarded": task.points_awarded,
+            "is_completed": task.is_completed,
+        }, ensure_ascii=False, separators=(",", ":")))
+        self.buffer.write("\n")
+
+
+# Cabeçalhos de requisição que escolhem a representação (entram no ETag e no Vary)
+EXPORT_VARY = ("accept", "accept-encoding")
+# /export.csv é sempre CSV: só a compressão depende da requisição
+CSV_EXPORT_VARY = ("accept-encoding",)
+
+# Formatos disponíveis para a exportação; novos encoders só precisam de
+# name, media_type, __init__(buffer) e write(task)
+EXPORT_ENCODERS = {encoder.name: encoder for encoder in (CsvEncoder, NdjsonEncoder)}
+
+
+class _Chunker:
+    """Escreve as linhas num buffer reaproveitado e o esvazia a cada bloco."""
+
+    def __init__(self, encoder_cls, chunk_rows: int):
+        self.chunk_rows = chunk_rows
+        self.pending = 0
+        self.buffer = io.StringIO()
+        self.encoder = encoder_cls(self.buffer)
+
+    def add(self, task) -> bool:
+        """Acrescenta uma tarefa; True quando o bloco atual está cheio."""
+        self.encoder.write(task)
+        self.pending += 1
+        return self.pending >= self.chunk_rows
+
+    def flush(self) -> str:
+        chunk = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.pending = 0
+        return chunk
+
+
+def export_tasks_generator(
+    tasks: Iterable, chunk_rows: int = EXPORT_CHUNK_ROWS, encoder=CsvEncoder
+) -> Iterator[str]:
+    """
+    [OTIMIZAÇÃO DE MEMÓRIA]
+    Gera o relatório sob demanda, em blocos de chunk_rows linhas.
+    Aceita qualquer iterável de linhas com id, title, points_awarded e
+    is_completed (ex.: um Result com yield_per), então nunca há uma lista
+    completa de tarefas nem do texto do relatório em memória.
+    """
+    chunker = _Chunker(encoder, chunk_rows)
+    for task in tasks:
+        if chunker.add(task):
+            yield chunker.flush()
+    yield chunker.flush()
+
+
+async def export_tasks_generator_async(
+    tasks: AsyncIterable, chunk_rows: int = EXPORT_CHUNK_ROWS, encoder=CsvEncoder
+) -> AsyncIterator[str]:
+    """Versão de export_tasks_generator para AsyncSession.stream (DB_MODE=async)."""
+    chunker = _Chunker(encoder, chunk_rows)
+    async for task in tasks:
+        if chunker.add(task):
+            yield chunker.flush()
+    yield chunker.flush()
+
+
+def _gzip_compressor():
+    # wbits = 16 + MAX_WBITS: cabeçalho e rodapé gzip (não apenas deflate)
+    return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Comprime os blocos à medida que são produzidos: o zlib guarda no máximo a
+    janela de compressão, nunca o arquivo inteiro.
+    """
+    compressor = _gzip_compressor()
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def gzip_chunks_async(chunks: AsyncIterable[str]) -> AsyncIterator[bytes]:
+    """Versão de gzip_chunks para os geradores assíncronos."""
+    compressor = _gzip_compressor()
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@dataclass(frozen=True)
+class ExportPlan:
+    """Formato e compressão negociados para uma exportação."""
+    encoder: type
+    gzip_file: bool = False      # format=*.gz: o arquivo baixado é um .gz
+    gzip_transport: bool = False  # Accept-Encoding: gzip: compressão transparente
+
+    @property
+    def compressed(self) -> bool:
+        return self.gzip_file or self.gzip_transport
+
+    def headers(self) -> dict:
+        filename = f"tasks.{self.encoder.name}" + (".gz" if self.gzip_file else "")
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+        if self.gzip_transport:
+            headers["Content-Encoding"] = "gzip"
+        return headers
+
+    @property
+    def media_type(self) -> str:
+        return "application/gzip" if self.gzip_file else self.encoder.media_type
+
+
+def _accepts(header: Optional[str], value: str) -> bool:
+    """Verdadeiro se value aparece no cabeçalho (Accept/Accept-Encoding) com q > 0."""
+    for part in (header or "").split(","):
+        token, *params = part.split(";")
+        if token.strip().lower() != value:
+            continue
+        for param in params:
+            key, _, raw = param.strip().partition("=")
+            if key == "q":
+                try:
+                    return float(raw) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def negotiate_export(
+    export_format: Optional[str], accept: Optional[str], accept_encoding: Optional[str]
+) -> ExportPlan:
+    """
+    Escolhe o formato pelo parâmetro format (csv, ndjson, csv.gz, ndjson.gz) ou,
+    na ausência dele, pelo Accept; a compressão gzip vem do sufixo .gz ou do
+    Accept-Encoding. Formato desconhecido gera ValueError.
+    """
+    if export_format:
+        name, _, suffix = export_format.lower().partition(".")
+        if name not in EXPORT_ENCODERS or suffix not in ("", "gz"):
+            raise ValueError(f"Formato de exportação inválido: {export_format}")
+        if suffix == "gz":
+            return ExportPlan(EXPORT_ENCODERS[name], gzip_file=True)
+        encoder = EXPORT_ENCODERS[name]
+    elif _accepts(accept, NdjsonEncoder.media_type) or _accepts(accept, "application/ndjson"):
+        encoder = NdjsonEncoder
+    else:
+        encoder = CsvEncoder
+
+    return ExportPlan(encoder, gzip_transport=_accepts(accept_encoding, "gzip"))
+
+
+def export_plan_dependency(
+    request: Request,
+    export_format: Optional[str] = Query(
+        None, alias="format", description="csv, ndjson, csv.gz ou ndjson.gz"
+    )
+) -> ExportPlan:
+    """Dependência das rotas de exportação: negocia formato e compressão (400 se inválido)."""
+    try:
+        return negotiate_export(
+            export_format,
+            request.headers.get("accept"),
+            request.headers.get("accept-encoding"),
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        ) from exc
+
+
+def csv_export_plan_dependency(request: Request) -> ExportPlan:
+    """Dependência de /export.csv: sempre CSV; só o gzip de transporte é negociado."""
+    return ExportPlan(
+        CsvEncoder, gzip_transport=_accepts(request.headers.get("accept-encoding"), "gzip")
+    )
@@ -0,0 +1,99 @@
+"""
+Caminho rápido de serialização (opt-in via FAST_JSON_ENABLED) para as maiores
+respostas de leitura: a listagem de tarefas e o dashboard.
+
+No caminho padrão, a rota devolve objetos ORM (hidratados no identity map da
+sessão) e o FastAPI os valida contra o response_model antes de codificar. No
+caminho rápido, a rota seleciona só as colunas do schema (linhas, sem objetos
+ORM) e um TypeAdapter construído uma única vez valida e codifica direto para
+bytes JSON no núcleo em Rust do pydantic. O JSON produzido é o mesmo.
+"""
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from fastapi import Response
+from pydantic import TypeAdapter, create_model
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.database import settings
+from app.models import Task as TaskModel
+from app.models import UserBadge as UserBadgeModel
+from app.schemas import Task, User, UserBadge, UserDashboard
+from app.utils.fieldsets import TASK_FIELDS, partial_task_model
+
+TASK_LIST_ADAPTER = TypeAdapter(List[Task])
+DASHBOARD_ADAPTER = TypeAdapter(UserDashboard)
+
+
+def fast_json_enabled() -> bool:
+    """Lido a cada requisição (e não na importação) para poder ser alternado em testes."""
+    return settings.FAST_JSON_ENABLED
+
+
+def task_columns(fields: Optional[Tuple[str, ...]] = None, extra: Tuple[str, ...] = ()):
+    """
+    Colunas de tasks para o SELECT das linhas: os campos pedidos (todos os do
+    schema Task por padrão) mais as colunas extras que a rota usa internamente.
+    """
+    names = dict.fromkeys((*(fields or TASK_FIELDS), *extra))
+    return [getattr(TaskModel, name) for name in names]
+
+
+@lru_cache(maxsize=64)
+def task_list_adapter(fields: Optional[Tuple[str, ...]] = None) -> TypeAdapter:
+    """Adapter da listagem: o schema completo ou o recorte de fieldsets.partial_task_model."""
+    if fields is None:
+        return TASK_LIST_ADAPTER
+    return TypeAdapter(List[partial_task_model(fields)])
+
+
+@lru_cache(maxsize=64)
+def dashboard_adapter(fields: Optional[Tuple[str, ...]] = None) -> TypeAdapter:
+    """Adapter do dashboard com as tarefas recortadas em fields (usuário e conquistas inteiros)."""
+    if fields is None:
+        return DASHBOARD_ADAPTER
+    return TypeAdapter(create_model(
+        f"UserDashboard[{','.join(fields)}]",
+        user=(User, ...),
+        tasks=(List[partial_task_model(fields)], ...),
+        badges=(List[UserBadge], ...),
+    ))
+
+
+def dashboard_tasks_query(user_id: int, fields: Optional[Tuple[str, ...]] = None):
+    return select(*task_columns(fields)).where(TaskModel.owner_id == user_id).order_by(TaskModel.id)
+
+
+def as_dicts(result) -> list:
+    """
+    Linhas de um resultado como dicionários. Para milhares de linhas, o pydantic
+    valida dicionários bem mais rápido do que lê as mesmas colunas por atributo.
+    """
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def dashboard_badges_query(user_id: int):
+    """
+    Conquistas com a Badge de cada uma. Em query separada da das tarefas: no
+    mesmo JOIN, cada tarefa seria repetida para cada conquista.
+    """
+    return (
+        select(UserBadgeModel)
+        .options(joinedload(UserBadgeModel.badge))
+        .where(UserBadgeModel.user_id == user_id)
+    )
+
+
+def json_response(adapter: TypeAdapter, content, response: Response) -> Response:
+    """
+    Valida content (linhas ou objetos, lidos por atributo) e devolve os bytes JSON
+    numa Response pronta, que o FastAPI envia sem serializar de novo.
+    """
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    fast = Response(body, media_type="application/json")
+    # Cabeçalhos definidos pelas dependências e pela rota (ETag, X-Next-Cursor);
+    # ao devolver uma Response própria, o FastAPI não os copia sozinho
+    fast.headers.raw.extend(response.headers.raw)
+    return fast
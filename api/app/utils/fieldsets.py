@@ -0,0 +1,62 @@
+"""
+Campos esparsos (?fields=title,subject,due_date) nas listagens de tarefas.
+
+O cliente escolhe quais campos do schema Task quer receber: o SELECT lê só
+essas colunas e a resposta só traz esses campos (mais o id, que identifica a
+tarefa). A tela de listagem, por exemplo, não precisa da descrição, uma
+coluna Text sem limite de tamanho.
+"""
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, ConfigDict, create_model
+
+from app.schemas import Task
+
+TASK_FIELDS = tuple(Task.model_fields)
+
+
+def parse_task_fields(raw: str) -> Tuple[str, ...]:
+    """
+    Valida a lista separada por vírgulas contra o schema Task e a devolve na
+    ordem do schema, sem repetições e sempre com o id. Campo desconhecido gera ValueError.
+    """
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = sorted(requested.difference(TASK_FIELDS))
+    if not requested or unknown:
+        raise ValueError(
+            f"Campos inválidos: {', '.join(unknown) or raw!r}. Permitidos: {', '.join(TASK_FIELDS)}"
+        )
+    requested.add("id")
+    return tuple(name for name in TASK_FIELDS if name in requested)
+
+
+def task_fields_dependency(
+    fields: Optional[str] = Query(
+        None, description=f"Campos de cada tarefa, separados por vírgula ({', '.join(TASK_FIELDS)})"
+    )
+) -> Optional[Tuple[str, ...]]:
+    """Dependência das listagens: None devolve todos os campos (400 se houver campo inválido)."""
+    if fields is None:
+        return None
+    try:
+        return parse_task_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        ) from exc
+
+
+@lru_cache(maxsize=64)
+def partial_task_model(fields: Tuple[str, ...]) -> type[BaseModel]:
+    """
+    Recorte do schema Task com os mesmos tipos (e portanto a mesma serialização)
+    só para os campos pedidos. Um modelo por combinação, criado uma única vez.
+    """
+    return create_model(
+        f"Task[{','.join(fields)}]",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (Task.model_fields[name].annotation, ...) for name in fields},
+    )
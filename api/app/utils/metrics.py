@@ -0,0 +1,237 @@
+"""
+Métricas por requisição no formato de exposição do Prometheus (GET /metrics).
+
+O MetricsMiddleware (ASGI puro, sem BaseHTTPMiddleware) mede a latência e o
+tamanho da resposta por template de rota (/tasks/{task_id}, nunca o caminho
+cru, para não explodir a cardinalidade). Os eventos before/after_cursor_execute
+do engine somam a quantidade de comandos SQL e o tempo de banco da requisição
+corrente, encontrada por uma ContextVar: o contexto é copiado para o threadpool
+das rotas síncronas e para o greenlet do run_sync, então as contas caem na
+requisição certa.
+
+O custo por requisição é constante: alguns perf_counter, um bisect por
+histograma e a soma em listas pré-alocadas. Fora de uma requisição
+(scripts, migrações), os eventos SQL só consultam a ContextVar.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+# Limites superiores (le) dos buckets de cada histograma
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Requisições sem rota (404) são agrupadas num único rótulo
+UNMATCHED_ROUTE = "<unmatched>"
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Histograma cumulativo do Prometheus com buckets fixos."""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # o último é o +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: str):
+        """Linhas _bucket (acumuladas), _sum e _count."""
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.sum:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+@dataclass
+class RequestStats:
+    """Acumulado de banco da requisição corrente."""
+    __slots__ = ("statements", "db_seconds", "statement_started")
+    statements: int
+    db_seconds: float
+    # Os comandos de uma requisição são sequenciais: basta o início do último
+    statement_started: float
+
+
+@dataclass
+class RouteMetrics:
+    latency: Histogram
+    response_size: Histogram
+    statements: Histogram
+    db_time: Histogram
+
+    @classmethod
+    def create(cls) -> "RouteMetrics":
+        return cls(
+            latency=Histogram(LATENCY_BUCKETS),
+            response_size=Histogram(SIZE_BUCKETS),
+            statements=Histogram(STATEMENT_BUCKETS),
+            db_time=Histogram(DB_TIME_BUCKETS),
+        )
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("metrics_request", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Histogramas por (método, rota, status) e a ligação com os engines."""
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str, int], RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    # --- SQL -----------------------------------------------------------------
+
+    def attach(self, engine) -> "MetricsRegistry":
+        """Conta comandos e tempo de banco das requisições no engine (síncrono)."""
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        return self
+
+    # --- requisições ---------------------------------------------------------
+
+    @staticmethod
+    def start_request():
+        """Abre o acumulado de banco da requisição; devolve o token da ContextVar."""
+        stats = RequestStats(0, 0.0, 0.0)
+        return stats, _current_request.set(stats)
+
+    @staticmethod
+    def end_request(token):
+        _current_request.reset(token)
+
+    def observe(self, method: str, route: str, status: int, seconds: float,
+                response_bytes: int, stats: RequestStats):
+        key = (method, route, status)
+        with self._lock:
+            metrics = self._routes.get(key)
+            if metrics is None:
+                metrics = self._routes[key] = RouteMetrics.create()
+            metrics.latency.observe(seconds)
+            metrics.response_size.observe(response_bytes)
+            metrics.statements.observe(stats.statements)
+            metrics.db_time.observe(stats.db_seconds)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    # --- exposição -----------------------------------------------------------
+
+    def render(self) -> str:
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)."""
+        with self._lock:
+            snapshot = [
+                (key, RouteMetrics(*(_copy(h) for h in (m.latency, m.response_size,
+                                                         m.statements, m.db_time))))
+                for key, m in sorted(self._routes.items())
+            ]
+
+        families = (
+            ("http_request_duration_seconds", "latency",
+             "Latência das requisições HTTP por rota, em segundos."),
+            ("http_response_size_bytes", "response_size",
+             "Tamanho do corpo das respostas HTTP, em bytes."),
+            ("db_statements_per_request", "statements",
+             "Comandos SQL executados por requisição."),
+            ("db_time_per_request_seconds", "db_time",
+             "Tempo gasto em comandos SQL por requisição, em segundos."),
+        )
+
+        lines = []
+        for name, attribute, help_text in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route, status), metrics in snapshot:
+                labels = f'method="{method}",route="{_escape(route)}",status="{status}"'
+                lines.extend(getattr(metrics, attribute).samples(name, labels))
+        return "\n".join(lines) + "\n"
+
+
+def _copy(histogram: Histogram) -> Histogram:
+    copy = Histogram(histogram.buckets)
+    copy.counts = list(histogram.counts)
+    copy.sum = histogram.sum
+    copy.count = histogram.count
+    return copy
+
+
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, _context, _executemany):
+    stats = _current_request.get()
+    if stats is not None:
+        stats.statement_started = time.perf_counter()
+
+
+def _after_cursor_execute(_conn, _cursor, _statement, _parameters, _context, _executemany):
+    stats = _current_request.get()
+    if stats is not None:
+        stats.db_seconds += time.perf_counter() - stats.statement_started
+        stats.statements += 1
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro: mede cada requisição HTTP sem bufferizar a resposta
+    (respostas em streaming continuam em streaming; o tempo vai até o último bloco).
+    """
+
+    def __init__(self, app, registry: "MetricsRegistry"):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats, token = self.registry.start_request()
+        status = 500
+        response_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.end_request(token)
+            route = scope.get("route")
+            self.registry.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - started,
+                response_bytes,
+                stats,
+            )
+
+
+request_metrics = MetricsRegistry()
@@ -0,0 +1,78 @@
+"""Módulo de paginação por cursor (keyset) para listagens de tarefas."""
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, or_
+
+from app.models import Task
+
+
+# Colunas lidas por encode_task_cursor: toda listagem paginada precisa selecioná-las
+TASK_CURSOR_FIELDS = ("due_date", "weight", "id")
+
+
+class InvalidCursorError(ValueError):
+    """Cursor malformado ou adulterado pelo cliente."""
+
+
+def encode_task_cursor(task) -> str:
+    """
+    Gera um cursor opaco a partir da última tarefa de uma página.
+    A chave (due_date, weight, id) acompanha exatamente o ORDER BY da listagem.
+    """
+    due_date = task.due_date.isoformat() if task.due_date else None
+    raw = json.dumps([due_date, task.weight, task.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_task_cursor(cursor: str) -> tuple[Optional[datetime], int, int]:
+    """Decodifica um cursor gerado por encode_task_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        due_date, weight, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        due_date = datetime.fromisoformat(due_date) if due_date is not None else None
+        return due_date, int(weight), int(task_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Cursor de paginação inválido") from exc
+
+
+def task_keyset_order():
+    """ORDER BY estável usado tanto na paginação por offset quanto por cursor."""
+    return (
+        Task.due_date.asc().nulls_last(),
+        Task.weight.desc(),
+        Task.id.asc(),
+    )
+
+
+def task_keyset_segments(cursor: str) -> tuple:
+    """
+    [OTIMIZAÇÃO DE PERFORMANCE - KEYSET PAGINATION]
+    Em vez de OFFSET (que lê e descarta todas as linhas anteriores), a próxima
+    página começa exatamente após a última chave vista.
+
+    Retorna as condições dos trechos da listagem depois do cursor, na ordem:
+    com cursor datado, o resto das tarefas com prazo e depois as sem prazo
+    (NULLS LAST); com cursor sem prazo, só o resto das sem prazo. Cada condição
+    começa por um limite de intervalo (due_date >= d, ou due_date IS NULL e
+    weight <= w), para o banco posicionar o índice (owner_id, due_date, weight, id)
+    direto na chave: o custo de qualquer página é o mesmo da primeira. Um OR com
+    "due_date IS NULL" na mesma condição impediria esse posicionamento.
+    """
+    due_date, weight, task_id = decode_task_cursor(cursor)
+
+    same_due_date_tail = or_(
+        Task.weight < weight,
+        and_(Task.weight == weight, Task.id > task_id),
+    )
+    null_tail = Task.due_date.is_(None)
+
+    if due_date is None:
+        return (and_(null_tail, Task.weight <= weight, same_due_date_tail),)
+
+    return (
+        and_(Task.due_date >= due_date, or_(Task.due_date > due_date, same_due_date_tail)),
+        null_tail,
+    )
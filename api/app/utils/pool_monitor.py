@@ -0,0 +1,183 @@
+"""Métricas do pool de conexões e detector de conexões retidas por tempo demais."""
+import logging
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class _WaitTimingMixin:
+    """
+    Mede quanto tempo cada checkout esperou por uma conexão livre.
+    Os eventos de pool só disparam depois que a conexão foi obtida; a espera
+    na fila (o sinal de pool subdimensionado) só é visível dentro de _do_get.
+    """
+    monitor: Optional["PoolMonitor"] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.monitor is not None:
+                self.monitor.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.monitor is not None:
+            self.monitor.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+@dataclass
+class _Checkout:
+    started_at: float
+    stack: Optional[List[str]]
+    reported: bool = False
+
+
+@dataclass
+class PoolMonitor:
+    """
+    Acompanha os checkouts de um engine. Conexões retidas além de
+    leak_threshold_seconds são registradas no log (0 desliga o detector).
+    Por padrão cada checkout guarda só o horário; com capture_stacks, guarda
+    também a pilha de onde a conexão saiu do pool, o que custa um
+    traceback.extract_stack (~0,1 ms) por checkout: use para investigar.
+    """
+    leak_threshold_seconds: float = 30.0
+    capture_stacks: bool = False
+    stack_depth: int = 20
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _active: Dict[int, _Checkout] = field(default_factory=dict, repr=False)
+    checkouts: int = 0
+    wait_count: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    wait_timeouts: int = 0
+    hold_max: float = 0.0
+    leaks_detected: int = 0
+
+    def attach(self, engine):
+        """Registra os eventos de pool do engine (síncrono ou engine.sync_engine)."""
+        pool = engine.pool
+        if isinstance(pool, _WaitTimingMixin):
+            pool.monitor = self
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        return self
+
+    @property
+    def detects_leaks(self) -> bool:
+        return self.leak_threshold_seconds > 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.wait_timeouts += timed_out
+
+    def _capture_stack(self) -> List[str]:
+        """Pilha do checkout sem os quadros do SQLAlchemy e deste módulo."""
+        frames = [
+            frame for frame in traceback.extract_stack()
+            if "sqlalchemy" not in frame.filename and frame.filename != __file__
+        ]
+        return traceback.format_list(frames[-self.stack_depth:])
+
+    def _on_checkout(self, _dbapi_connection, connection_record, _connection_proxy):
+        stack = self._capture_stack() if self.capture_stacks and self.detects_leaks else None
+        with self._lock:
+            self.checkouts += 1
+            self._active[id(connection_record)] = _Checkout(time.monotonic(), stack)
+
+    def _on_checkin(self, _dbapi_connection, connection_record):
+        with self._lock:
+            checkout = self._active.pop(id(connection_record), None)
+        if checkout is None:
+            return
+        held = time.monotonic() - checkout.started_at
+        with self._lock:
+            self.hold_max = max(self.hold_max, held)
+        if self.detects_leaks and held > self.leak_threshold_seconds and not checkout.reported:
+            self._report(checkout, held, returned=True)
+
+    def _report(self, checkout: _Checkout, held: float, returned: bool):
+        checkout.reported = True
+        with self._lock:
+            self.leaks_detected += 1
+        logger.warning(
+            "Conexão retida por %.1fs (limite %.1fs)%s. Checkout em:\n%s",
+            held, self.leak_threshold_seconds,
+            "" if returned else " e ainda não devolvida",
+            "".join(checkout.stack) if checkout.stack is not None
+            else "(pilha não capturada; ligue DB_LEAK_CAPTURE_STACKS)\n",
+        )
+
+    def find_leaks(self) -> List[dict]:
+        """Conexões ainda fora do pool além do limite, com a pilha do checkout."""
+        if not self.detects_leaks:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            suspects = [c for c in self._active.values()
+                        if now - c.started_at > self.leak_threshold_seconds]
+        leaks = []
+        for checkout in suspects:
+            held = now - checkout.started_at
+            if not checkout.reported:
+                self._report(checkout, held, returned=False)
+            leaks.append({"held_seconds": round(held, 3), "stack": checkout.stack or []})
+        return leaks
+
+    def snapshot(self, engine) -> dict:
+        """Estado atual do pool e estatísticas acumuladas de espera e retenção."""
+        pool = engine.pool
+        now = time.monotonic()
+        leaks = self.find_leaks()
+        with self._lock:
+            held = [now - c.started_at for c in self._active.values()]
+            data = {
+                "pool_class": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "wait": {
+                    "count": self.wait_count,
+                    "avg_ms": round(self.wait_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                    "max_ms": round(self.wait_max * 1000, 3),
+                    "timeouts": self.wait_timeouts,
+                },
+                "held": {
+                    "active": len(held),
+                    "longest_ms": round(max(held, default=0.0) * 1000, 3),
+                    "max_ms": round(self.hold_max * 1000, 3),
+                },
+                "leak_threshold_seconds": self.leak_threshold_seconds,
+                "leaks_detected": self.leaks_detected,
+                "leaks": leaks,
+            }
+
+        # size/checkedout/overflow só existem nos pools com fila (QueuePool e derivados)
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,  # pylint: disable=protected-access
+                "timeout": pool.timeout(),
+            })
+        return data
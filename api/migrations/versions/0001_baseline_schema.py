@@ -0,0 +1,107 @@
+"""Esquema inicial (equivalente ao antigo Base.metadata.create_all).
+
+Bancos criados antes do Alembic já possuem estas tabelas: a migração só cria
+o que estiver faltando, então basta rodar `alembic upgrade head` neles também.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-11-20 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing(table_name: str) -> bool:
+    # Em modo offline (--sql) não há conexão para inspecionar: gera o DDL completo
+    if op.get_context().as_sql:
+        return True
+    return not sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _missing("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String()),
+            sa.Column("username", sa.String()),
+            sa.Column("hashed_password", sa.String()),
+            sa.Column("total_points", sa.Integer()),
+            sa.Column("current_streak", sa.Integer()),
+            sa.Column("last_activity_date", sa.DateTime()),
+            sa.Column("created_at", sa.DateTime()),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    if _missing("tasks"):
+        op.create_table(
+            "tasks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String()),
+            sa.Column("description", sa.Text()),
+            sa.Column("subject", sa.String()),
+            sa.Column("weight", sa.Integer()),
+            sa.Column("due_date", sa.DateTime()),
+            sa.Column("is_completed", sa.Boolean()),
+            sa.Column("completed_at", sa.DateTime()),
+            sa.Column("points_awarded", sa.Integer()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id")),
+        )
+        op.create_index("ix_tasks_id", "tasks", ["id"])
+        op.create_index("ix_tasks_title", "tasks", ["title"])
+
+    if _missing("badges"):
+        op.create_table(
+            "badges",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), unique=True),
+            sa.Column("description", sa.String()),
+            sa.Column("icon", sa.String()),
+            sa.Column("points_required", sa.Integer()),
+            sa.Column("tasks_required", sa.Integer()),
+        )
+        op.create_index("ix_badges_id", "badges", ["id"])
+
+    if _missing("user_badges"):
+        op.create_table(
+            "user_badges",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("badge_id", sa.Integer(), sa.ForeignKey("badges.id")),
+            sa.Column("earned_at", sa.DateTime()),
+        )
+        op.create_index("ix_user_badges_id", "user_badges", ["id"])
+
+    if _missing("subjects"):
+        op.create_table(
+            "subjects",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id")),
+        )
+        op.create_index("ix_subjects_id", "subjects", ["id"])
+        op.create_index("ix_subjects_name", "subjects", ["name"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("subjects")
+    op.drop_table("user_badges")
+    op.drop_table("badges")
+    op.drop_table("tasks")
+    op.drop_table("users")
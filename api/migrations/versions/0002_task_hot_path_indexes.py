@@ -0,0 +1,62 @@
+"""Índices compostos e parcial para os caminhos quentes de tarefas.
+
+Cobre os padrões de acesso dos routers:
+- listagem: WHERE owner_id [AND is_completed] ORDER BY due_date, weight DESC, id
+- pendentes: índice parcial (menor) só com as tarefas não concluídas
+- filtros por disciplina, checagem de disciplina duplicada e badges do usuário
+
+No Postgres os índices são criados com CREATE INDEX CONCURRENTLY para não
+bloquear escritas em tabelas grandes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-11-20 10:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_ONLY = sa.text("is_completed = false")
+
+INDEXES = [
+    ("ix_tasks_owner_due_weight", "tasks",
+     ["owner_id", "due_date", sa.text("weight DESC"), "id"], {}),
+    ("ix_tasks_owner_completed_due", "tasks",
+     ["owner_id", "is_completed", "due_date", sa.text("weight DESC")], {}),
+    ("ix_tasks_owner_subject", "tasks", ["owner_id", "subject"], {}),
+    ("ix_tasks_owner_pending_due", "tasks",
+     ["owner_id", "due_date", sa.text("weight DESC")],
+     {"postgresql_where": PENDING_ONLY, "sqlite_where": sa.text("is_completed = 0")}),
+    ("ix_subjects_owner_name", "subjects", ["owner_id", "name"], {}),
+    ("ix_user_badges_user_badge", "user_badges", ["user_id", "badge_id"], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+
+    # CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True,
+                postgresql_concurrently=is_postgres,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _columns, _kwargs in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
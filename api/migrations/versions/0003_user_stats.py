@@ -0,0 +1,67 @@
+"""Tabela user_stats com contadores desnormalizados por usuário.
+
+Cria a tabela e faz o backfill com um único INSERT ... SELECT ... GROUP BY.
+Depois disso os contadores são mantidos pelas escritas da aplicação
+(app/services/stats_service.py).
+
+A tabela pode já existir (criada pelo create_all da importação de app.main em
+um banco anterior ao Alembic): nesse caso o backfill só cobre os usuários que
+ainda não têm linha.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-11-21 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing(table_name: str) -> bool:
+    # Em modo offline (--sql) não há conexão para inspecionar: gera o DDL completo
+    if op.get_context().as_sql:
+        return True
+    return not sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A tabela do create_all já vem com data_version (0005), NOT NULL e sem
+    # default no banco: o backfill precisa preenchê-la
+    version_column = ""
+    if _missing("user_stats"):
+        op.create_table(
+            "user_stats",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("pending_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("task_points", sa.Integer(), nullable=False, server_default="0"),
+        )
+    elif "data_version" in {c["name"] for c in sa.inspect(op.get_bind()).get_columns("user_stats")}:
+        version_column = ", data_version"
+
+    op.execute(f"""
+        INSERT INTO user_stats (user_id, completed_count, pending_count, task_points{version_column})
+        SELECT users.id,
+               COALESCE(SUM(CASE WHEN tasks.is_completed THEN 1 ELSE 0 END), 0),
+               COUNT(tasks.id) - COALESCE(SUM(CASE WHEN tasks.is_completed THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(tasks.points_awarded), 0){version_column and ", 0"}
+        FROM users
+        LEFT JOIN tasks ON tasks.owner_id = users.id
+        WHERE NOT EXISTS (SELECT 1 FROM user_stats WHERE user_stats.user_id = users.id)
+        GROUP BY users.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_stats")
@@ -0,0 +1,47 @@
+"""Coluna badges.streak_required (regras de streak orientadas a dados).
+
+Substitui a comparação pelo nome ("Streak Iniciante"/"Streak Master") no
+badge_service por um limiar armazenado ao lado de points_required e
+tasks_required.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-11-21 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing_column(table_name: str, column_name: str) -> bool:
+    # Em modo offline (--sql) não há conexão para inspecionar: gera o DDL completo
+    if op.get_context().as_sql:
+        return True
+    columns = sa.inspect(op.get_bind()).get_columns(table_name)
+    return column_name not in {column["name"] for column in columns}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Já existe em bancos criados pelo create_all de app.main com o model atual
+    if _missing_column("badges", "streak_required"):
+        with op.batch_alter_table("badges") as batch_op:
+            batch_op.add_column(sa.Column("streak_required", sa.Integer(), server_default="0"))
+
+    op.execute("UPDATE badges SET streak_required = 3 WHERE name = 'Streak Iniciante'")
+    op.execute("UPDATE badges SET streak_required = 7 WHERE name = 'Streak Master'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("badges") as batch_op:
+        batch_op.drop_column("streak_required")
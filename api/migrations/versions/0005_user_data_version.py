@@ -0,0 +1,46 @@
+"""Coluna user_stats.data_version (ETags das leituras por usuário).
+
+Contador monotônico incrementado por toda escrita em tarefas, disciplinas e
+pontuação; as rotas de leitura o usam como ETag e respondem 304 sem consultar
+as tabelas de tarefas.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-11-24 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing_column(table_name: str, column_name: str) -> bool:
+    # Em modo offline (--sql) não há conexão para inspecionar: gera o DDL completo
+    if op.get_context().as_sql:
+        return True
+    columns = sa.inspect(op.get_bind()).get_columns(table_name)
+    return column_name not in {column["name"] for column in columns}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Já existe se a tabela veio do create_all de app.main (ver 0003)
+    if _missing_column("user_stats", "data_version"):
+        with op.batch_alter_table("user_stats") as batch_op:
+            batch_op.add_column(
+                sa.Column("data_version", sa.Integer(), nullable=False, server_default="0")
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("user_stats") as batch_op:
+        batch_op.drop_column("data_version")
@@ -0,0 +1,94 @@
+"""Badges padrão e disciplinas a partir das tarefas (antes feitos a cada startup).
+
+Substitui initialize_badges e migrate_subjects do startup da aplicação, que
+liam todas as tarefas sem disciplina e faziam um SELECT por badge e por par
+(owner_id, subject) a cada boot. Aqui tudo é feito uma vez, com comandos
+sobre conjuntos: um UPDATE, um INSERT ... SELECT ... WHERE NOT EXISTS para as
+disciplinas e um INSERT condicional por badge padrão.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-11-26 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Cópia congelada de badge_service.DEFAULT_BADGES: a migração não deve mudar
+# se a lista da aplicação mudar depois
+DEFAULT_BADGES = (
+    ("Primeira Tarefa", "Completou sua primeira tarefa", "🎯", 0, 1, 0),
+    ("Streak Iniciante", "Manteve um streak de 3 dias", "🔥", 0, 0, 3),
+    ("Estudioso", "Completou 10 tarefas", "📚", 0, 10, 0),
+    ("Dedicado", "Acumulou 100 pontos", "⭐", 100, 0, 0),
+    ("Streak Master", "Manteve um streak de 7 dias", "🏆", 0, 0, 7),
+    ("Centena", "Completou 100 tarefas", "💯", 0, 100, 0),
+    ("Milhar", "Acumulou 1000 pontos", "💎", 1000, 0, 0),
+)
+
+badges = sa.table(
+    "badges",
+    sa.column("name", sa.String),
+    sa.column("description", sa.String),
+    sa.column("icon", sa.String),
+    sa.column("points_required", sa.Integer),
+    sa.column("tasks_required", sa.Integer),
+    sa.column("streak_required", sa.Integer),
+)
+
+tasks = sa.table(
+    "tasks",
+    sa.column("owner_id", sa.Integer),
+    sa.column("subject", sa.String),
+)
+
+subjects = sa.table(
+    "subjects",
+    sa.column("owner_id", sa.Integer),
+    sa.column("name", sa.String),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = [column.name for column in badges.columns]
+    for values in DEFAULT_BADGES:
+        row = sa.select(*(sa.literal(value) for value in values)).where(
+            ~sa.exists().where(badges.c.name == values[0])
+        )
+        op.execute(badges.insert().from_select(columns, row))
+
+    # 1. Tarefas sem disciplina vão para "Geral"
+    op.execute(
+        tasks.update()
+        .where(sa.or_(tasks.c.subject.is_(None), tasks.c.subject == ""))
+        .values(subject="Geral")
+    )
+
+    # 2. Uma disciplina por (owner_id, subject) distinto que ainda não exista
+    distinct_pairs = sa.select(
+        tasks.c.subject, tasks.c.owner_id, sa.func.current_timestamp()
+    ).where(
+        tasks.c.owner_id.isnot(None),
+        ~sa.exists().where(
+            subjects.c.owner_id == tasks.c.owner_id,
+            subjects.c.name == tasks.c.subject,
+        ),
+    ).distinct()
+    op.execute(subjects.insert().from_select(["name", "owner_id", "created_at"], distinct_pairs))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Migração só de dados: badges, disciplinas e o "Geral" atribuído às
+    # tarefas não são distinguíveis dos criados pelos usuários
@@ -0,0 +1,132 @@
+"""
+Benchmark de concorrência: DB_MODE=sync x DB_MODE=async.
+
+Para cada modo, sobe a aplicação num subprocesso (as configurações são lidas na
+importação), popula um SQLite local e dispara N clientes concorrentes contra
+GET /tasks/ e GET /users/dashboard via httpx (ASGI em processo). No modo sync as
+requisições disputam as threads do threadpool; no modo async esperam o banco
+no event loop (aiosqlite como substituto local do asyncpg).
+
+Uso (a partir da raiz do repositório):
+    python scripts/async_benchmark.py [--concurrency 100] [--seconds 5] [--tasks 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ("sync", "async")
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_load(app, token, concurrency, seconds):
+    import httpx  # pylint: disable=import-outside-toplevel
+
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                 base_url="http://bench", timeout=60) as client:
+        async def worker(path):
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path, headers=headers)
+                    if response.status_code != 200:
+                        errors += 1
+                except Exception:  # pylint: disable=broad-except
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        paths = ["/tasks/", "/users/dashboard"]
+        await asyncio.gather(*(worker(paths[i % len(paths)]) for i in range(concurrency)))
+
+    return {
+        "req/s": len(latencies) / seconds,
+        "erros": errors,
+        "p50 ms": statistics.median(latencies) if latencies else float("nan"),
+        "p99 ms": percentile(latencies, 99),
+    }
+
+
+def child(args):
+    """Executado no subprocesso, com DB_MODE e DATABASE_URL já no ambiente."""
+    sys.path.append(os.path.join(os.getcwd(), 'api'))
+
+    # pylint: disable=import-outside-toplevel
+    from fastapi.testclient import TestClient
+
+    from app.auth.auth_handler import create_access_token
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import Task, User
+
+    with TestClient(app):  # dispara a criação do esquema na startup
+        pass
+
+    db = SessionLocal()
+    try:
+        user = User(email="async_bench@example.com", username="asyncbench", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add_all([
+            Task(title=f"Tarefa {i}", subject="Geral", weight=i % 10 + 1, owner_id=user.id)
+            for i in range(args.tasks)
+        ])
+        db.commit()
+        token = create_access_token({"sub": str(user.id)})
+    finally:
+        db.close()
+
+    result = asyncio.run(run_load(app, token, args.concurrency, args.seconds))
+    print(json.dumps(result))
+
+
+def main(args):
+    print(f"Concorrência: {args.concurrency} clientes por {args.seconds:.0f}s "
+          f"({args.tasks} tarefas por usuário)\n")
+    print(f"  {'modo':<6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'erros':>7}")
+
+    for mode in MODES:
+        db_dir = tempfile.mkdtemp(prefix=f"async_bench_{mode}_")
+        env = dict(os.environ, DB_MODE=mode,
+                   DATABASE_URL=f"sqlite:///{os.path.join(db_dir, 'bench.db')}")
+        output = subprocess.run(
+            [sys.executable, __file__, "--child",
+             "--concurrency", str(args.concurrency),
+             "--seconds", str(args.seconds),
+             "--tasks", str(args.tasks)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"  {mode:<6} {result['req/s']:>9.1f} {result['p50 ms']:>9.1f} "
+              f"{result['p99 ms']:>9.1f} {result['erros']:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    cli_args = parser.parse_args()
+
+    if cli_args.child:
+        child(cli_args)
+    else:
+        main(cli_args)
@@ -0,0 +1,97 @@
+"""
+Microbenchmark do custo de autenticação por requisição.
+
+Compara o pipeline antigo (JWTBearer.verify_jwt + get_current_user decodificando
+o mesmo token duas vezes) com o novo (uma decodificação, reaproveitada do cache
+de tokens verificados entre requisições).
+
+Uso (a partir da raiz do repositório):
+    python scripts/auth_benchmark.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.append(os.path.join(os.getcwd(), 'api'))
+
+_db_dir = tempfile.mkdtemp(prefix="auth_bench_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}")
+
+# pylint: disable=wrong-import-position
+from fastapi.testclient import TestClient
+
+from app.auth.auth_handler import clear_token_cache, create_access_token, decode_jwt, verify_token
+from app.database import SessionLocal
+from app.main import app
+from app.models import User
+
+ITERATIONS = 20_000
+REQUESTS = 2_000
+
+
+def old_pipeline(token):
+    """Como era: verify_jwt decodifica, get_current_user decodifica de novo."""
+    assert decode_jwt(token) is not None
+    return decode_jwt(token)
+
+
+def new_pipeline_cold(token):
+    """Uma decodificação por requisição (cache vazio, ex.: primeiro acesso)."""
+    clear_token_cache()
+    return verify_token(token)
+
+
+def new_pipeline_warm(token):
+    """Token já verificado recentemente: apenas a busca no LRU."""
+    return verify_token(token)
+
+
+def report(label, seconds, count, baseline=None):
+    per_call = seconds / count * 1_000_000
+    speedup = f"  ({baseline / per_call:.1f}x)" if baseline else ""
+    print(f"  {label:<38} {per_call:>9.2f} µs/req{speedup}")
+    return per_call
+
+
+def bench_functions(token):
+    print(f"[1] Apenas a camada de JWT ({ITERATIONS:,} iterações)")
+    before = report("Antes  (2x decode_jwt)",
+                    timeit.timeit(lambda: old_pipeline(token), number=ITERATIONS), ITERATIONS)
+    report("Depois (1x decode, cache frio)",
+           timeit.timeit(lambda: new_pipeline_cold(token), number=ITERATIONS), ITERATIONS, before)
+    report("Depois (cache quente)",
+           timeit.timeit(lambda: new_pipeline_warm(token), number=ITERATIONS), ITERATIONS, before)
+
+
+def bench_endpoint(token):
+    print(f"\n[2] Requisição completa GET /users/me ({REQUESTS:,} requisições)")
+    headers = {"Authorization": f"Bearer {token}"}
+    with TestClient(app) as client:
+        client.get("/users/me", headers=headers)
+
+        def cold():
+            clear_token_cache()
+            client.get("/users/me", headers=headers)
+
+        cold_us = report("Cache frio (decode a cada requisição)",
+                         timeit.timeit(cold, number=REQUESTS), REQUESTS)
+        report("Cache quente",
+               timeit.timeit(lambda: client.get("/users/me", headers=headers), number=REQUESTS),
+               REQUESTS, cold_us)
+
+
+if __name__ == "__main__":
+    with TestClient(app):  # dispara a criação do esquema na startup
+        pass
+    db = SessionLocal()
+    try:
+        user = User(email="bench@example.com", username="benchauth", hashed_password="x")
+        db.add(user)
+        db.commit()
+        bench_token = create_access_token({"sub": str(user.id)})
+    finally:
+        db.close()
+
+    bench_functions(bench_token)
+    bench_endpoint(bench_token)
@@ -0,0 +1,406 @@
+"""
+Suíte de micro-benchmarks dos serviços e routers, com baselines em JSON.
+
+Mede o código real (nada simulado) num SQLite temporário, sem rede:
+  - services.process_task_completion  conclusão de uma tarefa (pontos, streak, badges, commit)
+  - services.check_and_award_badges   avaliação de badges de um usuário já carregado
+  - routers.list_tasks                GET /tasks/ pela aplicação completa (TestClient)
+  - routers.get_user_dashboard        GET /users/dashboard
+  - routers.*.fast_json               as mesmas rotas com FAST_JSON_ENABLED (página de 100 tarefas);
+                                      list_tasks.default_json é a mesma página no caminho padrão
+  - routers.list_tasks.sparse_fields  a mesma página com ?fields= da tela de listagem
+  - export.csv / export.ndjson        export_tasks_generator consumindo o cursor do banco
+  - auth.decode_jwt / auth.verify_token_cached   (não dependem do volume de dados)
+
+Cada tier é um usuário com N tarefas (metade concluídas). Para cada benchmark
+são feitas uma rodada de aquecimento e --rounds rodadas medidas; o JSON guarda a
+mediana e o mínimo por chamada e quantos comandos SQL cada chamada executou.
+
+Uso (a partir da raiz do repositório):
+    python scripts/benchmark_suite.py run --output benchmarks/baseline.json
+    python scripts/benchmark_suite.py run --output benchmarks/atual.json --tiers 100,1000
+    python scripts/benchmark_suite.py compare benchmarks/baseline.json benchmarks/atual.json --threshold 0.15
+
+O compare sai com código 1 se algum benchmark ficou mais lento que o limite
+(mediana) ou passou a executar mais comandos SQL por chamada.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+DEFAULT_TIERS = (100, 1_000, 10_000)
+DEFAULT_OUTPUT = os.path.join("benchmarks", "baseline.json")
+
+
+# --- Execução ------------------------------------------------------------------
+
+class Stopwatch:
+    """Soma o tempo e os comandos SQL apenas dos trechos medidos (with watch: ...)."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.statements = 0
+        self.running = False
+        self._started = 0.0
+
+    def count_statement(self, *_args):
+        if self.running:
+            self.statements += 1
+
+    def __enter__(self):
+        self.running = True
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds += time.perf_counter() - self._started
+        self.running = False
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # run(ctx, tier, watch, number): executa `number` chamadas, medindo só dentro de `watch`
+    run: Callable
+    number: int
+    tiered: bool = True
+    # Chamadas extras por tier consumidas pelo benchmark (tarefas pendentes reservadas)
+    consumes_tasks: bool = False
+
+
+@dataclass
+class Tier:
+    size: int
+    user_id: int
+    token: str
+    reserved: list
+
+
+def bench_process_task_completion(ctx, tier, watch, number):
+    from app.models import Task, User  # pylint: disable=import-outside-toplevel
+    from app.services.score_service import process_task_completion  # pylint: disable=import-outside-toplevel
+
+    with ctx.session_factory() as db:
+        for _ in range(number):
+            user = db.get(User, tier.user_id)
+            task = db.get(Task, tier.reserved.pop())
+            with watch:
+                process_task_completion(user, task, db)
+
+
+def bench_check_and_award_badges(ctx, tier, watch, number):
+    from app.models import User  # pylint: disable=import-outside-toplevel
+    from app.services.badge_service import check_and_award_badges  # pylint: disable=import-outside-toplevel
+
+    with ctx.session_factory() as db:
+        user = db.get(User, tier.user_id)
+        for _ in range(number):
+            # Como numa requisição nova: as conquistas do usuário são lidas de novo
+            db.expire(user, ["badges"])
+            with watch:
+                check_and_award_badges(user, db)
+        db.rollback()
+
+
+def _http_get(path, fast_json=False):
+    def run(ctx, tier, watch, number):
+        from app.database import settings  # pylint: disable=import-outside-toplevel
+
+        headers = {"Authorization": f"Bearer {tier.token}"}
+        previous, settings.FAST_JSON_ENABLED = settings.FAST_JSON_ENABLED, fast_json
+        try:
+            for _ in range(number):
+                with watch:
+                    response = ctx.client.get(path, headers=headers)
+                assert response.status_code == 200, response.text
+        finally:
+            settings.FAST_JSON_ENABLED = previous
+    return run
+
+
+def _export(encoder_name):
+    def run(ctx, tier, watch, number):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy.orm import Session
+
+        from app.utils.export import EXPORT_ENCODERS, export_tasks_generator, tasks_export_query
+
+        encoder = EXPORT_ENCODERS[encoder_name]
+        for _ in range(number):
+            with watch, Session(ctx.engine) as db:
+                for _chunk in export_tasks_generator(db.execute(tasks_export_query(tier.user_id)),
+                                                     encoder=encoder):
+                    pass
+    return run
+
+
+def bench_decode_jwt(ctx, _tier, watch, number):
+    from app.auth.auth_handler import decode_jwt  # pylint: disable=import-outside-toplevel
+
+    with watch:
+        for _ in range(number):
+            decode_jwt(ctx.token)
+
+
+def bench_verify_token_cached(ctx, _tier, watch, number):
+    from app.auth.auth_handler import verify_token  # pylint: disable=import-outside-toplevel
+
+    verify_token(ctx.token)
+    with watch:
+        for _ in range(number):
+            verify_token(ctx.token)
+
+
+BENCHMARKS = (
+    Benchmark("services.process_task_completion", bench_process_task_completion, 20, consumes_tasks=True),
+    Benchmark("services.check_and_award_badges", bench_check_and_award_badges, 200),
+    Benchmark("routers.list_tasks", _http_get("/tasks/?limit=50"), 50),
+    Benchmark("routers.get_user_dashboard", _http_get("/users/dashboard"), 5),
+    Benchmark("routers.list_tasks.fast_json", _http_get("/tasks/?limit=100", fast_json=True), 50),
+    Benchmark("routers.list_tasks.default_json", _http_get("/tasks/?limit=100"), 50),
+    Benchmark("routers.get_user_dashboard.fast_json", _http_get("/users/dashboard", fast_json=True), 5),
+    Benchmark("routers.list_tasks.sparse_fields",
+              _http_get("/tasks/?limit=100&fields=title,subject,due_date,is_completed"), 50),
+    Benchmark("export.csv", _export("csv"), 3),
+    Benchmark("export.ndjson", _export("ndjson"), 3),
+    Benchmark("auth.decode_jwt", bench_decode_jwt, 2_000, tiered=False),
+    Benchmark("auth.verify_token_cached", bench_verify_token_cached, 20_000, tiered=False),
+)
+
+
+class Context:
+    """Banco, aplicação e usuários de cada tier (criados uma vez por execução)."""
+
+    def __init__(self, tiers, rounds, benchmarks):
+        # pylint: disable=import-outside-toplevel
+        from fastapi.testclient import TestClient
+
+        from app.auth.auth_handler import create_access_token
+        from app.database import SessionLocal, get_engine
+        from app.main import app
+        from app.services.badge_service import initialize_badges
+
+        self.engine = get_engine()
+        self.session_factory = SessionLocal
+        self.client = TestClient(app)
+        self.token = create_access_token({"sub": "1"})
+
+        # Cada rodada (inclusive o aquecimento) consome `number` tarefas pendentes
+        reserve = sum(b.number * (rounds + 1) for b in benchmarks if b.consumes_tasks)
+        with SessionLocal() as db:
+            initialize_badges(db)
+            self.tiers = [self._seed(db, size, reserve, create_access_token) for size in tiers]
+
+    @staticmethod
+    def _seed(db, size, reserve, create_access_token):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import insert, select
+
+        from app.models import Task, User
+        from app.services.stats_service import get_user_stats
+
+        user = User(email=f"bench{size}@example.com", username=f"bench{size}",
+                    hashed_password="x", total_points=10 * size)
+        db.add(user)
+        db.flush()
+
+        now = datetime.now()
+        rows = [
+            {"title": f"Tarefa {i}", "description": "Benchmark", "subject": f"Disciplina {i % 8}",
+             "weight": i % 10 + 1, "due_date": now + timedelta(days=i % 30), "owner_id": user.id,
+             "is_completed": i % 2 == 0, "completed_at": now if i % 2 == 0 else None,
+             "points_awarded": 20 if i % 2 == 0 else 0}
+            for i in range(size)
+        ]
+        rows += [
+            {"title": f"Reserva {i}", "subject": "Geral", "weight": 3, "owner_id": user.id,
+             "due_date": now + timedelta(days=1), "is_completed": False, "points_awarded": 0}
+            for i in range(reserve)
+        ]
+        db.execute(insert(Task), rows)
+        reserved = list(db.scalars(
+            select(Task.id).where(Task.owner_id == user.id, Task.title.startswith("Reserva "))
+        ))
+        get_user_stats(user.id, db)
+        db.commit()
+        return Tier(size, user.id, create_access_token({"sub": str(user.id)}), reserved)
+
+    def close(self):
+        self.client.close()
+
+
+def measure(ctx, benchmark, tier, rounds):
+    from sqlalchemy import event  # pylint: disable=import-outside-toplevel
+
+    per_call, statements = [], 0
+    for round_number in range(rounds + 1):
+        watch = Stopwatch()
+        event.listen(ctx.engine, "before_cursor_execute", watch.count_statement)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                # O dashboard imprime a média a cada chamada; fica fora do relatório
+                benchmark.run(ctx, tier, watch, benchmark.number)
+        finally:
+            event.remove(ctx.engine, "before_cursor_execute", watch.count_statement)
+        if round_number == 0:
+            continue  # aquecimento: caches, catálogo de badges, compilação de SQL
+        per_call.append(watch.seconds / benchmark.number)
+        statements = watch.statements / benchmark.number
+
+    return {
+        "median_us": statistics.median(per_call) * 1e6,
+        "min_us": min(per_call) * 1e6,
+        "statements_per_call": statements,
+        "number": benchmark.number,
+        "rounds_us": [round(value * 1e6, 3) for value in per_call],
+    }
+
+
+def result_key(name: str, size: Optional[int]) -> str:
+    return name if size is None else f"{name}[{size}]"
+
+
+def run_suite(args):
+    selected = [b for b in BENCHMARKS if not args.only or any(part in b.name for part in args.only)]
+    ctx = Context(args.tiers, args.rounds, selected)
+    results = {}
+    try:
+        for benchmark in selected:
+            targets = ctx.tiers if benchmark.tiered else [None]
+            for tier in targets:
+                key = result_key(benchmark.name, tier.size if tier else None)
+                results[key] = measure(ctx, benchmark, tier, args.rounds)
+                data = results[key]
+                print(f"  {key:<46} {data['median_us']:>12.1f} µs  "
+                      f"(mín {data['min_us']:>10.1f})  {data['statements_per_call']:>6.1f} SQL/chamada")
+    finally:
+        ctx.close()
+    return results
+
+
+def metadata(args):
+    # pylint: disable=import-outside-toplevel
+    import sqlalchemy
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "sqlite": __import__("sqlite3").sqlite_version,
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        "tiers": list(args.tiers),
+        "rounds": args.rounds,
+    }
+
+
+def command_run(args):
+    print(f"Tiers: {', '.join(map(str, args.tiers))} tarefas  |  {args.rounds} rodadas + aquecimento\n")
+    report = {"meta": metadata(args), "results": run_suite(args)}
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2, ensure_ascii=False)
+    print(f"\nResultado salvo em {args.output}")
+    return 0
+
+
+# --- Comparação ----------------------------------------------------------------
+
+def compare(baseline: dict, current: dict, threshold: float):
+    """Linhas (chave, base, atual, razão, situação) e a lista de regressões."""
+    rows, regressions = [], []
+    base_results, current_results = baseline["results"], current["results"]
+    # Ordem da suíte (a do baseline), com os benchmarks novos no fim
+    keys = list(base_results) + [key for key in current_results if key not in base_results]
+    for key in keys:
+        base, now = base_results.get(key), current_results.get(key)
+        if base is None or now is None:
+            rows.append((key, base, now, None, "novo" if base is None else "ausente"))
+            continue
+
+        ratio = now["median_us"] / base["median_us"] if base["median_us"] else float("inf")
+        more_sql = now["statements_per_call"] > base["statements_per_call"]
+        if more_sql:
+            verdict = "REGRESSÃO (SQL)"
+        elif ratio > 1 + threshold:
+            verdict = "REGRESSÃO"
+        elif ratio < 1 - threshold:
+            verdict = "melhora"
+        else:
+            verdict = "ok"
+        if verdict.startswith("REGRESSÃO"):
+            regressions.append(key)
+        rows.append((key, base, now, ratio, verdict))
+    return rows, regressions
+
+
+def command_compare(args):
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+
+    if baseline["meta"].get("machine") != current["meta"].get("machine"):
+        print(f"Aviso: máquinas diferentes ({baseline['meta'].get('machine')} x "
+              f"{current['meta'].get('machine')}); compare tempos com cautela.\n")
+
+    rows, regressions = compare(baseline, current, args.threshold)
+    print(f"  {'benchmark':<46} {'base µs':>12} {'atual µs':>12} {'razão':>7}  SQL  situação")
+    for key, base, now, ratio, verdict in rows:
+        if ratio is None:
+            print(f"  {key:<46} {'-':>12} {'-':>12} {'-':>7}       {verdict}")
+            continue
+        sql = f"{base['statements_per_call']:g}→{now['statements_per_call']:g}"
+        print(f"  {key:<46} {base['median_us']:>12.1f} {now['median_us']:>12.1f} "
+              f"{ratio:>6.2f}x  {sql:<4} {verdict}")
+
+    print(f"\nLimite: +{args.threshold:.0%} na mediana. "
+          f"{len(regressions)} regressão(ões) em {len(rows)} benchmarks.")
+    return 1 if regressions else 0
+
+
+def parse_tiers(value: str):
+    return tuple(int(size) for size in value.split(",") if size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="executa a suíte e grava o JSON")
+    run.add_argument("--output", default=DEFAULT_OUTPUT)
+    run.add_argument("--tiers", type=parse_tiers, default=DEFAULT_TIERS,
+                     help="tarefas por usuário, separadas por vírgula (padrão: 100,1000,10000)")
+    run.add_argument("--rounds", type=int, default=5)
+    run.add_argument("--only", nargs="*", help="só os benchmarks cujo nome contém um destes trechos")
+
+    cmp = commands.add_parser("compare", help="compara dois JSONs e aponta regressões")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10,
+                     help="piora relativa tolerada na mediana (padrão: 0.10 = 10%%)")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return command_compare(args)
+
+    # Banco descartável e aplicação importados só para o run (o compare não precisa deles)
+    sys.path.append(os.path.join(os.getcwd(), 'api'))
+    db_dir = tempfile.mkdtemp(prefix="benchmark_suite_")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(db_dir, 'bench.db')}")
+    return command_run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
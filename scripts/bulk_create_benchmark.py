@@ -0,0 +1,107 @@
+"""
+Benchmark das rotas em lote:
+  - criação: N x POST /tasks/ contra um POST /tasks/bulk;
+  - conclusão: N x PATCH /tasks/{id}/complete contra um PATCH /tasks/complete.
+
+Cada chamada individual faz sua própria transação (pontos, streak, contadores,
+badges e commit); as rotas em lote fazem tudo numa transação só.
+
+Uso (a partir da raiz do repositório):
+    python scripts/bulk_create_benchmark.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.getcwd(), 'api'))
+
+_db_dir = tempfile.mkdtemp(prefix="bulk_bench_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}")
+
+# pylint: disable=wrong-import-position
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.auth.auth_handler import create_access_token
+from app.database import SessionLocal, engine
+from app.main import app
+from app.models import User
+
+SIZES = (50, 200)
+
+
+def payload(prefix, count):
+    return [
+        {"title": f"{prefix} tarefa {i}", "subject": "Cálculo I", "weight": i % 10 + 1}
+        for i in range(count)
+    ]
+
+
+def measure(action):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return elapsed * 1000, len(statements)
+
+
+def run(client, headers):
+    for count in SIZES:
+        print(f"[{count} tarefas]")
+
+        single_ids, bulk_ids = [], []
+
+        def one_by_one():
+            for item in payload("single", count):
+                response = client.post("/tasks/", json=item, headers=headers)
+                assert response.status_code == 201
+                single_ids.append(response.json()["id"])
+
+        def bulk():
+            response = client.post("/tasks/bulk", json={"tasks": payload("bulk", count)},
+                                   headers=headers)
+            assert response.status_code == 201
+            bulk_ids.extend(task["id"] for task in response.json()["created"])
+
+        single_ms, single_sql = measure(one_by_one)
+        bulk_ms, bulk_sql = measure(bulk)
+        report(f"{count}x POST /tasks/", single_ms, single_sql)
+        report("1x POST /tasks/bulk", bulk_ms, bulk_sql, single_ms)
+
+        def complete_one_by_one():
+            for task_id in single_ids:
+                assert client.patch(f"/tasks/{task_id}/complete", headers=headers).status_code == 200
+
+        def complete_batch():
+            response = client.patch("/tasks/complete", json={"task_ids": bulk_ids}, headers=headers)
+            assert response.status_code == 200
+
+        single_ms, single_sql = measure(complete_one_by_one)
+        batch_ms, batch_sql = measure(complete_batch)
+        report(f"{count}x PATCH /tasks/{{id}}/complete", single_ms, single_sql)
+        report("1x PATCH /tasks/complete", batch_ms, batch_sql, single_ms)
+
+
+def report(label, elapsed_ms, statements, baseline_ms=None):
+    speedup = f"  ({baseline_ms / elapsed_ms:.1f}x)" if baseline_ms else ""
+    print(f"  {label:<32} {elapsed_ms:>9.1f} ms  {statements:>5} comandos SQL{speedup}")
+
+
+if __name__ == "__main__":
+    with TestClient(app) as bench_client:
+        db = SessionLocal()
+        try:
+            user = User(email="bulk@example.com", username="bulkbench", hashed_password="x")
+            db.add(user)
+            db.commit()
+            token = create_access_token({"sub": str(user.id)})
+        finally:
+            db.close()
+
+        run(bench_client, {"Authorization": f"Bearer {token}"})
@@ -0,0 +1,171 @@
+"""
+Perfil do cold start: tempo de importação de app.main e tempo até a primeira resposta.
+
+Para cada modo (COLD_START_MODE desligado e ligado), aplica as migrações num
+SQLite novo (como no deploy) e roda um processo Python novo
+com `-X importtime`, importa app.main, envia GET /health e depois GET /tasks/
+(a primeira rota que abre uma conexão) direto pela interface ASGI, sem servidor
+HTTP. Mostra os tempos, os pacotes que mais pesam na importação e os módulos
+do app mais lentos.
+
+Uso (a partir da raiz do repositório):
+    python scripts/import_profile.py [--runs 5] [--top 12] [--json perfil.json]
+
+O --json grava o resultado para acompanhar a evolução entre versões.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+MODES = (("padrão", "false"), ("cold start", "true"))
+IMPORT_MARKER = "--- app.main importado ---"
+
+
+async def asgi_get(app, path, headers=()):
+    """Uma requisição GET pela interface ASGI; retorna o status."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("profile", 80),
+        "client": ("127.0.0.1", 0),
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return next(m["status"] for m in sent if m["type"] == "http.response.start")
+
+
+def child():
+    """Executado no subprocesso, com COLD_START_MODE e DATABASE_URL já no ambiente."""
+    started = time.perf_counter()
+    sys.path.append(os.path.join(os.getcwd(), 'api'))
+
+    # pylint: disable=import-outside-toplevel
+    from app.main import app
+    imported = time.perf_counter()
+    # O resumo por pacote só considera o que foi importado até aqui
+    print(IMPORT_MARKER, file=sys.stderr, flush=True)
+
+    import app.database as database
+    engine_at_import = database._engine is not None  # pylint: disable=protected-access
+
+    status = asyncio.run(asgi_get(app, "/health"))
+    first_response = time.perf_counter()
+
+    from app.auth.auth_handler import create_access_token
+    token = create_access_token({"sub": "1"})
+    db_started = time.perf_counter()
+    # Sem usuário 1 a rota responde 401, mas só depois de consultar o banco
+    db_status = asyncio.run(asgi_get(app, "/tasks/", [("authorization", f"Bearer {token}")]))
+    first_db_response = time.perf_counter()
+
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "first_response_ms": (first_response - started) * 1000,
+        "first_db_request_ms": (first_db_response - db_started) * 1000,
+        "engine_at_import": engine_at_import,
+        "statuses": [status, db_status],
+    }))
+
+
+def parse_importtime(stderr):
+    """Linhas de `-X importtime`: (módulo, self µs, cumulativo µs)."""
+    rows = []
+    for line in stderr.partition(IMPORT_MARKER)[0].splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_mode(cold_start):
+    db_dir = tempfile.mkdtemp(prefix="import_profile_")
+    env = dict(os.environ, COLD_START_MODE=cold_start,
+               DATABASE_URL=f"sqlite:///{os.path.join(db_dir, 'profile.db')}")
+    # Como no deploy: o esquema vem das migrações, fora do processo medido
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"],
+                   cwd="api", env=env, capture_output=True, check=True)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", __file__, "--child"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    return result, parse_importtime(process.stderr)
+
+
+def summarize(rows, top):
+    by_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    app_modules = sorted(
+        ((name, cumulative) for name, _, cumulative in rows if name.startswith("app.")),
+        key=lambda item: item[1], reverse=True,
+    )[:top]
+    return {
+        "packages_ms": {name: us / 1000 for name, us in packages},
+        "app_modules_ms": {name: us / 1000 for name, us in app_modules},
+    }
+
+
+def main(args):
+    report = {}
+    for label, cold_start in MODES:
+        runs = [run_mode(cold_start) for _ in range(args.runs)]
+        results = [result for result, _ in runs]
+        report[label] = {
+            "COLD_START_MODE": cold_start,
+            "import_ms": statistics.median(r["import_ms"] for r in results),
+            "first_response_ms": statistics.median(r["first_response_ms"] for r in results),
+            "first_db_request_ms": statistics.median(r["first_db_request_ms"] for r in results),
+            "engine_at_import": results[0]["engine_at_import"],
+            **summarize(runs[-1][1], args.top),
+        }
+
+    print(f"Mediana de {args.runs} processos por modo (tempos com o custo de -X importtime)\n")
+    print(f"  {'modo':<11} {'import':>9} {'1ª resposta':>12} {'1ª com banco':>13}  engine na importação")
+    for label, data in report.items():
+        print(f"  {label:<11} {data['import_ms']:>7.0f}ms {data['first_response_ms']:>10.0f}ms "
+              f"{data['first_db_request_ms']:>11.0f}ms  {'sim' if data['engine_at_import'] else 'não'}")
+
+    for label, data in report.items():
+        print(f"\n[{label}] pacotes que mais pesam (tempo próprio somado):")
+        for name, ms in data["packages_ms"].items():
+            print(f"  {name:<28} {ms:>8.1f} ms")
+        print(f"[{label}] módulos do app (cumulativo):")
+        for name, ms in data["app_modules_ms"].items():
+            print(f"  {name:<28} {ms:>8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+        print(f"\nResultado salvo em {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--json", help="grava o relatório neste arquivo")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    cli_args = parser.parse_args()
+
+    if cli_args.child:
+        child()
+    else:
+        main(cli_args)
@@ -0,0 +1,351 @@
+"""
+Gerador de carga com asyncio que simula estudantes usando a API de verdade.
+
+Cada estudante virtual tem a própria conta e repete, até o fim do estágio, ações
+sorteadas por peso (--mix): cadastro, login, criar tarefa, listar, concluir uma
+das tarefas que criou e abrir o dashboard. Os estágios (--stages) sobem a
+concorrência aos poucos; para cada um o relatório mostra vazão, p50/p95/p99 e
+taxa de erro por rota.
+
+Alvos:
+  --target asgi     (padrão) a aplicação roda neste processo, via httpx.ASGITransport.
+                    Cliente e servidor dividem o event loop: bom para comparar versões.
+  --target uvicorn  sobe `uvicorn app.main:app` local num subprocesso e usa HTTP de verdade.
+
+O banco padrão é um SQLite temporário (migrado com `alembic upgrade head` e
+populado com as contas); DATABASE_URL aponta para outro banco.
+
+Uso (a partir da raiz do repositório):
+    python scripts/load_test.py
+    python scripts/load_test.py --target uvicorn --stages 10:15,50:15,100:15
+    python scripts/load_test.py --mix login=1,create=2,list=6,complete=2,dashboard=3 --json carga.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Ação -> rota no relatório
+ROUTES = {
+    "register": "POST /auth/register",
+    "login": "POST /auth/login",
+    "create": "POST /tasks/",
+    "list": "GET /tasks/",
+    "complete": "PATCH /tasks/{id}/complete",
+    "dashboard": "GET /users/dashboard",
+}
+DEFAULT_MIX = "register=1,login=2,create=4,list=8,complete=3,dashboard=2"
+# concorrência:segundos de cada estágio
+DEFAULT_STAGES = "5:10,20:10,50:10"
+PASSWORD = "senha_da_carga"
+SUBJECTS = ("Cálculo I", "Física", "Química", "Algoritmos", "Inglês")
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+@dataclass
+class Account:
+    email: str
+    token: Optional[str] = None
+    pending: List[int] = field(default_factory=list)
+
+
+@dataclass
+class RouteStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+
+    def record(self, elapsed_ms: float, status):
+        self.latencies_ms.append(elapsed_ms)
+        self.statuses[status] += 1
+
+    @property
+    def errors(self) -> int:
+        return sum(count for status, count in self.statuses.items()
+                   if not isinstance(status, int) or status >= 400)
+
+
+# --- Estudante virtual -----------------------------------------------------------
+
+_registrations = itertools.count()
+
+
+def build_request(action: str, account: Account, rng: random.Random):
+    """(método, caminho, kwargs) da ação; None quando ela não se aplica agora."""
+    auth = {"headers": {"Authorization": f"Bearer {account.token}"}}
+    if action == "register":
+        number = next(_registrations)
+        return "POST", "/auth/register", {"json": {
+            "email": f"novo{number}@carga.dev", "username": f"novo{number}", "password": PASSWORD,
+        }}
+    if action == "login":
+        return "POST", "/auth/login", {"json": {"email": account.email, "password": PASSWORD}}
+    if action == "create":
+        return "POST", "/tasks/", {**auth, "json": {
+            "title": f"Lista {rng.randint(1, 99)}", "subject": rng.choice(SUBJECTS),
+            "weight": rng.randint(1, 10),
+        }}
+    if action == "list":
+        params = {"limit": 20}
+        if rng.random() < 0.3:
+            params["subject"] = rng.choice(SUBJECTS)
+        return "GET", "/tasks/", {**auth, "params": params}
+    if action == "complete":
+        if not account.pending:
+            return None
+        return "PATCH", f"/tasks/{account.pending.pop()}/complete", auth
+    return "GET", "/users/dashboard", auth
+
+
+def after_response(action: str, account: Account, response):
+    if response.status_code >= 400:
+        return
+    if action == "login":
+        account.token = response.json()["access_token"]
+    elif action == "create":
+        account.pending.append(response.json()["id"])
+
+
+async def virtual_student(client, account, mix, stats, deadline, think_ms, rng):
+    actions, weights = zip(*mix.items())
+    while time.perf_counter() < deadline:
+        action = rng.choices(actions, weights)[0]
+        if account.token is None:
+            action = "login"
+        request = build_request(action, account, rng)
+        if request is None:  # nada pendente para concluir: cria uma tarefa
+            action = "create"
+            request = build_request(action, account, rng)
+
+        method, path, kwargs = request
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except Exception as exc:  # pylint: disable=broad-except
+            stats[ROUTES[action]].record((time.perf_counter() - started) * 1000, type(exc).__name__)
+        else:
+            stats[ROUTES[action]].record((time.perf_counter() - started) * 1000, response.status_code)
+            after_response(action, account, response)
+
+        if think_ms:
+            await asyncio.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+
+
+async def run_stages(client, accounts, mix, stages, think_ms, seed):
+    results = []
+    for number, (concurrency, seconds) in enumerate(stages, 1):
+        stats: Dict[str, RouteStats] = {route: RouteStats() for route in ROUTES.values()}
+        started = time.perf_counter()
+        deadline = started + seconds
+        # No alvo asgi a aplicação roda aqui: o print do dashboard fica fora do relatório
+        with contextlib.redirect_stdout(io.StringIO()):
+            await asyncio.gather(*(
+                virtual_student(client, accounts[i], mix, stats, deadline, think_ms,
+                                random.Random(seed * 1_000_003 + number * 1_009 + i))
+                for i in range(concurrency)
+            ))
+        elapsed = time.perf_counter() - started  # inclui as requisições em voo no fim
+        results.append(summarize(number, concurrency, elapsed, stats))
+        print_stage(results[-1])
+    return results
+
+
+# --- Relatório -------------------------------------------------------------------
+
+def summarize(number, concurrency, elapsed, stats):
+    routes = {}
+    for route, route_stats in stats.items():
+        count = len(route_stats.latencies_ms)
+        if not count:
+            continue
+        routes[route] = {
+            "requests": count,
+            "rps": count / elapsed,
+            "p50_ms": percentile(route_stats.latencies_ms, 50),
+            "p95_ms": percentile(route_stats.latencies_ms, 95),
+            "p99_ms": percentile(route_stats.latencies_ms, 99),
+            "error_rate": route_stats.errors / count,
+            "statuses": {str(status): n for status, n in route_stats.statuses.items()},
+        }
+    total = sum(route["requests"] for route in routes.values())
+    errors = sum(stats[route].errors for route in routes)
+    return {
+        "stage": number,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests": total,
+        "rps": total / elapsed,
+        "error_rate": errors / total if total else 0.0,
+        "routes": routes,
+    }
+
+
+def print_stage(result):
+    print(f"\nEstágio {result['stage']}: {result['concurrency']} estudantes, "
+          f"{result['seconds']:.1f}s -> {result['rps']:.1f} req/s, "
+          f"{result['error_rate']:.1%} de erros")
+    print(f"  {'rota':<28} {'req':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'erros':>7}  status")
+    for route, data in result["routes"].items():
+        statuses = " ".join(f"{status}x{n}" for status, n in sorted(data["statuses"].items()))
+        print(f"  {route:<28} {data['requests']:>6} {data['rps']:>8.1f} {data['p50_ms']:>8.1f} "
+              f"{data['p95_ms']:>8.1f} {data['p99_ms']:>8.1f} {data['error_rate']:>6.1%}  {statuses}")
+
+
+# --- Preparação do banco e dos alvos ------------------------------------------------
+
+def prepare_database(env, accounts, tasks_per_account):
+    """Migra o banco e cria as contas (um único bcrypt, reaproveitado) com tarefas."""
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"],
+                   cwd="api", env=env, capture_output=True, check=True)
+
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import insert, select
+
+    from app.auth.auth_handler import get_password_hash
+    from app.database import SessionLocal
+    from app.models import Task, User
+
+    hashed = get_password_hash(PASSWORD)
+    with SessionLocal() as db:
+        db.execute(insert(User), [
+            {"email": f"estudante{i}@carga.dev", "username": f"estudante{i}",
+             "hashed_password": hashed, "total_points": 0, "current_streak": 0}
+            for i in range(accounts)
+        ])
+        ids = db.scalars(select(User.id).where(User.email.like("estudante%@carga.dev"))
+                         .order_by(User.id)).all()
+        rows = [
+            {"title": f"Tarefa {n}", "subject": SUBJECTS[n % len(SUBJECTS)], "weight": n % 10 + 1,
+             "owner_id": user_id, "is_completed": n % 3 == 0, "points_awarded": 20 if n % 3 == 0 else 0}
+            for user_id in ids for n in range(tasks_per_account)
+        ]
+        if rows:
+            db.execute(insert(Task), rows)
+        db.commit()
+    return [Account(email=f"estudante{i}@carga.dev") for i in range(accounts)]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_healthy(client, process, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn terminou com código {process.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:  # pylint: disable=broad-except
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn não respondeu a GET /health a tempo")
+
+
+async def run_target(args, env, accounts, mix, stages):
+    import httpx  # pylint: disable=import-outside-toplevel
+
+    max_concurrency = max(concurrency for concurrency, _ in stages)
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+
+    if args.target == "asgi":
+        from app.main import app  # pylint: disable=import-outside-toplevel
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://carga",
+                                     timeout=args.timeout, limits=limits) as client:
+            return await run_stages(client, accounts, mix, stages, args.think_ms, args.seed)
+
+    port = free_port()
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd="api", env=env, stdout=subprocess.DEVNULL,
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}",
+                                     timeout=args.timeout, limits=limits) as client:
+            await wait_until_healthy(client, process)
+            return await run_stages(client, accounts, mix, stages, args.think_ms, args.seed)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        action, _, weight = part.partition("=")
+        if action.strip() not in ROUTES:
+            raise argparse.ArgumentTypeError(f"ação desconhecida: {action!r} (use {', '.join(ROUTES)})")
+        mix[action.strip()] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("o mix precisa de pelo menos um peso positivo")
+    return mix
+
+
+def parse_stages(value: str):
+    try:
+        stages = [tuple(map(float, part.split(":"))) for part in value.split(",")]
+        return [(int(concurrency), seconds) for concurrency, seconds in stages]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("use concorrência:segundos, ex.: 5:10,20:10") from exc
+
+
+def main(args):
+    stages = args.stages
+    accounts_needed = max(concurrency for concurrency, _ in stages)
+
+    sys.path.append(os.path.join(os.getcwd(), 'api'))
+    db_dir = tempfile.mkdtemp(prefix="load_test_")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(db_dir, 'carga.db')}")
+    env = dict(os.environ)
+
+    print(f"Alvo: {args.target}  |  banco: {os.environ['DATABASE_URL']}")
+    print(f"Mix: {', '.join(f'{action}={weight:g}' for action, weight in args.mix.items())}  |  "
+          f"estágios: {', '.join(f'{c} x {s:g}s' for c, s in stages)}")
+    accounts = prepare_database(env, accounts_needed, args.tasks)
+
+    results = asyncio.run(run_target(args, env, accounts, args.mix, stages))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump({"target": args.target, "mix": args.mix, "stages": results},
+                      output, indent=2, ensure_ascii=False)
+        print(f"\nResultado salvo em {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"pesos por ação (padrão: {DEFAULT_MIX})")
+    parser.add_argument("--stages", type=parse_stages, default=parse_stages(DEFAULT_STAGES),
+                        help=f"concorrência:segundos por estágio (padrão: {DEFAULT_STAGES})")
+    parser.add_argument("--tasks", type=int, default=50, help="tarefas iniciais por conta")
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="pausa média entre ações de um estudante (0 = sem pausa)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="grava o relatório neste arquivo")
+    main(parser.parse_args())
@@ -0,0 +1,129 @@
+"""
+Benchmark de "tempestade de logins".
+
+Dispara logins concorrentes e, ao mesmo tempo, mede a latência de um endpoint
+barato (GET /tasks/) de outro usuário. Compara:
+  - Antes: login síncrono (bcrypt na thread da requisição, no threadpool padrão);
+  - Depois: login assíncrono com bcrypt no pool dedicado e limitado.
+
+Roda em processo (ASGI via httpx), com SQLite em diretório temporário.
+
+Uso (a partir da raiz do repositório):
+    python scripts/login_storm_benchmark.py [--concurrency 64] [--seconds 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.getcwd(), 'api'))
+
+_db_dir = tempfile.mkdtemp(prefix="login_storm_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}")
+
+# pylint: disable=wrong-import-position
+import httpx
+from fastapi import Depends, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.auth.auth_handler import create_access_token, get_password_hash, verify_password
+from app.database import SessionLocal, get_db
+from app.main import app
+from app.models import User
+from app.schemas import Token, UserLogin
+
+PASSWORD = "senha_do_benchmark"
+
+
+@app.post("/bench/legacy-login", response_model=Token, include_in_schema=False)
+def legacy_login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+    """Cópia do login antigo (def síncrono, bcrypt inline) para comparação."""
+    user = db.query(User).filter(User.email == user_credentials.email).first()
+    if not user or not verify_password(user_credentials.password, user.hashed_password):
+        raise HTTPException(status_code=401, detail="Credenciais inválidas")
+    return {"access_token": create_access_token({"sub": str(user.id)}), "token_type": "bearer"}
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_storm(login_path, concurrency, seconds):
+    transport = httpx.ASGITransport(app=app)
+    login_codes = []
+    probe_latencies = []
+    errors = []
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        async def login_worker():
+            payload = {"email": "storm@example.com", "password": PASSWORD}
+            while time.perf_counter() < deadline:
+                try:
+                    response = await client.post(login_path, json=payload)
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Ex.: TimeoutError do pool de conexões, esgotado por threads presas no bcrypt
+                    errors.append(type(exc).__name__)
+                    continue
+                login_codes.append(response.status_code)
+                if response.status_code == 503:
+                    await asyncio.sleep(0.05)  # cliente respeitando o Retry-After
+
+        async def probe_worker():
+            headers = {"Authorization": f"Bearer {PROBE_TOKEN}"}
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/tasks/", headers=headers)
+                probe_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)), probe_worker())
+
+    ok = login_codes.count(200)
+    return {
+        "logins/s": ok / seconds,
+        "rejeitados (503)": login_codes.count(503),
+        "erros": len(errors),
+        "sondas": len(probe_latencies),
+        "p50 ms": statistics.median(probe_latencies) if probe_latencies else float("nan"),
+        "p99 ms": percentile(probe_latencies, 99),
+    }
+
+
+def print_result(label, result):
+    print(f"  {label}")
+    for key, value in result.items():
+        print(f"    {key:<18} {value:>10.1f}" if isinstance(value, float) else f"    {key:<18} {value:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with TestClient(app):  # dispara a criação do esquema na startup
+        pass
+    db = SessionLocal()
+    try:
+        db.add(User(email="storm@example.com", username="storm",
+                    hashed_password=get_password_hash(PASSWORD)))
+        prober = User(email="probe@example.com", username="probe", hashed_password="x")
+        db.add(prober)
+        db.commit()
+        PROBE_TOKEN = create_access_token({"sub": str(prober.id)})
+    finally:
+        db.close()
+
+    print(f"Tempestade de logins: {args.concurrency} clientes por {args.seconds:.0f}s\n")
+    print_result("Antes  (bcrypt no threadpool padrão)",
+                 asyncio.run(run_storm("/bench/legacy-login", args.concurrency, args.seconds)))
+    print_result("Depois (pool dedicado de bcrypt)",
+                 asyncio.run(run_storm("/auth/login", args.concurrency, args.seconds)))
@@ -1,5 +1,8 @@
 import sys
 import os
+import socket
+import tempfile
+import threading
 import tracemalloc
 import time
 from functools import lru_cache
@@ -7,6 +10,10 @@ from functools import lru_cache
 # Configuração de Path
 sys.path.append(os.path.join(os.getcwd(), 'api'))
 
+# Banco descartável para o cenário 3 (o app lê DATABASE_URL na importação)
+_db_dir = tempfile.mkdtemp(prefix="memory_test_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'memory.db')}")
+
 # Importações Reais
 from app.models import Task
 from app.services.score_service import calculate_task_points
@@ -92,11 +99,106 @@ def test_generator_memory():
     for _ in gen: pass # Consome
     s2 = tracemalloc.take_snapshot()
     mem_gen = s2.compare_to(s1, 'lineno')[0].size_diff / 1024 / 1024
+    tracemalloc.stop()
 
     print(f"    Memória (Lista):     {mem_list:.2f} MiB")
     print(f"    Memória (Generator): {mem_gen:.4f} MiB")
     print(f"    >>> Economia de RAM: {(1 - (mem_gen/mem_list))*100:.1f}%")
 
+# ==============================================================================
+# CENÁRIO 3: Exportação CSV ponta a ponta (GET /tasks/export.csv)
+# Alvo: memória do servidor constante, independente do total de tarefas
+# Uso: python scripts/memory_test.py [maior_volume]   (padrão: 200000)
+# ==============================================================================
+
+EXPORT_SIZES = (100, int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
+
+
+def _seed_export_user(engine, n_tasks):
+    """Cria um usuário com n_tasks tarefas via insert em lote (sem objetos ORM)."""
+    from sqlalchemy import insert
+    from app.models import User
+
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User).values(email=f"export{n_tasks}@example.com", username=f"export{n_tasks}",
+                                hashed_password="x", total_points=0, current_streak=0)
+        ).inserted_primary_key[0]
+        for offset in range(0, n_tasks, 50_000):
+            conn.execute(insert(Task), [
+                {"title": f'Tarefa {i}, "com aspas"', "subject": "Geral", "weight": 1,
+                 "is_completed": i % 2 == 0, "points_awarded": 10, "owner_id": user_id}
+                for i in range(offset, min(offset + 50_000, n_tasks))
+            ])
+    return user_id
+
+
+def _start_server(app):
+    """Sobe o app num uvicorn real (thread) para que a resposta seja lida em streaming."""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def test_streaming_export_memory():
+    print("\n[3] Testando Exportação CSV ponta a ponta (StreamingResponse + yield_per)...")
+    import httpx
+    from sqlalchemy.orm import Session
+    from app.auth.auth_handler import create_access_token
+    from app.database import Base, engine
+    from app.main import app
+    from app.utils.export import export_tasks_generator
+
+    Base.metadata.create_all(bind=engine)
+    users = {n: _seed_export_user(engine, n) for n in EXPORT_SIZES}
+    server, base_url = _start_server(app)
+
+    # Cliente criado fora da medição (o contexto SSL do httpx é alocado na construção)
+    client = httpx.Client(base_url=base_url, timeout=None)
+    try:
+        # Aquecimento: a primeira requisição carrega módulos e caches que não são do export
+        warmup_token = create_access_token({"sub": str(users[EXPORT_SIZES[0]])})
+        client.get("/tasks/export.csv", headers={"Authorization": f"Bearer {warmup_token}"})
+
+        for n_tasks, user_id in users.items():
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+            # Abordagem Nova: endpoint em streaming, lido em blocos pelo cliente
+            tracemalloc.start()
+            received = 0
+            with client.stream("GET", "/tasks/export.csv", headers=headers) as r:
+                for chunk in r.iter_bytes():
+                    received += len(chunk)
+            _, peak_stream = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            # Abordagem Antiga: list[Task] materializada e relatório montado em memória
+            tracemalloc.start()
+            with Session(engine) as db:
+                tasks = db.query(Task).filter(Task.owner_id == user_id).all()
+                report = "".join(export_tasks_generator(tasks))
+            _, peak_list = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del tasks, report
+
+            print(f"    {n_tasks:>9,} tarefas | CSV {received / 1024 / 1024:7.2f} MiB | "
+                  f"pico streaming {peak_stream / 1024 / 1024:6.2f} MiB | "
+                  f"pico lista {peak_list / 1024 / 1024:8.2f} MiB")
+    finally:
+        client.close()
+        server.should_exit = True
+
+    print("    (O pico do streaming não cresce com o volume; o da lista cresce linearmente)")
+
 if __name__ == "__main__":
     test_cache_performance()
-    test_generator_memory()
\ No newline at end of file
+    test_generator_memory()
+    test_streaming_export_memory()
\ No newline at end of file
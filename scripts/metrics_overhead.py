@@ -0,0 +1,137 @@
+"""
+Custo do MetricsMiddleware e dos eventos SQL de app/utils/metrics.py.
+
+[1] Uma aplicação ASGI mínima chamada diretamente, com e sem o middleware:
+    a diferença é o custo fixo por requisição.
+[2] SELECT 1 num SQLite em memória, com e sem os eventos de cursor, dentro
+    de uma requisição: a diferença é o custo por comando SQL.
+[3] GET /tasks/ na aplicação real (TestClient), com o middleware ligado e desligado.
+
+Uso (a partir da raiz do repositório):
+    python scripts/metrics_overhead.py
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.getcwd(), 'api'))
+
+_db_dir = tempfile.mkdtemp(prefix="metrics_overhead_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}")
+
+# pylint: disable=wrong-import-position
+from sqlalchemy import create_engine, text
+
+from app.utils.metrics import MetricsMiddleware, MetricsRegistry
+
+REQUESTS = 50_000
+STATEMENTS = 50_000
+HTTP_REQUESTS = 2_000
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call_many(app, count):
+    scope = {"type": "http", "method": "GET", "path": "/"}
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(_message):
+        return None
+
+    started = time.perf_counter()
+    for _ in range(count):
+        await app(scope, receive, send)
+    return time.perf_counter() - started
+
+
+def bench_middleware():
+    print(f"[1] Custo fixo por requisição ({REQUESTS:,} chamadas ASGI)")
+    bare = asyncio.run(call_many(bare_app, REQUESTS))
+    wrapped = asyncio.run(call_many(MetricsMiddleware(bare_app, MetricsRegistry()), REQUESTS))
+    print(f"  sem middleware {bare / REQUESTS * 1e6:>8.2f} µs/req")
+    print(f"  com middleware {wrapped / REQUESTS * 1e6:>8.2f} µs/req"
+          f"  (+{(wrapped - bare) / REQUESTS * 1e6:.2f} µs)")
+
+
+def run_statements(engine, registry):
+    stats, token = registry.start_request()
+    try:
+        with engine.connect() as conn:
+            started = time.perf_counter()
+            for _ in range(STATEMENTS):
+                conn.execute(text("SELECT 1"))
+            return time.perf_counter() - started, stats
+    finally:
+        registry.end_request(token)
+
+
+def bench_sql_events():
+    print(f"\n[2] Custo por comando SQL ({STATEMENTS:,} x SELECT 1)")
+    registry = MetricsRegistry()
+    plain, _ = run_statements(create_engine("sqlite://"), registry)
+    engine = create_engine("sqlite://")
+    registry.attach(engine)
+    instrumented, stats = run_statements(engine, registry)
+    assert stats.statements == STATEMENTS
+    print(f"  sem eventos {plain / STATEMENTS * 1e6:>8.2f} µs/comando")
+    print(f"  com eventos {instrumented / STATEMENTS * 1e6:>8.2f} µs/comando"
+          f"  (+{(instrumented - plain) / STATEMENTS * 1e6:.2f} µs)")
+
+
+def bench_http(enabled):
+    # As configurações são lidas na importação: cada modo roda num processo novo
+    db_dir = tempfile.mkdtemp(prefix="metrics_http_")
+    output = subprocess.run(
+        [sys.executable, __file__, "--http-child"],
+        env=dict(os.environ, METRICS_ENABLED=str(enabled).lower(),
+                 DATABASE_URL=f"sqlite:///{os.path.join(db_dir, 'bench.db')}"),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def http_child():
+    # pylint: disable=import-outside-toplevel
+    from fastapi.testclient import TestClient
+
+    from app.auth.auth_handler import create_access_token
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import Task, User
+
+    with SessionLocal() as db:
+        user = User(email="metrics@example.com", username="metricsbench", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add_all([Task(title=f"Tarefa {i}", subject="Geral", owner_id=user.id) for i in range(20)])
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    with TestClient(app) as client:
+        for _ in range(100):
+            client.get("/tasks/", headers=headers)
+        started = time.perf_counter()
+        for _ in range(HTTP_REQUESTS):
+            client.get("/tasks/", headers=headers)
+        print((time.perf_counter() - started) / HTTP_REQUESTS * 1e6)
+
+
+if __name__ == "__main__":
+    if "--http-child" in sys.argv:
+        http_child()
+    else:
+        bench_middleware()
+        bench_sql_events()
+        print(f"\n[3] GET /tasks/ ponta a ponta ({HTTP_REQUESTS:,} requisições, TestClient)")
+        off = bench_http(False)
+        on = bench_http(True)
+        print(f"  METRICS_ENABLED=false {off:>9.1f} µs/req")
+        print(f"  METRICS_ENABLED=true  {on:>9.1f} µs/req  ({(on - off) / off * 100:+.1f}%)")
@@ -13,6 +13,7 @@ sys.path.append(os.path.join(os.getcwd(), 'api'))
 
 from app.database import SessionLocal, engine, Base
 from app.models import User, Task, Badge
+from app.utils.pagination import encode_task_cursor, task_keyset_order, task_keyset_segments
 
 # ==========================================
 # Configurações & Seed (Mantido igual)
@@ -102,6 +103,19 @@ def scenario_3_pagination_deep(db):
     # Simula: list_tasks(filters=TaskFilterParams(skip=5000, limit=10))
     return db.query(Task).offset(5000).limit(10).all()
 
+def scenario_3_pagination_keyset(db):
+    """Página 500 via cursor: WHERE (chave) > (última chave vista) LIMIT 10"""
+    # Simula: list_tasks(filters=TaskFilterParams(cursor=<X-Next-Cursor>, limit=10))
+    last_seen = db.query(Task).order_by(*task_keyset_order()).offset(4999).first()
+    cursor = encode_task_cursor(last_seen)
+    tasks = []
+    for condition in task_keyset_segments(cursor):
+        tasks += db.query(Task).filter(condition)\
+            .order_by(*task_keyset_order()).limit(10 - len(tasks)).all()
+        if len(tasks) == 10:
+            break
+    return tasks
+
 # ==========================================
 # GARGALO 4: Carregamento de Relações (users.py)
 # Lazy Load vs Eager Load
@@ -160,6 +174,7 @@ if __name__ == "__main__":
         # Paginação
         run_profile("Gargalo 3: Paginação Inicial (skip=0)", scenario_3_pagination_shallow, db)
         run_profile("Gargalo 3: Paginação Profunda (skip=5000)", scenario_3_pagination_deep, db)
+        run_profile("Gargalo 3: Paginação por Cursor (keyset)", scenario_3_pagination_keyset, db)
 
         # Lazy vs Eager
         run_profile("Gargalo 4: Lazy Loading (users.py atual)", scenario_4_lazy_loading, db)
@@ -0,0 +1,331 @@
+"""
+Curvas de latência x volume de dados para os endpoints principais.
+
+Popula o banco em tiers crescentes de tarefas (só acrescenta o que falta para o
+próximo tier) com distribuição assimétrica por usuário (Zipf: poucos usuários
+com históricos enormes, muitos com poucas tarefas). Em cada tier mede, pela
+aplicação completa (TestClient), três perfis de usuário:
+
+  - pesado:  o maior histórico (cresce junto com o total);
+  - mediano: o usuário do meio da distribuição;
+  - leve:    o menor histórico, que cresce bem mais devagar que o total.
+
+Se a latência do usuário leve cresce no ritmo do total, o custo depende do
+volume TOTAL (índice faltando, varredura); se só a do pesado cresce, depende do
+histórico do próprio usuário. O relatório sai em CSV e Markdown, com o expoente
+de crescimento de cada curva (0 = constante, 1 = linear no total de tarefas).
+
+Uso (a partir da raiz do repositório):
+    python scripts/scale_test.py                                   # 1k, 10k, 100k
+    python scripts/scale_test.py --tiers 1000,10000,100000,1000000,10000000 --output-dir scale
+    python scripts/scale_test.py --url sqlite:///./scale.db --users 5000 --skew 1.2
+
+Endpoints que passam de --max-seconds num tier deixam de ser medidos nos
+tiers seguintes (aparecem como "> limite" no relatório).
+"""
+import argparse
+import contextlib
+import csv
+import io
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DEFAULT_TIERS = "1000,10000,100000"
+BATCH_SIZE = 50_000
+# Tarefas mínimas de cada usuário, criadas no primeiro tier
+BASE_TASKS_PER_USER = 5
+SUBJECTS = ("Cálculo I", "Física", "Química", "Programação", "História", "Geral")
+PROFILES = ("pesado", "mediano", "leve")
+# Expoente a partir do qual a curva é sinalizada no relatório
+GROWTH_WARNING = 0.3
+
+# (nome, método, caminho); {task_id} é uma tarefa pendente reservada do usuário
+ENDPOINTS = (
+    ("list_tasks", "GET", "/tasks/?limit=50"),
+    ("get_user_dashboard", "GET", "/users/dashboard"),
+    ("complete_task", "PATCH", "/tasks/{task_id}/complete"),
+    ("list_subjects (tarefas)", "GET", "/tasks/subjects/list"),
+    ("list_subjects (disciplinas)", "GET", "/subjects/"),
+    ("export_tasks", "GET", "/tasks/export.csv"),
+)
+
+
+def zipf_weights(n_users: int, skew: float):
+    return [1 / (rank ** skew) for rank in range(1, n_users + 1)]
+
+
+class ScaleDataset:
+    """Usuários fixos e tarefas acrescentadas tier a tier, sempre com a mesma distribuição."""
+
+    def __init__(self, engine, n_users: int, skew: float, seed: int):
+        self.engine = engine
+        self.rng = random.Random(seed)
+        self.n_users = n_users
+        self.weights = list(zipf_weights(n_users, skew))
+        self.user_ids = []
+        self.total = 0
+
+    def create_users(self):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import insert, select
+
+        from app.models import Subject, User
+
+        with self.engine.begin() as conn:
+            conn.execute(insert(User), [
+                {"email": f"escala{i}@example.com", "username": f"escala{i}", "hashed_password": "x",
+                 "total_points": 0, "current_streak": 0}
+                for i in range(self.n_users)
+            ])
+            self.user_ids = list(conn.execute(
+                select(User.id).where(User.email.like("escala%@example.com")).order_by(User.id)
+            ).scalars())
+            conn.execute(insert(Subject), [
+                {"name": name, "owner_id": user_id} for user_id in self.user_ids for name in SUBJECTS
+            ])
+        # O primeiro usuário é o rank 1 do Zipf (pesado), o último o de menor peso (leve)
+        base = [user_id for user_id in self.user_ids for _ in range(BASE_TASKS_PER_USER)]
+        self._insert(base)
+
+    def grow_to(self, target: int):
+        missing = target - self.total
+        started = time.perf_counter()
+        while missing > 0:
+            batch = min(BATCH_SIZE, missing)
+            self._insert(self.rng.choices(self.user_ids, weights=self.weights, k=batch))
+            missing -= batch
+            print(f"  {self.total:,} tarefas...", end="\r")
+
+        with self.engine.begin() as conn:
+            # Os contadores desnormalizados não viram as inserções diretas: são
+            # reconstruídos na primeira requisição (aquecimento, fora da medição)
+            conn.exec_driver_sql("DELETE FROM user_stats")
+            conn.exec_driver_sql("ANALYZE")
+        print(f"  {self.total:,} tarefas ({time.perf_counter() - started:.1f}s de seed)")
+
+    def _insert(self, owners):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import insert
+
+        from app.models import Task
+
+        rng = self.rng
+        base_date = datetime(2025, 1, 1)
+        rows = []
+        for owner_id in owners:
+            completed = rng.random() < 0.7
+            rows.append({
+                "title": f"Tarefa {rng.randrange(10**6)}",
+                "subject": rng.choice(SUBJECTS),
+                "weight": rng.randint(1, 10),
+                "due_date": base_date + timedelta(hours=rng.randrange(24 * 365)),
+                "is_completed": completed,
+                "completed_at": base_date if completed else None,
+                "points_awarded": rng.randint(5, 100) if completed else 0,
+                "owner_id": owner_id,
+            })
+        with self.engine.begin() as conn:
+            conn.execute(insert(Task), rows)
+        self.total += len(rows)
+
+    def profiles(self):
+        """(perfil, user_id, tarefas do usuário) para pesado, mediano e leve."""
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import func, select
+
+        from app.models import Task
+
+        with self.engine.connect() as conn:
+            counts = dict(conn.execute(
+                select(Task.owner_id, func.count(Task.id)).group_by(Task.owner_id)
+            ).all())
+        ranked = sorted(self.user_ids, key=lambda user_id: counts.get(user_id, 0), reverse=True)
+        chosen = (ranked[0], ranked[len(ranked) // 2], ranked[-1])
+        return [(name, user_id, counts.get(user_id, 0)) for name, user_id in zip(PROFILES, chosen)]
+
+    def reserve_pending(self, user_id: int, count: int):
+        """Tarefas pendentes novas para o complete_task (cada chamada consome uma)."""
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import insert
+
+        from app.models import Task
+
+        with self.engine.begin() as conn:
+            result = conn.execute(insert(Task).returning(Task.id), [
+                {"title": "Reserva", "subject": "Geral", "weight": 3, "owner_id": user_id,
+                 "due_date": datetime.now() + timedelta(days=1), "is_completed": False,
+                 "points_awarded": 0}
+                for _ in range(count)
+            ])
+            ids = list(result.scalars())
+        self.total += count
+        return ids
+
+
+def time_endpoint(client, method, path, headers, pending, repeat):
+    """Aquecimento + `repeat` chamadas; tempos em ms."""
+    timings = []
+    for attempt in range(repeat + 1):
+        url = path.format(task_id=pending.pop()) if "{task_id}" in path else path
+        started = time.perf_counter()
+        response = client.request(method, url, headers=headers)
+        _ = response.content  # exportação em streaming: mede até o último byte
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {url} respondeu {response.status_code}: {response.text[:200]}")
+        if attempt:
+            timings.append(elapsed)
+    return timings
+
+
+def run(args):
+    # pylint: disable=import-outside-toplevel
+    from fastapi.testclient import TestClient
+
+    from app.auth.auth_handler import create_access_token
+    from app.auth.user_cache import clear_user_cache
+    from app.database import get_engine
+    from app.main import app
+
+    engine = get_engine()
+    dataset = ScaleDataset(engine, args.users, args.skew, args.seed)
+    dataset.create_users()
+
+    rows, too_slow = [], set()
+    with TestClient(app) as client, contextlib.redirect_stdout(io.StringIO()) as app_output:
+        for tier in args.tiers:
+            print(f"[tier {tier:,}]", file=sys.__stdout__)
+            with contextlib.redirect_stdout(sys.__stdout__):
+                dataset.grow_to(tier)
+            clear_user_cache()
+            for profile, user_id, user_tasks in dataset.profiles():
+                headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+                pending = dataset.reserve_pending(user_id, args.repeat + 1)
+                for name, method, path in ENDPOINTS:
+                    key = (name, profile)
+                    row = {"tier_tasks": tier, "profile": profile, "user_tasks": user_tasks,
+                           "endpoint": name}
+                    if key in too_slow:
+                        rows.append({**row, "p50_ms": None, "min_ms": None, "max_ms": None})
+                        continue
+                    timings = time_endpoint(client, method, path, headers, pending, args.repeat)
+                    p50 = statistics.median(timings)
+                    if p50 / 1000 > args.max_seconds:
+                        too_slow.add(key)
+                    rows.append({**row, "p50_ms": round(p50, 3), "min_ms": round(min(timings), 3),
+                                 "max_ms": round(max(timings), 3)})
+                    print(f"  {profile:<8} ({user_tasks:>9,} tarefas) {name:<28} {p50:>10.1f} ms",
+                          file=sys.__stdout__)
+            app_output.seek(0)
+            app_output.truncate()  # o dashboard imprime a média a cada chamada
+    return rows
+
+
+# --- Relatório ---------------------------------------------------------------------
+
+def growth_exponent(points):
+    """Inclinação log-log entre o primeiro e o último tier medidos (None se faltar ponto)."""
+    measured = [(tier, p50) for tier, p50 in points if p50]
+    if len(measured) < 2 or measured[0][0] == measured[-1][0]:
+        return None
+    (first_tier, first), (last_tier, last) = measured[0], measured[-1]
+    return math.log(last / first) / math.log(last_tier / first_tier)
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as output:
+        writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def markdown_report(rows, args) -> str:
+    tiers = list(args.tiers)
+    lines = [
+        "# Curvas de escala: latência (p50, ms) x total de tarefas",
+        "",
+        f"- Gerado em {datetime.now():%Y-%m-%d %H:%M} por `scripts/scale_test.py`",
+        f"- {args.users:,} usuários, distribuição Zipf (s = {args.skew:g}), "
+        f"{args.repeat} chamadas por ponto (mediana), limite de {args.max_seconds:g}s",
+        f"- Expoente: crescimento log-log do primeiro ao último tier medido; "
+        f"⚠️ acima de {GROWTH_WARNING:g}",
+        "",
+    ]
+    header = "| endpoint | perfil | " + " | ".join(f"{tier:,}" for tier in tiers) + " | expoente |"
+    lines += [header, "|" + " --- |" * (len(tiers) + 3)]
+
+    by_key = {}
+    for row in rows:
+        by_key.setdefault((row["endpoint"], row["profile"]), {})[row["tier_tasks"]] = row
+
+    for (endpoint, profile), by_tier in by_key.items():
+        cells = []
+        for tier in tiers:
+            row = by_tier.get(tier)
+            if row is None or row["p50_ms"] is None:
+                cells.append("> limite")
+            else:
+                cells.append(f"{row['p50_ms']:.1f} <sub>({row['user_tasks']:,})</sub>")
+        exponent = growth_exponent([(tier, by_tier[tier]["p50_ms"]) for tier in tiers if tier in by_tier])
+        if exponent is None:
+            growth = "-"
+        else:
+            growth = f"{exponent:.2f}" + (" ⚠️" if exponent > GROWTH_WARNING else "")
+        lines.append(f"| {endpoint} | {profile} | " + " | ".join(cells) + f" | {growth} |")
+
+    lines += ["", "Entre parênteses: tarefas do usuário medido naquele tier."]
+    return "\n".join(lines) + "\n"
+
+
+def parse_tiers(value: str):
+    return tuple(sorted(int(size) for size in value.split(",") if size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--tiers", type=parse_tiers, default=parse_tiers(DEFAULT_TIERS),
+                        help=f"total de tarefas de cada tier (padrão: {DEFAULT_TIERS})")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--skew", type=float, default=1.1, help="expoente do Zipf por usuário")
+    parser.add_argument("--repeat", type=int, default=5, help="chamadas medidas por ponto")
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="acima disso (p50) o endpoint deixa de ser medido nos próximos tiers")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", help="banco a usar (padrão: SQLite temporário novo)")
+    parser.add_argument("--output-dir", default=".", help="onde gravar scale_report.csv/.md")
+    args = parser.parse_args()
+
+    if args.tiers[0] < args.users * BASE_TASKS_PER_USER:
+        parser.error(f"o menor tier precisa de ao menos {args.users * BASE_TASKS_PER_USER:,} tarefas "
+                     f"({BASE_TASKS_PER_USER} por usuário); reduza --users")
+
+    sys.path.append(os.path.join(os.getcwd(), 'api'))
+    db_dir = tempfile.mkdtemp(prefix="scale_test_")
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(db_dir, 'scale.db')}"
+    # Esquema e índices como em produção: pelas migrações
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"],
+                   cwd="api", env=dict(os.environ), capture_output=True, check=True)
+
+    print(f"Banco: {os.environ['DATABASE_URL']}  |  tiers: {', '.join(f'{t:,}' for t in args.tiers)}")
+    rows = run(args)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    csv_path = os.path.join(args.output_dir, "scale_report.csv")
+    md_path = os.path.join(args.output_dir, "scale_report.md")
+    write_csv(rows, csv_path)
+    report = markdown_report(rows, args)
+    with open(md_path, "w", encoding="utf-8") as output:
+        output.write(report)
+    print("\n" + report)
+    print(f"Relatórios: {csv_path}, {md_path}")
+
+
+if __name__ == "__main__":
+    main()
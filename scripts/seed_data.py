@@ -0,0 +1,321 @@
+"""
+Seed rápido e determinístico para benchmarks, com snapshot e clone de SQLite.
+
+- seed:     cria o esquema (alembic upgrade head) e insere usuários, disciplinas e
+            tarefas com insert() do SQLAlchemy Core em lotes executemany, sem
+            objetos ORM. Os índices de tasks são removidos durante a carga e
+            recriados no fim (mais rápido que mantê-los linha a linha), e
+            user_stats e users.total_points saem dos contadores acumulados
+            durante a geração.
+            Mesmo --seed e mesmos parâmetros geram exatamente os mesmos dados.
+- snapshot: copia um SQLite populado para um arquivo-modelo (API de backup do
+            sqlite3: consistente mesmo com o banco aberto).
+- clone:    cria um banco novo a partir do modelo (cópia de arquivo, instantânea,
+            ou --method backup).
+
+Uso (a partir da raiz do repositório):
+    python scripts/seed_data.py seed --tasks 10000000 --users 20000 --snapshot snapshots/10m.db
+    python scripts/seed_data.py clone snapshots/10m.db /tmp/bench.db
+    python scripts/index_check.py --url sqlite:////tmp/bench.db --tasks 10000000
+
+    python scripts/seed_data.py snapshot ./seed.db snapshots/seed.db
+"""
+import argparse
+import itertools
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import closing
+from datetime import datetime, timedelta
+
+DEFAULT_URL = "sqlite:///./seed.db"
+BATCH_SIZE = 100_000
+SUBJECTS = ("Cálculo I", "Física", "Química", "Programação", "História", "Geral")
+# Colunas de tasks preenchidas pelo seed, na ordem das tuplas de cada lote
+TASK_COLUMNS = ("title", "description", "subject", "weight", "due_date", "is_completed",
+                "completed_at", "points_awarded", "created_at", "owner_id")
+BASE_DATE = datetime(2025, 1, 1)
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def sqlite_path(url: str) -> str:
+    if not url.startswith("sqlite:///") or ":memory:" in url:
+        raise SystemExit(f"snapshot/clone só funcionam com SQLite em arquivo: {url}")
+    return url[len("sqlite:///"):]
+
+
+# --- Geração -------------------------------------------------------------------
+
+class TaskGenerator:
+    """
+    Lotes de tuplas de tarefas a partir de um random.Random com semente fixa.
+    Cada coluna é sorteada para o lote inteiro de uma vez (random.choices com
+    k=tamanho do lote) e as tuplas saem de um zip: bem mais barato que sortear
+    campo a campo por linha.
+    """
+
+    def __init__(self, user_ids, seed: int, skew: float, completed_ratio: float):
+        self.rng = random.Random(seed)
+        self.user_ids = user_ids
+        # Zipf por usuário (skew=0: uniforme); cum_weights evita recalcular a soma a cada lote
+        weights = [1 / (rank ** skew) for rank in range(1, len(user_ids) + 1)]
+        self.cum_weights = list(itertools.accumulate(weights))
+        self.completed_weights = (completed_ratio, 1 - completed_ratio)
+        # Datas já no texto que o SQLAlchemy grava no SQLite, formatadas uma única vez
+        self.dates = [(BASE_DATE + timedelta(hours=hour)).strftime(DATE_FORMAT) for hour in range(24 * 365)]
+        self.sequence = itertools.count(1)
+        self.tasks_per_owner = Counter()
+        self.completed_per_owner = Counter()
+        self.points_per_owner = Counter()
+
+    def batch(self, size: int):
+        rng = self.rng
+        owners = rng.choices(self.user_ids, cum_weights=self.cum_weights, k=size)
+        subjects = rng.choices(SUBJECTS, k=size)
+        weights = rng.choices(range(1, 11), k=size)
+        due_dates = rng.choices(self.dates, k=size)
+        points = rng.choices(range(5, 101), k=size)
+        completed = rng.choices((True, False), weights=self.completed_weights, k=size)
+        numbers = itertools.islice(self.sequence, size)
+
+        rows = [
+            (f"Tarefa {number}", None, subject, weight, due, done,
+             due if done else None, point if done else 0, due, owner)
+            for number, subject, weight, due, done, point, owner
+            in zip(numbers, subjects, weights, due_dates, completed, points, owners)
+        ]
+        self._count(owners, completed, points)
+        return rows
+
+    def _count(self, owners, completed, points):
+        """Acumula os contadores de user_stats do lote (evita um GROUP BY sobre a tabela inteira)."""
+        done_owners = list(itertools.compress(owners, completed))
+        self.tasks_per_owner.update(owners)
+        self.completed_per_owner.update(done_owners)
+        points_per_owner = self.points_per_owner
+        for owner, point in zip(done_owners, itertools.compress(points, completed)):
+            points_per_owner[owner] += point
+
+    def stats(self):
+        """Linhas de user_stats: (user_id, concluídas, pendentes, pontos)."""
+        for owner, total in self.tasks_per_owner.items():
+            completed = self.completed_per_owner[owner]
+            yield owner, completed, total - completed, self.points_per_owner[owner]
+
+
+# --- Seed ------------------------------------------------------------------------
+
+def migrate(url: str):
+    """Esquema, índices e badges padrão pelas migrações, como em produção."""
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"],
+                   cwd="api", env=dict(os.environ, DATABASE_URL=url), capture_output=True, check=True)
+
+
+def tune_sqlite(conn):
+    # Banco descartável de benchmark: sem journal nem fsync durante a carga
+    for pragma in ("journal_mode=OFF", "synchronous=OFF", "temp_store=MEMORY", "cache_size=-262144"):
+        conn.exec_driver_sql(f"PRAGMA {pragma}")
+
+
+def seed_users(conn, users: int):
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import insert, select
+
+    from app.models import Subject, User
+
+    conn.execute(insert(User), [
+        {"email": f"seed{i}@example.com", "username": f"seed{i}", "hashed_password": "x",
+         "total_points": 0, "current_streak": 0, "last_activity_date": BASE_DATE, "created_at": BASE_DATE}
+        for i in range(users)
+    ])
+    user_ids = list(conn.execute(
+        select(User.id).where(User.email.like("seed%@example.com")).order_by(User.id)
+    ).scalars())
+    conn.execute(insert(Subject), [
+        {"name": name, "owner_id": user_id, "created_at": BASE_DATE}
+        for user_id in user_ids for name in SUBJECTS
+    ])
+    return user_ids
+
+
+def seed_tasks(conn, generator: TaskGenerator, total: int, batch_size: int):
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import insert
+
+    from app.models import Task
+
+    # insert() do Core compilado uma vez; os lotes vão como tuplas direto para o
+    # executemany do driver. Com dicionários (conn.execute(insert(Task), rows)) o
+    # SQLAlchemy processa cada parâmetro em Python, o que domina o tempo em 10M linhas.
+    statement = insert(Task.__table__).compile(conn, column_keys=list(TASK_COLUMNS))
+    assert tuple(statement.positiontup) == TASK_COLUMNS, statement.positiontup
+
+    inserted = 0
+    started = time.perf_counter()
+    while inserted < total:
+        rows = generator.batch(min(batch_size, total - inserted))
+        conn.exec_driver_sql(statement.string, rows)
+        inserted += len(rows)
+        rate = inserted / (time.perf_counter() - started)
+        print(f"  {inserted:>12,} tarefas  ({rate:,.0f}/s)", end="\r")
+    print()
+
+
+def fill_user_stats(conn, stats):
+    """
+    Contadores desnormalizados (user_stats e users.total_points) já consistentes
+    com as tarefas geradas: os pontos do usuário são a soma dos pontos das tarefas concluídas.
+    """
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import bindparam, delete, insert, update
+
+    from app.models import User, UserStats
+
+    stats = list(stats)
+    conn.execute(delete(UserStats))
+    conn.execute(insert(UserStats), [
+        {"user_id": owner, "completed_count": completed, "pending_count": pending,
+         "task_points": points, "data_version": 0}
+        for owner, completed, pending, points in stats
+    ])
+    conn.execute(
+        update(User).where(User.id == bindparam("owner")).values(total_points=bindparam("points")),
+        [{"owner": owner, "points": points} for owner, _, _, points in stats],
+    )
+
+
+def command_seed(args):
+    url = args.url
+    if url.startswith("sqlite:///") and os.path.exists(sqlite_path(url)):
+        if not args.fresh:
+            raise SystemExit(f"{sqlite_path(url)} já existe (use --fresh para recriar)")
+        os.remove(sqlite_path(url))
+
+    sys.path.append(os.path.join(os.getcwd(), 'api'))
+    os.environ.setdefault("DATABASE_URL", url)
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+
+    from app.models import Task
+
+    timings = {}
+    started = time.perf_counter()
+    migrate(url)
+    timings["esquema"] = time.perf_counter() - started
+
+    engine = create_engine(url)
+    indexes = [] if args.keep_indexes else sorted(Task.__table__.indexes, key=lambda index: index.name)
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            tune_sqlite(conn)
+
+        step = time.perf_counter()
+        user_ids = seed_users(conn, args.users)
+        timings["usuários"] = time.perf_counter() - step
+
+        for index in indexes:
+            index.drop(conn)
+        step = time.perf_counter()
+        generator = TaskGenerator(user_ids, args.seed, args.skew, args.completed_ratio)
+        seed_tasks(conn, generator, args.tasks, args.batch_size)
+        timings["tarefas"] = time.perf_counter() - step
+
+        step = time.perf_counter()
+        for index in indexes:
+            index.create(conn)
+        timings["índices"] = time.perf_counter() - step
+
+        step = time.perf_counter()
+        fill_user_stats(conn, generator.stats())
+        if conn.dialect.name == "sqlite":
+            # Amostra limitada: estatísticas suficientes para o planejador sem ler 10M linhas
+            conn.exec_driver_sql("PRAGMA analysis_limit=1000")
+        if conn.dialect.name in ("sqlite", "postgresql"):
+            conn.exec_driver_sql("ANALYZE")
+        timings["estatísticas"] = time.perf_counter() - step
+    engine.dispose()
+
+    total = time.perf_counter() - started
+    print(f"{args.tasks:,} tarefas para {args.users:,} usuários em {total:.1f}s "
+          f"({args.tasks / max(timings['tarefas'], 1e-9):,.0f} tarefas/s na carga)")
+    for step_name, seconds in timings.items():
+        print(f"  {step_name:<13} {seconds:>7.1f}s")
+
+    if args.snapshot:
+        snapshot(sqlite_path(url), args.snapshot)
+
+
+# --- Snapshot / clone --------------------------------------------------------------
+
+def snapshot(source: str, destination: str):
+    """Cópia consistente via API de backup do sqlite3 (funciona com o banco aberto)."""
+    started = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+    backup_copy(source, destination)
+    print(f"Snapshot {destination} ({os.path.getsize(destination) / 2**20:,.0f} MiB) "
+          f"em {time.perf_counter() - started:.1f}s")
+
+
+def backup_copy(source: str, destination: str):
+    if os.path.exists(destination):
+        os.remove(destination)
+    with closing(sqlite3.connect(f"file:{source}?mode=ro", uri=True)) as src, \
+            closing(sqlite3.connect(destination)) as dst:
+        src.backup(dst)
+
+
+def clone(template: str, destination: str, method: str = "copy"):
+    """Banco novo a partir do modelo; 'copy' é uma cópia de arquivo (o modelo não pode estar em escrita)."""
+    if not os.path.exists(template):
+        raise SystemExit(f"modelo não encontrado: {template}")
+    started = time.perf_counter()
+    if method == "copy":
+        shutil.copyfile(template, destination)
+    else:
+        backup_copy(template, destination)
+    print(f"Clone {destination} ({method}) em {time.perf_counter() - started:.2f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="cria e popula um banco")
+    seed.add_argument("--url", default=DEFAULT_URL)
+    seed.add_argument("--users", type=int, default=10_000)
+    seed.add_argument("--tasks", type=int, default=1_000_000)
+    seed.add_argument("--seed", type=int, default=42, help="semente do gerador (dados reprodutíveis)")
+    seed.add_argument("--skew", type=float, default=1.0,
+                      help="expoente Zipf das tarefas por usuário (0 = uniforme)")
+    seed.add_argument("--completed-ratio", type=float, default=0.75)
+    seed.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    seed.add_argument("--keep-indexes", action="store_true",
+                      help="não remove os índices de tasks durante a carga")
+    seed.add_argument("--fresh", action="store_true", help="apaga o SQLite de destino se existir")
+    seed.add_argument("--snapshot", help="grava um modelo do banco populado neste arquivo")
+
+    snap = commands.add_parser("snapshot", help="copia um SQLite populado para um modelo")
+    snap.add_argument("source")
+    snap.add_argument("destination")
+
+    cln = commands.add_parser("clone", help="cria um banco a partir de um modelo")
+    cln.add_argument("template")
+    cln.add_argument("destination")
+    cln.add_argument("--method", choices=("copy", "backup"), default="copy")
+
+    args = parser.parse_args(argv)
+    if args.command == "seed":
+        command_seed(args)
+    elif args.command == "snapshot":
+        snapshot(args.source, args.destination)
+    else:
+        clone(args.template, args.destination, args.method)
+
+
+if __name__ == "__main__":
+    main()
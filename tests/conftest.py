@@ -1,13 +1,20 @@
 # tests/conftest.py
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 # Importações do seu projeto (ajuste se necessário)
 from app.database import Base, get_db
+from app.auth.auth_bearer import get_current_user
+from app.auth.auth_handler import clear_token_cache
+from app.auth.user_cache import clear_user_cache
 from app.main import app
+from app.models import User
+from app.services.badge_service import invalidate_badge_catalog
 
 # 1. Configuração do Banco de Dados de Teste
 # Usamos SQLite em memória (:memory:) porque é extremamente rápido
@@ -38,6 +45,10 @@ def db_session():
         db.close()
         # Destrói as tabelas para o próximo teste começar limpo
         Base.metadata.drop_all(bind=engine)
+        # Caches em memória guardam IDs do banco que acabou de ser destruído
+        invalidate_badge_catalog()
+        clear_token_cache()
+        clear_user_cache()
 
 # 3. Fixture do Cliente (client)
 # Simula o navegador/Postman. Intercepta a dependência 'get_db'
@@ -57,4 +68,81 @@ def client(db_session):
         yield c
 
     # Limpa a substituição após o teste
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+
+# 4. Usuário autenticado (login_as)
+# Uso: login_as(user_id). O usuário é re-buscado a cada requisição: os commits
+# das rotas expiram o objeto compartilhado com o db_session do teste.
+@pytest.fixture
+def login_as(db_session):
+    def login(user_id: int):
+        app.dependency_overrides[get_current_user] = lambda: db_session.get(User, user_id)
+
+    yield login
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+# 5. Orçamento de queries (query_budget)
+# Conta os comandos SQL emitidos dentro do bloco e falha, listando todos eles,
+# quando passam do máximo declarado. Protege contra N+1 que voltem sem alarde.
+class QueryCounter:
+    def __init__(self, bind):
+        self.bind = bind
+        self.statements = []
+        # COMMITs reais da conexão (savepoints não disparam este evento)
+        self.commits = 0
+
+    def _record(self, _conn, _cursor, statement, parameters, _context, executemany):
+        self.statements.append((statement, parameters, executemany))
+
+    def _record_commit(self, _conn):
+        self.commits += 1
+
+    def __enter__(self):
+        event.listen(self.bind, "before_cursor_execute", self._record)
+        event.listen(self.bind, "commit", self._record_commit)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.bind, "before_cursor_execute", self._record)
+        event.remove(self.bind, "commit", self._record_commit)
+
+    def matching(self, prefix: str) -> list:
+        """Comandos que começam com prefix (ex.: "UPDATE tasks")."""
+        return [statement for statement, _, _ in self.statements if statement.startswith(prefix)]
+
+    def __len__(self):
+        return len(self.statements)
+
+    def report(self) -> str:
+        lines = []
+        for number, (statement, parameters, executemany) in enumerate(self.statements, 1):
+            many = " (executemany)" if executemany else ""
+            lines.append(f"  {number}. {' '.join(statement.split())}{many}\n     params: {parameters!r}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def assert_max_queries(bind, budget: int, label: str = ""):
+    with QueryCounter(bind) as counter:
+        yield counter
+    if len(counter) > budget:
+        pytest.fail(
+            f"{label or 'Bloco'} executou {len(counter)} comandos SQL "
+            f"(orçamento: {budget}):\n{counter.report()}",
+            pytrace=False,
+        )
+
+
+@pytest.fixture
+def query_budget(db_session):
+    """
+    Uso: with query_budget(3, "GET /tasks/"): client.get("/tasks/")
+    Por padrão conta no engine de teste; bind=... aceita outro engine
+    (para AsyncEngine, passe async_engine.sync_engine).
+    """
+    def budget(max_statements: int, label: str = "", bind=None):
+        return assert_max_queries(bind if bind is not None else engine, max_statements, label)
+
+    return budget
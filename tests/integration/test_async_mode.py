@@ -0,0 +1,240 @@
+"""Routers assíncronos (DB_MODE=async) sobre aiosqlite."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.auth.auth_handler import create_access_token
+from app.database import Base, get_async_db, settings, to_async_url
+from app.models import Task, User
+from app.routers.aio import subjects, tasks, users
+from app.services.badge_service import initialize_badges
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    """App só com os routers assíncronos, sobre um SQLite em arquivo temporário."""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+
+    seed = sessionmaker(bind=sync_engine)()
+    initialize_badges(seed)
+    user = User(email="async@example.com", username="asyncuser", hashed_password="x")
+    seed.add(user)
+    seed.commit()
+    token = create_access_token({"sub": str(user.id)})
+    seed.close()
+
+    # NullPool: cada TestClient roda seu próprio event loop; conexões não podem ser reaproveitadas entre eles
+    async_engine = create_async_engine(to_async_url(url), poolclass=NullPool)
+    session_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    for module in (tasks, subjects, users):
+        app.include_router(module.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Para os orçamentos de queries (eventos de cursor ficam no engine síncrono interno)
+    app.state.async_engine = async_engine
+
+    with TestClient(app, headers={"Authorization": f"Bearer {token}"}) as client:
+        yield client, sync_engine
+
+    sync_engine.dispose()
+
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///./db.sqlite") == "sqlite+aiosqlite:///./db.sqlite"
+    assert to_async_url("postgresql://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    assert to_async_url("postgresql+psycopg2://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    with pytest.raises(ValueError):
+        to_async_url("mysql://u:p@host/db")
+
+
+def test_async_task_lifecycle(async_client):
+    client, sync_engine = async_client
+
+    created = client.post("/tasks/", json={"title": "Lista 1", "subject": "Cálculo I", "weight": 2})
+    assert created.status_code == 201
+    task_id = created.json()["id"]
+
+    fetched = client.get(f"/tasks/{task_id}")
+    assert fetched.json()["title"] == "Lista 1"
+    assert client.get(f"/tasks/{task_id}", headers={"If-None-Match": fetched.headers["ETag"]}).status_code == 304
+    assert client.get("/tasks/999999", headers={"If-None-Match": fetched.headers["ETag"]}).status_code == 404
+    assert client.put(f"/tasks/{task_id}", json={"weight": 3}).json()["weight"] == 3
+    assert client.get("/tasks/subjects/list").json() == ["Cálculo I"]
+    assert client.get("/tasks/export.csv").text.splitlines()[1:] == [f"{task_id},Lista 1,0,Pending"]
+    ndjson = client.get("/tasks/export", params={"format": "ndjson"}, headers={"Accept-Encoding": "gzip"})
+    assert ndjson.headers["content-encoding"] == "gzip"
+    assert ndjson.json()["id"] == task_id
+
+    completed = client.patch(f"/tasks/{task_id}/complete")
+    assert completed.status_code == 200
+    body = completed.json()
+    assert body["points_earned"] == 30
+    assert body["task"]["is_completed"] is True
+    assert "Primeira Tarefa" in [badge["name"] for badge in body["badges_earned"]]
+
+    assert client.patch(f"/tasks/{task_id}/complete").status_code == 400
+
+    dashboard = client.get("/users/dashboard").json()
+    assert dashboard["user"]["total_points"] == 30
+    assert len(dashboard["tasks"]) == 1
+    assert dashboard["badges"][0]["badge"]["name"] == "Primeira Tarefa"
+
+    stats = client.get("/users/stats").json()
+    assert (stats["completed_tasks"], stats["pending_tasks"], stats["completion_rate"]) == (1, 0, 100.0)
+    assert client.get("/users/stats/by-subject").json() == [
+        {"subject": "Cálculo I", "total_tasks": 1, "completed_tasks": 1, "total_points": 30}
+    ]
+
+    assert client.delete(f"/tasks/{task_id}").status_code == 204
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+
+    with sessionmaker(bind=sync_engine)() as db:
+        assert db.query(Task).count() == 0
+
+
+def test_async_list_tasks_cursor(async_client):
+    client, _ = async_client
+    for i in range(5):
+        client.post("/tasks/", json={"title": f"Tarefa {i}", "subject": "Geral", "weight": i + 1})
+
+    first = client.get("/tasks/", params={"limit": 3})
+    assert [t["weight"] for t in first.json()] == [5, 4, 3]
+
+    rest = client.get("/tasks/", params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]})
+    assert [t["weight"] for t in rest.json()] == [2, 1]
+    assert "X-Next-Cursor" not in rest.headers
+
+    assert client.get("/tasks/", params={"cursor": "lixo"}).status_code == 400
+
+
+def test_async_fast_json_matches_default(async_client, monkeypatch):
+    client, _ = async_client
+    items = [{"title": f"Tarefa {i}", "subject": "Geral", "weight": i % 3 + 1} for i in range(6)]
+    task_ids = [task["id"] for task in client.post("/tasks/bulk", json={"tasks": items}).json()["created"]]
+    client.patch("/tasks/complete", json={"task_ids": task_ids[:2]})
+
+    responses = {}
+    for enabled in (False, True):
+        monkeypatch.setattr(settings, "FAST_JSON_ENABLED", enabled)
+        responses[enabled] = [client.get("/tasks/", params={"limit": 4}), client.get("/users/dashboard")]
+
+    (default_list, default_dashboard), (fast_list, fast_dashboard) = responses[False], responses[True]
+    assert fast_list.content == default_list.content
+    assert fast_list.headers["X-Next-Cursor"] == default_list.headers["X-Next-Cursor"]
+    assert fast_dashboard.content == default_dashboard.content
+    assert fast_dashboard.headers["ETag"] == default_dashboard.headers["ETag"]
+
+
+def test_async_sparse_fields(async_client):
+    client, _ = async_client
+    client.post("/tasks/bulk", json={"tasks": [{"title": f"Tarefa {i}", "subject": "Geral"} for i in range(3)]})
+
+    listed = client.get("/tasks/", params={"fields": "title,is_completed", "limit": 2})
+    dashboard = client.get("/users/dashboard", params={"fields": "subject"})
+
+    assert [set(task) for task in listed.json()] == [{"id", "title", "is_completed"}] * 2
+    assert "X-Next-Cursor" in listed.headers
+    assert [set(task) for task in dashboard.json()["tasks"]] == [{"id", "subject"}] * 3
+    assert client.get("/tasks/", params={"fields": "owner"}).status_code == 400
+
+
+def test_async_bulk_create(async_client):
+    client, _ = async_client
+    items = [{"title": f"Aula {i}", "subject": "Geral"} for i in range(3)] + [{"title": "x"}]
+
+    response = client.post("/tasks/bulk", json={"tasks": items, "partial": True})
+
+    assert response.status_code == 201
+    assert [task["title"] for task in response.json()["created"]] == ["Aula 0", "Aula 1", "Aula 2"]
+    assert response.json()["errors"][0]["index"] == 3
+    assert client.get("/users/stats").json()["pending_tasks"] == 3
+
+
+def test_async_complete_tasks_batch(async_client):
+    client, _ = async_client
+    task_ids = [
+        client.post("/tasks/", json={"title": f"Lista {i}", "subject": "Geral", "weight": 2}).json()["id"]
+        for i in range(3)
+    ]
+
+    response = client.patch("/tasks/complete", json={"task_ids": task_ids})
+
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()["tasks"]] == task_ids
+    assert response.json()["points_earned"] == 60
+    assert client.patch("/tasks/complete", json={"task_ids": task_ids[:1]}).status_code == 400
+    assert client.get("/users/stats").json()["completed_tasks"] == 3
+
+
+def test_async_subjects(async_client):
+    client, _ = async_client
+
+    created = client.post("/subjects/", json={"name": "Física"})
+    assert created.status_code == 201
+    assert client.post("/subjects/", json={"name": "Física"}).status_code == 400
+    assert [s["name"] for s in client.get("/subjects/").json()] == ["Física"]
+
+    assert client.delete(f"/subjects/{created.json()['id']}").status_code == 204
+    assert client.delete(f"/subjects/{created.json()['id']}").status_code == 404
+
+
+# (método, caminho, orçamento), como em test_query_budgets.py para os routers
+# síncronos. O selectinload do dashboard custa duas consultas a mais que o joinedload.
+ASYNC_READ_BUDGETS = [
+    ("GET", "/tasks/", 2),
+    ("GET", "/tasks/export.csv", 2),
+    ("GET", "/tasks/{task_id}", 2),
+    ("GET", "/tasks/subjects/list", 2),
+    ("GET", "/subjects/", 2),
+    ("GET", "/users/me", 0),
+    ("GET", "/users/dashboard", 5),
+    ("GET", "/users/stats", 2),
+    ("GET", "/users/stats/by-subject", 2),
+]
+
+
+@pytest.mark.parametrize("size", [5, 50])
+def test_async_query_budgets(async_client, query_budget, size):
+    client, _ = async_client
+    bind = client.app.state.async_engine.sync_engine
+    items = [{"title": f"Tarefa {i}", "subject": f"Disciplina {i % 5}"} for i in range(size)]
+    task_ids = [task["id"] for task in client.post("/tasks/bulk", json={"tasks": items}).json()["created"]]
+    client.patch("/tasks/complete", json={"task_ids": task_ids[::2]})
+    client.post("/subjects/", json={"name": "Química"})
+    client.get("/users/me")
+
+    for method, path, budget in ASYNC_READ_BUDGETS:
+        with query_budget(budget, f"{method} {path}", bind):
+            assert client.request(method, path.format(task_id=task_ids[0])).status_code == 200
+
+    with query_budget(4, "POST /tasks/", bind):
+        created = client.post("/tasks/", json={"title": "Nova", "subject": "Geral"})
+    assert created.status_code == 201
+    with query_budget(3, "POST /tasks/bulk", bind):
+        assert client.post("/tasks/bulk", json={"tasks": items[:20]}).status_code == 201
+    with query_budget(5, "PUT /tasks/{task_id}", bind):
+        assert client.put(f"/tasks/{task_ids[1]}", json={"weight": 7}).status_code == 200
+    with query_budget(9, "PATCH /tasks/{task_id}/complete", bind):
+        assert client.patch(f"/tasks/{task_ids[1]}/complete").status_code == 200
+    with query_budget(9, "PATCH /tasks/complete", bind):
+        assert client.patch("/tasks/complete", json={"task_ids": task_ids[3::2]}).status_code == 200
+    with query_budget(5, "DELETE /tasks/{task_id}", bind):
+        assert client.delete(f"/tasks/{created.json()['id']}").status_code == 204
+    with query_budget(5, "POST /subjects/", bind):
+        subject = client.post("/subjects/", json={"name": "Física"})
+    assert subject.status_code == 201
+    with query_budget(4, "DELETE /subjects/{subject_id}", bind):
+        assert client.delete(f"/subjects/{subject.json()['id']}").status_code == 204
@@ -2,6 +2,7 @@ from fastapi.testclient import TestClient
 from app.main import app
 from app.auth.auth_handler import create_access_token
 from app.models import User
+from app.auth.user_cache import invalidate_user_cache
 
 def test_auth_no_header(client):
     """
@@ -70,4 +71,44 @@ def test_auth_token_sub_invalid_format(client):
     headers = {"Authorization": f"Bearer {token}"}
     response = client.get("/users/me", headers=headers)
 
-    assert response.status_code == 401 # Atualizado de 403 para 401
\ No newline at end of file
+    assert response.status_code == 401 # Atualizado de 403 para 401
+
+
+def test_current_user_is_cached_between_requests(client, db_session):
+    """
+    Testa se o usuário autenticado é servido do cache dentro do TTL,
+    sem reler a tabela users, e se a invalidação explícita força a releitura.
+    """
+    user = User(email="cache@test.com", username="cacheuser", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    user_id = user.id
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+    assert client.get("/users/me", headers=headers).json()["username"] == "cacheuser"
+
+    # Alteração feita por fora da aplicação: o snapshot em cache ainda vale
+    db_session.get(User, user_id).username = "renomeado"
+    db_session.commit()
+    assert client.get("/users/me", headers=headers).json()["username"] == "cacheuser"
+
+    invalidate_user_cache(user_id)
+    assert client.get("/users/me", headers=headers).json()["username"] == "renomeado"
+
+
+def test_task_completion_invalidates_user_cache(client, db_session):
+    """Testa se concluir uma tarefa atualiza imediatamente os pontos em /users/me."""
+    user = User(email="pontos@test.com", username="pontos", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    assert client.get("/users/me", headers=headers).json()["total_points"] == 0
+
+    task = client.post("/tasks/", json={"title": "Lista 1", "subject": "BD", "weight": 3},
+                       headers=headers).json()
+    assert client.patch(f"/tasks/{task['id']}/complete", headers=headers).status_code == 200
+
+    assert client.get("/users/me", headers=headers).json()["total_points"] == 30
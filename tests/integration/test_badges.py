@@ -1,6 +1,6 @@
 # tests/unit/test_badges.py
 from app.models import User, Task, UserBadge, Badge
-from app.services.badge_service import initialize_badges, check_and_award_badges
+from app.services.badge_service import initialize_badges, check_and_award_badges, get_badge_catalog
 
 def test_initialize_badges_creation(db_session):
     """
@@ -105,4 +105,42 @@ def test_no_duplicate_badges(db_session):
     badges_round_2 = check_and_award_badges(user, db_session)
 
     # Não deve ganhar nada novo
-    assert len(badges_round_2) == 0
\ No newline at end of file
+    assert len(badges_round_2) == 0
+
+
+def test_streak_badge_uses_threshold_column(db_session):
+    """
+    Testa que badges de streak são concedidas pelo limiar streak_required,
+    e não pelo nome da badge.
+    """
+    badge = Badge(name="Maratonista", description="Streak de 5 dias", icon="🏃", streak_required=5)
+    user = User(email="maratona@example.com", username="maratona", hashed_password="123", current_streak=4)
+    db_session.add_all([badge, user])
+    db_session.commit()
+
+    # Streak 4: ainda não atingiu o limiar
+    assert check_and_award_badges(user, db_session) == []
+
+    user.current_streak = 5
+    new_badges = check_and_award_badges(user, db_session)
+
+    assert [b.name for b in new_badges] == ["Maratonista"]
+
+
+def test_badge_catalog_is_cached_and_invalidated(db_session):
+    """
+    Testa se o catálogo de badges é reutilizado entre chamadas
+    e recarregado quando uma badge é criada.
+    """
+    initialize_badges(db_session)
+    first = get_badge_catalog(db_session)
+
+    # Sem alterações: mesma instância, sem nova consulta
+    assert get_badge_catalog(db_session) is first
+
+    db_session.add(Badge(name="Nova", description="Nova badge", icon="🆕", points_required=5))
+    db_session.commit()
+
+    reloaded = get_badge_catalog(db_session)
+    assert reloaded is not first
+    assert "Nova" in [b.name for b in reloaded.by_points.badges]
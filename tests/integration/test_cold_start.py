@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.services.badge_service import DEFAULT_BADGES
+
+API_DIR = Path(__file__).resolve().parents[2] / "api"
+
+# Executado num processo novo: as configurações são lidas na importação de app.main
+PROBE = """
+import json, sys
+import app.main
+import app.database as database
+engine_at_import = database._engine is not None
+with database.SessionLocal() as db:
+    bound = str(db.get_bind().url)
+print(json.dumps({
+    "engine_at_import": engine_at_import,
+    "jose_imported": "jose" in sys.modules,
+    "bound": bound,
+}))
+"""
+
+
+def _import_app(tmp_path, cold_start):
+    db_path = tmp_path / "cold.db"
+    env = dict(os.environ, COLD_START_MODE=cold_start, DATABASE_URL=f"sqlite:///{db_path}")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=API_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1]), db_path
+
+
+def test_cold_start_import_does_not_touch_database(tmp_path):
+    """Em COLD_START_MODE, importar app.main não cria engine, esquema nem carrega o jose."""
+    result, db_path = _import_app(tmp_path, "true")
+
+    assert result["engine_at_import"] is False
+    assert result["jose_imported"] is False
+    # O engine é criado pela primeira sessão, com a URL configurada
+    assert result["bound"] == f"sqlite:///{db_path}"
+    assert inspect(create_engine(f"sqlite:///{db_path}")).get_table_names() == []
+
+
+def test_default_mode_still_creates_schema(tmp_path):
+    result, db_path = _import_app(tmp_path, "false")
+
+    assert result["engine_at_import"] is True
+    assert "tasks" in inspect(create_engine(f"sqlite:///{db_path}")).get_table_names()
+
+
+def test_default_mode_seeds_default_badges(tmp_path):
+    """Sem Alembic, o banco criado por create_all já sai com os badges padrão."""
+    _, db_path = _import_app(tmp_path, "false")
+    # Importar de novo não duplica os badges
+    _import_app(tmp_path, "false")
+
+    with create_engine(f"sqlite:///{db_path}").connect() as conn:
+        names = conn.execute(text("SELECT name FROM badges")).scalars().all()
+
+    assert sorted(names) == sorted(badge["name"] for badge in DEFAULT_BADGES)
+
+
+def test_default_mode_leaves_existing_schema_to_alembic(tmp_path):
+    """
+    Em um banco que já tem tabelas (ex.: criado antes do Alembic, sem
+    badges.streak_required), a importação não roda create_all nem
+    initialize_badges: o esquema é atualizado por `alembic upgrade head`.
+    """
+    db_path = tmp_path / "cold.db"
+    with create_engine(f"sqlite:///{db_path}").begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR)"))
+        conn.execute(text("CREATE TABLE badges (id INTEGER PRIMARY KEY, name VARCHAR)"))
+
+    _import_app(tmp_path, "false")
+
+    assert sorted(inspect(create_engine(f"sqlite:///{db_path}")).get_table_names()) == ["badges", "users"]
@@ -0,0 +1,114 @@
+import pytest
+
+from app.models import User
+from app.utils.etag import etag_matches, make_etag
+
+
+@pytest.fixture
+def etag_user(db_session, login_as):
+    user = User(email="etag@example.com", username="etag_user", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    login_as(user.id)
+    return user.id
+
+
+def _conditional_get(client, path, etag, **kwargs):
+    return client.get(path, headers={"If-None-Match": etag}, **kwargs)
+
+
+def test_etag_matches():
+    etag = make_etag("tasks", 1, 3)
+    assert etag.startswith('W/"tasks-1-3-')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'W/"outro", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches(make_etag("tasks", 1, 4), etag)
+    # Filtros/paginação mudam a representação; a ordem dos parâmetros não
+    assert make_etag("tasks", 1, 3, "limit=5&skip=0") == make_etag("tasks", 1, 3, "skip=0&limit=5")
+    assert make_etag("tasks", 1, 3, "limit=5") != make_etag("tasks", 1, 3, "limit=6")
+    assert make_etag("task", 1, 3, path="/tasks/1") != make_etag("task", 1, 3, path="/tasks/2")
+
+
+def test_not_modified_skips_task_queries(client, etag_user, query_budget):
+    client.post("/tasks/", json={"title": "Lista 1", "subject": "Cálculo I"})
+
+    first = client.get("/tasks/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    # O usuário (override do login_as) e a leitura de data_version: nenhuma query em tasks
+    with query_budget(2, "GET /tasks/ (304)") as queries:
+        cached = _conditional_get(client, "/tasks/", etag)
+
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    assert not any("FROM tasks" in sql for sql in queries.matching("SELECT"))
+
+
+@pytest.mark.parametrize("write", ["create", "update", "complete", "delete"])
+def test_task_writes_change_etag(client, db_session, etag_user, write):
+    task_id = client.post("/tasks/", json={"title": "Lista 1", "subject": "Cálculo I"}).json()["id"]
+    etag = client.get("/users/dashboard").headers["ETag"]
+    assert _conditional_get(client, "/users/dashboard", etag).status_code == 304
+
+    if write == "create":
+        client.post("/tasks/", json={"title": "Lista 2", "subject": "Física"})
+    elif write == "update":
+        client.put(f"/tasks/{task_id}", json={"title": "Lista 1 (revisada)"})
+    elif write == "complete":
+        client.patch(f"/tasks/{task_id}/complete")
+    else:
+        client.delete(f"/tasks/{task_id}")
+
+    response = _conditional_get(client, "/users/dashboard", etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_subject_writes_change_etag(client, db_session, etag_user):
+    etag = client.get("/subjects/").headers["ETag"]
+    assert _conditional_get(client, "/subjects/", etag).status_code == 304
+
+    subject_id = client.post("/subjects/", json={"name": "Química"}).json()["id"]
+    response = _conditional_get(client, "/subjects/", etag)
+    assert response.status_code == 200
+    assert [s["name"] for s in response.json()] == ["Química"]
+
+    etag = response.headers["ETag"]
+    client.delete(f"/subjects/{subject_id}")
+    assert _conditional_get(client, "/subjects/", etag).status_code == 200
+
+
+def test_etag_depends_on_query_and_user(client, db_session, etag_user, login_as):
+    client.post("/tasks/", json={"title": "Lista 1", "subject": "Cálculo I"})
+    etag = client.get("/tasks/", params={"completed": "false"}).headers["ETag"]
+
+    assert _conditional_get(client, "/tasks/", etag, params={"completed": "false"}).status_code == 304
+    assert _conditional_get(client, "/tasks/", etag, params={"completed": "true"}).status_code == 200
+
+    other = User(email="etag2@example.com", username="etag_user2", hashed_password="123")
+    db_session.add(other)
+    db_session.commit()
+    login_as(other.id)
+    assert _conditional_get(client, "/tasks/", etag, params={"completed": "false"}).status_code == 200
+
+
+
+def test_task_etag_depends_on_path(client, db_session, etag_user):
+    first_id, second_id = (
+        client.post("/tasks/", json={"title": f"Lista {i}", "subject": "Cálculo I"}).json()["id"]
+        for i in range(2)
+    )
+    etag = client.get(f"/tasks/{first_id}").headers["ETag"]
+
+    assert _conditional_get(client, f"/tasks/{first_id}", etag).status_code == 304
+    other = _conditional_get(client, f"/tasks/{second_id}", etag)
+    assert other.status_code == 200
+    assert other.json()["id"] == second_id
+    # O recurso é resolvido antes da comparação: id inexistente é 404, não 304
+    assert _conditional_get(client, "/tasks/999999", etag).status_code == 404
+    assert _conditional_get(client, "/tasks/999999", "*").status_code == 404
@@ -0,0 +1,110 @@
+"""
+Caminho rápido de serialização (FAST_JSON_ENABLED): mesma resposta, byte a byte,
+que o caminho padrão de GET /tasks/ e GET /users/dashboard.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.auth.auth_handler import create_access_token
+from app.database import settings
+from app.models import Badge, Task, User, UserBadge
+from app.services.badge_service import initialize_badges
+
+
+@pytest.fixture
+def seeded(client, db_session):
+    """Usuário com tarefas variadas (acentos, descrições nulas, datas nulas) e conquistas."""
+    initialize_badges(db_session)
+    user = User(email="fast@example.com", username="fastjson", hashed_password="x", total_points=40)
+    db_session.add(user)
+    db_session.flush()
+
+    now = datetime(2025, 3, 10, 14, 30, 15, 123456)
+    db_session.add_all(
+        Task(title=f"Revisão {i} – “prova”", description="Capítulos 1–3" if i % 3 else None,
+             subject=f"Cálculo {i % 2}", weight=i % 10 + 1, owner_id=user.id,
+             due_date=now + timedelta(days=i) if i % 4 else None,
+             is_completed=i % 2 == 0, completed_at=now if i % 2 == 0 else None,
+             points_awarded=20 if i % 2 == 0 else 0)
+        for i in range(12)
+    )
+    db_session.add_all(UserBadge(user_id=user.id, badge_id=badge.id)
+                       for badge in db_session.query(Badge).limit(2).all())
+    db_session.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    return client, headers
+
+
+def _get_both(client, monkeypatch, path, headers):
+    monkeypatch.setattr(settings, "FAST_JSON_ENABLED", False)
+    default = client.get(path, headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON_ENABLED", True)
+    fast = client.get(path, headers=headers)
+    assert default.status_code == fast.status_code == 200
+    return default, fast
+
+
+@pytest.mark.parametrize("path", [
+    "/tasks/?limit=5",
+    "/tasks/?completed=false",
+    "/tasks/?subject=Cálculo 1&skip=2",
+])
+def test_list_tasks_fast_json_matches_default(seeded, monkeypatch, path):
+    client, headers = seeded
+
+    default, fast = _get_both(client, monkeypatch, path, headers)
+
+    assert fast.content == default.content
+    assert fast.headers["content-type"] == default.headers["content-type"]
+    for header in ("ETag", "Cache-Control", "X-Next-Cursor"):
+        assert fast.headers.get(header) == default.headers.get(header)
+
+
+def test_list_tasks_fast_json_follows_cursor(seeded, monkeypatch):
+    client, headers = seeded
+    monkeypatch.setattr(settings, "FAST_JSON_ENABLED", True)
+
+    first = client.get("/tasks/?limit=5", headers=headers)
+    second = client.get(f"/tasks/?limit=5&cursor={first.headers['X-Next-Cursor']}", headers=headers)
+
+    ids = [task["id"] for task in first.json() + second.json()]
+    assert len(ids) == len(set(ids)) == 10
+    assert client.get("/tasks/?limit=5", headers={**headers, "If-None-Match": first.headers["ETag"]}).status_code == 304
+
+
+def test_dashboard_fast_json_matches_default(seeded, monkeypatch):
+    client, headers = seeded
+
+    default, fast = _get_both(client, monkeypatch, "/users/dashboard", headers)
+
+    # O caminho padrão não ordena as tarefas do JOIN; a comparação ignora a ordem
+    default_body, fast_body = default.json(), fast.json()
+    default_body["tasks"].sort(key=lambda task: task["id"])
+    assert fast_body == default_body
+    assert len(fast_body["tasks"]) == 12 and len(fast_body["badges"]) == 2
+    assert fast.headers["ETag"] == default.headers["ETag"]
+
+
+def test_fast_json_query_budgets(seeded, monkeypatch, query_budget):
+    client, headers = seeded
+    monkeypatch.setattr(settings, "FAST_JSON_ENABLED", True)
+    assert client.get("/users/me", headers=headers).status_code == 200
+
+    with query_budget(2, "GET /tasks/ (fast json)"):
+        assert client.get("/tasks/", headers=headers).status_code == 200
+    with query_budget(4, "GET /users/dashboard (fast json)"):
+        assert client.get("/users/dashboard", headers=headers).status_code == 200
+
+
+def test_dashboard_fast_json_reads_user_from_database(seeded, monkeypatch, db_session):
+    """O usuário do dashboard vem do banco, não do snapshot em cache da autenticação."""
+    client, headers = seeded
+    monkeypatch.setattr(settings, "FAST_JSON_ENABLED", True)
+    assert client.get("/users/dashboard", headers=headers).json()["user"]["total_points"] == 40
+
+    db_session.query(User).filter(User.username == "fastjson").update({"total_points": 99})
+    db_session.commit()
+
+    assert client.get("/users/dashboard", headers=headers).json()["user"]["total_points"] == 99
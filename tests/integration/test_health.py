@@ -0,0 +1,17 @@
+def test_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+def test_health_pool_reports_pool_metrics(client):
+    response = client.get("/health/pool")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    for key in ("size", "checked_out", "overflow", "max_overflow", "timeout", "wait", "held", "leaks"):
+        assert key in data
+    # A conexão usada pelo create_all da importação é devolvida ao pool
+    assert data["checked_out"] == 0
+    assert data["checkouts"] >= 1
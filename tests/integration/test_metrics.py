@@ -0,0 +1,65 @@
+import pytest
+
+from app.auth.auth_bearer import get_current_user
+from app.main import app
+from app.models import Task, User
+from app.utils.metrics import request_metrics
+
+
+@pytest.fixture
+def metrics_user(db_session):
+    request_metrics.attach(db_session.get_bind())
+    request_metrics.reset()
+
+    user = User(email="metrics@example.com", username="metrics_user", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+    db_session.add_all([Task(title=f"Lista {i}", subject="Física", owner_id=user_id) for i in range(3)])
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: db_session.get(User, user_id)
+    yield user_id
+    app.dependency_overrides = {}
+    request_metrics.reset()
+
+
+def _sample(text, name, **labels):
+    prefix = name + "{" + ",".join(f'{key}="{value}"' for key, value in labels.items())
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} não encontrado")
+
+
+def test_metrics_per_route_template(client, metrics_user):
+    response = client.get("/tasks/", headers={"Accept-Encoding": "identity"})
+    task_id = response.json()[0]["id"]
+    client.get(f"/tasks/{task_id}")
+    client.get("/tasks/999999")
+    client.get("/nao-existe")
+
+    text = client.get("/metrics").text
+
+    listed = {"method": "GET", "route": "/tasks/", "status": "200"}
+    assert _sample(text, "http_request_duration_seconds_count", **listed) == 1
+    assert _sample(text, "http_response_size_bytes_sum", **listed) == len(response.content)
+    # Versão do ETag + listagem de tarefas
+    assert _sample(text, "db_statements_per_request_sum", **listed) >= 2
+    assert _sample(text, "db_time_per_request_seconds_sum", **listed) > 0
+
+    # O template da rota, nunca o id cru
+    route = {"method": "GET", "route": "/tasks/{task_id}"}
+    assert _sample(text, "http_request_duration_seconds_count", **route, status="200") == 1
+    assert _sample(text, "http_request_duration_seconds_count", **route, status="404") == 1
+    assert f"/tasks/{task_id}\"" not in text
+    assert _sample(text, "http_request_duration_seconds_count",
+                   method="GET", route="<unmatched>", status="404") == 1
+
+
+def test_metrics_endpoint_content_type(client, metrics_user):
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE db_statements_per_request histogram" in response.text
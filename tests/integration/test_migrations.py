@@ -0,0 +1,126 @@
+# tests/integration/test_migrations.py
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import Base
+from app.models import UserStats
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "api" / "alembic.ini"
+
+
+def _alembic_config(url):
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def test_migrations_match_models(tmp_path):
+    """
+    Testa se `alembic upgrade head` gera as mesmas tabelas e índices declarados nos models.
+    Garante que migrations/ e models.py não fiquem dessincronizados.
+    """
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+
+    command.upgrade(_alembic_config(url), "head")
+
+    inspector = inspect(create_engine(url))
+    for table in Base.metadata.sorted_tables:
+        assert inspector.has_table(table.name)
+        migrated = {index["name"] for index in inspector.get_indexes(table.name)}
+        declared = {index.name for index in table.indexes}
+        assert declared <= migrated, f"Índices faltando em {table.name}: {declared - migrated}"
+
+
+def test_migrations_downgrade_to_base(tmp_path):
+    """Testa se as migrações podem ser desfeitas até o esquema vazio."""
+    url = f"sqlite:///{tmp_path / 'downgrade.db'}"
+    config = _alembic_config(url)
+
+    command.upgrade(config, "head")
+    command.downgrade(config, "base")
+
+    assert not inspect(create_engine(url)).has_table("tasks")
+
+
+def test_seed_migration_is_set_based_and_idempotent(tmp_path):
+    """
+    Testa a migração 0006 (antes feita no startup): tarefas sem disciplina vão
+    para "Geral", cada par (owner_id, subject) ganha uma disciplina e os
+    badges padrão são criados sem duplicar os que já existem.
+    """
+    from sqlalchemy import text
+
+    url = f"sqlite:///{tmp_path / 'seed.db'}"
+    config = _alembic_config(url)
+    command.upgrade(config, "0005")
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, username) VALUES (1, 'a@x.com', 'a'), (2, 'b@x.com', 'b')"))
+        conn.execute(text(
+            "INSERT INTO tasks (title, subject, owner_id) VALUES "
+            "('t1', NULL, 1), ('t2', '', 1), ('t3', 'Física', 1), ('t4', 'Física', 1), "
+            "('t5', 'Física', 2), ('t6', 'Química', 2)"
+        ))
+        conn.execute(text("INSERT INTO subjects (name, owner_id) VALUES ('Química', 2)"))
+        conn.execute(text("INSERT INTO badges (name, description, icon) VALUES ('Dedicado', 'já existia', '⭐')"))
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as conn:
+        assert conn.scalar(text("SELECT COUNT(*) FROM tasks WHERE subject IS NULL OR subject = ''")) == 0
+        subjects = conn.execute(text("SELECT owner_id, name FROM subjects ORDER BY owner_id, name")).all()
+        assert subjects == [(1, "Física"), (1, "Geral"), (2, "Física"), (2, "Química")]
+        badges = dict(conn.execute(text("SELECT name, description FROM badges")).all())
+        assert len(badges) == 7
+        assert badges["Dedicado"] == "já existia"
+        assert conn.scalar(text("SELECT streak_required FROM badges WHERE name = 'Streak Master'")) == 7
+
+    # downgrade + upgrade de novo não duplica nada
+    command.downgrade(config, "0005")
+    command.upgrade(config, "head")
+    with engine.connect() as conn:
+        assert conn.scalar(text("SELECT COUNT(*) FROM subjects")) == 4
+        assert conn.scalar(text("SELECT COUNT(*) FROM badges")) == 7
+    engine.dispose()
+
+
+def test_upgrade_database_created_before_alembic(tmp_path):
+    """
+    Testa `alembic upgrade head` em um banco do app anterior ao Alembic (sem
+    alembic_version) em que o create_all da importação já acrescentou user_stats:
+    as migrações só criam o que falta e o backfill cobre os usuários sem linha.
+    """
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    config = _alembic_config(url)
+    command.upgrade(config, "0001")
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE alembic_version"))
+        conn.execute(text("INSERT INTO users (id, email, username) VALUES (1, 'a@x.com', 'a'), (2, 'b@x.com', 'b')"))
+        conn.execute(text(
+            "INSERT INTO tasks (title, subject, owner_id, is_completed, points_awarded) VALUES "
+            "('t1', 'Física', 1, 1, 10), ('t2', 'Física', 1, 0, 0), ('t3', 'Física', 2, 1, 5)"
+        ))
+    UserStats.__table__.create(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO user_stats (user_id, completed_count, pending_count, task_points, data_version) "
+            "VALUES (2, 1, 0, 5, 3)"
+        ))
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as conn:
+        stats = conn.execute(text(
+            "SELECT user_id, completed_count, pending_count, task_points, data_version "
+            "FROM user_stats ORDER BY user_id"
+        )).all()
+        assert stats == [(1, 1, 1, 10, 0), (2, 1, 0, 5, 3)]
+        assert conn.scalar(text("SELECT streak_required FROM badges WHERE name = 'Streak Master'")) == 7
+    engine.dispose()
@@ -0,0 +1,123 @@
+"""
+Orçamento de comandos SQL por endpoint (fixture query_budget do conftest).
+
+Cada rota é medida com poucos e com muitos dados: o orçamento é o mesmo nos
+dois tamanhos, então um N+1 (como o que já existiu em GET /users/dashboard)
+estoura o limite e o teste lista os comandos executados. O usuário já está no
+cache de autenticação (GET /users/me antes da medição), como em produção.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.auth.auth_handler import create_access_token, get_password_hash
+from app.models import Badge, Subject, Task, User, UserBadge
+from app.services.badge_service import initialize_badges
+from app.services.stats_service import get_user_stats
+
+DATA_SIZES = (5, 50)
+
+
+@pytest.fixture(params=DATA_SIZES, ids=lambda size: f"{size}_tarefas")
+def seeded(request, client, db_session):
+    """Usuário com N tarefas (metade concluídas), N disciplinas e todos os badges."""
+    size = request.param
+    initialize_badges(db_session)
+    user = User(email="budget@example.com", username="budget",
+                hashed_password=get_password_hash("senha123"), total_points=10 * size)
+    db_session.add(user)
+    db_session.flush()
+
+    now = datetime.now()
+    tasks = [
+        Task(title=f"Tarefa {i}", subject=f"Disciplina {i % 5}", weight=i % 10 + 1,
+             owner_id=user.id, due_date=now + timedelta(days=i),
+             is_completed=i % 2 == 0, completed_at=now if i % 2 == 0 else None,
+             points_awarded=20 if i % 2 == 0 else 0)
+        for i in range(size)
+    ]
+    db_session.add_all(tasks)
+    db_session.add_all(Subject(name=f"Extra {i}", owner_id=user.id) for i in range(size))
+    db_session.add_all(UserBadge(user_id=user.id, badge_id=badge.id)
+                       for badge in db_session.query(Badge).all())
+    db_session.flush()
+    get_user_stats(user.id, db_session)  # contadores a partir das tarefas semeadas
+    db_session.commit()
+
+    pending = [task.id for task in tasks if not task.is_completed]
+    subject_id = db_session.query(Subject.id).filter(Subject.owner_id == user.id).first()[0]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    assert client.get("/users/me", headers=headers).status_code == 200
+    return {"client": client, "headers": headers, "pending": pending, "subject_id": subject_id}
+
+
+def _call(seeded, method, path, **kwargs):
+    path = path.format(task_id=seeded["pending"][0], subject_id=seeded["subject_id"])
+    return seeded["client"].request(method, path, headers=seeded["headers"], **kwargs)
+
+
+# (método, caminho, corpo, status esperado, orçamento)
+ENDPOINT_BUDGETS = [
+    # tasks
+    ("POST", "/tasks/", {"title": "Nova", "subject": "Geral"}, 201, 4),
+    ("POST", "/tasks/bulk", {"tasks": [{"title": f"Lote {i}", "subject": "Geral"} for i in range(20)]}, 201, 3),
+    ("GET", "/tasks/", None, 200, 2),
+    ("GET", "/tasks/?subject=Disciplina 1&completed=false", None, 200, 2),
+    ("GET", "/tasks/export.csv", None, 200, 2),
+    ("GET", "/tasks/{task_id}", None, 200, 2),
+    ("GET", "/tasks/subjects/list", None, 200, 2),
+    ("PUT", "/tasks/{task_id}", {"weight": 7}, 200, 5),
+    ("PATCH", "/tasks/{task_id}/complete", None, 200, 11),
+    ("PATCH", "/tasks/complete", "pending", 200, 10),
+    ("DELETE", "/tasks/{task_id}", None, 204, 4),
+    # subjects
+    ("POST", "/subjects/", {"name": "Química"}, 201, 5),
+    ("GET", "/subjects/", None, 200, 2),
+    ("DELETE", "/subjects/{subject_id}", None, 204, 4),
+    # users
+    ("GET", "/users/me", None, 200, 0),
+    ("GET", "/users/dashboard", None, 200, 3),
+    ("GET", "/users/stats", None, 200, 2),
+    ("GET", "/users/stats/by-subject", None, 200, 2),
+]
+
+
+@pytest.mark.parametrize(
+    "method, path, body, expected_status, budget", ENDPOINT_BUDGETS,
+    ids=[f"{method} {path}" for method, path, *_ in ENDPOINT_BUDGETS],
+)
+def test_endpoint_query_budget(seeded, query_budget, method, path, body, expected_status, budget):
+    if body == "pending":
+        body = {"task_ids": seeded["pending"]}
+
+    with query_budget(budget, f"{method} {path}"):
+        response = _call(seeded, method, path, json=body)
+
+    assert response.status_code == expected_status, response.text
+
+
+def test_auth_query_budget(seeded, query_budget):
+    client = seeded["client"]
+    user = {"email": "novo@example.com", "username": "novo", "password": "senha123"}
+
+    with query_budget(4, "POST /auth/register"):
+        assert client.post("/auth/register", json=user).status_code == 201
+
+    with query_budget(1, "POST /auth/login"):
+        response = client.post("/auth/login", json={"email": "budget@example.com", "password": "senha123"})
+    assert response.status_code == 200
+
+
+def test_query_budget_lists_statements_when_exceeded(client, db_session, query_budget):
+    db_session.add(User(email="over@example.com", username="over", hashed_password="x"))
+    db_session.commit()
+
+    with pytest.raises(pytest.fail.Exception) as failure:
+        with query_budget(1, "duas consultas"):
+            db_session.query(User).all()
+            db_session.query(Task).all()
+
+    message = str(failure.value)
+    assert "duas consultas executou 2 comandos SQL (orçamento: 1)" in message
+    assert "1. SELECT users.id" in message
+    assert "2. SELECT tasks.id" in message
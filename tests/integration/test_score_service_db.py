@@ -1,6 +1,8 @@
 # tests/unit/test_score_service_db.py
 from datetime import datetime, timedelta
-from app.models import User, Task
+from app.models import User, Task, UserStats
+from app.main import app
+from app.auth.auth_bearer import get_current_user
 from app.services.score_service import process_task_completion, update_user_streak
 
 def test_process_task_completion_success(db_session):
@@ -58,4 +60,37 @@ def test_streak_increment(db_session):
 
     # ASSERT
     assert streak_updated is True
-    assert user.current_streak == 6  # 5 + 1
\ No newline at end of file
+    assert user.current_streak == 6  # 5 + 1
+
+def test_user_stats_follow_task_lifecycle(client, db_session):
+    """
+    Testa se os contadores desnormalizados (UserStats) acompanham
+    criação, conclusão e exclusão de tarefas feitas pelos endpoints.
+    """
+    # ARRANGE: uma tarefa antiga, criada antes da linha de estatísticas existir
+    user = User(email="stats@example.com", username="statsuser", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    user_id = user.id
+    db_session.add(Task(title="Antiga", subject="BD", owner_id=user_id,
+                        is_completed=True, points_awarded=30))
+    db_session.commit()
+
+    # O client fecha a sessão a cada requisição; recarregamos o usuário em cada chamada
+    app.dependency_overrides[get_current_user] = lambda: db_session.get(User, user_id)
+
+    # ACT
+    first = client.post("/tasks/", json={"title": "Nova 1", "subject": "BD", "weight": 2}).json()
+    second = client.post("/tasks/", json={"title": "Nova 2", "subject": "BD", "weight": 1}).json()
+    client.patch(f"/tasks/{first['id']}/complete")
+    client.delete(f"/tasks/{second['id']}")
+
+    # ASSERT: backfill (1 concluída, 30 pts) + conclusão da "Nova 1" (20 pts)
+    stats = db_session.get(UserStats, user_id)
+    db_session.refresh(stats)
+    assert stats.completed_count == 2
+    assert stats.pending_count == 0
+    assert stats.task_points == 50
+
+    app.dependency_overrides = {}
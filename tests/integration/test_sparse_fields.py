@@ -0,0 +1,92 @@
+"""Campos esparsos (?fields=) em GET /tasks/ e GET /users/dashboard."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.auth.auth_handler import create_access_token
+from app.models import Badge, Task, User, UserBadge
+from app.services.badge_service import initialize_badges
+
+LIST_VIEW = "title,subject,due_date,is_completed"
+
+
+@pytest.fixture
+def seeded(client, db_session):
+    initialize_badges(db_session)
+    user = User(email="sparse@example.com", username="sparse", hashed_password="x")
+    db_session.add(user)
+    db_session.flush()
+    now = datetime(2025, 5, 2, 9, 0)
+    db_session.add_all(
+        Task(title=f"Lista {i}", description="x" * 900, subject="Física", weight=i % 5 + 1,
+             owner_id=user.id, due_date=now + timedelta(days=i % 3),
+             is_completed=i % 2 == 0, points_awarded=10 if i % 2 == 0 else 0)
+        for i in range(7)
+    )
+    db_session.add(UserBadge(user_id=user.id, badge_id=db_session.query(Badge.id).first()[0]))
+    db_session.commit()
+    return client, {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+def test_list_tasks_returns_only_requested_fields(seeded, query_budget):
+    client, headers = seeded
+    full = client.get("/tasks/", headers=headers).json()
+
+    with query_budget(2, "GET /tasks/?fields=") as queries:
+        response = client.get("/tasks/", params={"fields": LIST_VIEW}, headers=headers)
+
+    assert response.status_code == 200
+    keys = {"id", "title", "subject", "due_date", "is_completed"}
+    assert response.json() == [{key: task[key] for key in keys} for task in full]
+    assert list(response.json()[0]) == ["title", "subject", "due_date", "id", "is_completed"]
+    tasks_select = next(sql for sql in queries.matching("SELECT") if "FROM tasks" in sql)
+    assert "description" not in tasks_select
+
+
+def test_sparse_list_keeps_cursor_pagination(seeded):
+    client, headers = seeded
+
+    first = client.get("/tasks/", params={"fields": "title", "limit": 4}, headers=headers)
+    rest = client.get("/tasks/", params={"fields": "title", "limit": 4,
+                                          "cursor": first.headers["X-Next-Cursor"]}, headers=headers)
+
+    assert [set(task) for task in first.json()] == [{"id", "title"}] * 4
+    ids = [task["id"] for task in first.json() + rest.json()]
+    assert sorted(ids) == sorted(set(ids)) and len(ids) == 7
+
+
+def test_sparse_fields_change_the_etag(seeded):
+    client, headers = seeded
+
+    full = client.get("/tasks/", headers=headers)
+    sparse = client.get("/tasks/", params={"fields": "title"}, headers=headers)
+
+    assert full.headers["ETag"] != sparse.headers["ETag"]
+    revalidated = client.get("/tasks/", params={"fields": "title"},
+                             headers={**headers, "If-None-Match": sparse.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_dashboard_sparse_tasks(seeded):
+    client, headers = seeded
+    full = client.get("/users/dashboard", headers=headers).json()
+
+    sparse = client.get("/users/dashboard", params={"fields": "title,is_completed"}, headers=headers).json()
+
+    assert sparse["user"] == full["user"]
+    assert sparse["badges"] == full["badges"]
+    assert sorted(sparse["tasks"], key=lambda task: task["id"]) == sorted(
+        ({"title": t["title"], "id": t["id"], "is_completed": t["is_completed"]} for t in full["tasks"]),
+        key=lambda task: task["id"],
+    )
+
+
+@pytest.mark.parametrize("path", ["/tasks/", "/users/dashboard"])
+@pytest.mark.parametrize("fields", ["title,senha", ""])
+def test_invalid_fields_are_rejected(seeded, path, fields):
+    client, headers = seeded
+
+    response = client.get(path, params={"fields": fields}, headers=headers)
+
+    assert response.status_code == 400
+    assert "Campos inválidos" in response.json()["detail"]
@@ -1,7 +1,14 @@
 # tests/unit/test_tasks.py
-from app.models import User, Task
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+from app.models import User, Task, UserBadge, UserStats
 from app.main import app
 from app.auth.auth_bearer import get_current_user
+from app.services.badge_service import initialize_badges
 
 def test_create_task(client, db_session):
     """
@@ -74,4 +81,318 @@ def test_list_tasks(client, db_session):
     assert len(data) == 1
     assert data[0]["title"] == "Tarefa Existente"
 
-    app.dependency_overrides = {}
\ No newline at end of file
+    app.dependency_overrides = {}
+
+def test_list_tasks_cursor_pagination(client, db_session):
+    """
+    Testa a paginação por cursor (keyset) da rota GET /tasks/.
+    Percorre todas as páginas e verifica que nenhuma tarefa se repete ou é perdida.
+    """
+    # 1. ARRANGE: datas repetidas e nulas para exercitar os desempates
+    user = User(email="cursor@example.com", username="cursoruser", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+
+    due_dates = [datetime(2025, 1, 1), datetime(2025, 1, 2), None]
+    tasks = [
+        Task(title=f"Tarefa {i}", subject="BD", owner_id=user.id,
+             weight=(i % 3) + 1, due_date=due_dates[i % 3])
+        for i in range(7)
+    ]
+    db_session.add_all(tasks)
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    # 2. ACT: página a página seguindo o X-Next-Cursor
+    seen = []
+    response = client.get("/tasks/", params={"limit": 3})
+    while True:
+        assert response.status_code == 200
+        seen.extend(task["id"] for task in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        response = client.get("/tasks/", params={"limit": 3, "cursor": next_cursor})
+
+    # 3. ASSERT: mesma ordem da listagem completa, sem repetições
+    full = client.get("/tasks/", params={"limit": 100}).json()
+    assert seen == [task["id"] for task in full]
+    assert len(set(seen)) == 7
+
+    app.dependency_overrides = {}
+
+
+def test_list_tasks_cursor_seeks_index(client, db_session, query_budget):
+    """
+    A página por cursor deve começar por um limite de intervalo em due_date, para
+    o banco posicionar o índice na chave do cursor em vez de percorrer as
+    tarefas anteriores (o custo de uma página funda seria proporcional à posição).
+    """
+    user = User(email="seek@example.com", username="seekuser", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    db_session.add_all([
+        Task(title=f"Tarefa {i}", subject="BD", owner_id=user.id,
+             weight=(i % 3) + 1, due_date=datetime(2025, 1, 1 + i))
+        for i in range(5)
+    ])
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    cursor = client.get("/tasks/", params={"limit": 2}).headers["X-Next-Cursor"]
+    with query_budget(2) as queries:
+        response = client.get("/tasks/", params={"limit": 2, "cursor": cursor})
+    assert response.status_code == 200
+
+    # Um único trecho basta: ainda há tarefas com prazo depois do cursor
+    [(statement, params, _)] = [
+        query for query in queries.statements
+        if query[0].startswith("SELECT") and "FROM tasks" in query[0]
+    ]
+    plan = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).all()
+    assert any("due_date>?" in row[-1] for row in plan)
+
+    app.dependency_overrides = {}
+
+
+def test_list_tasks_invalid_cursor(client, db_session):
+    """Testa o erro 400 ao enviar um cursor adulterado."""
+    user = User(email="badcursor@example.com", username="badcursor", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    response = client.get("/tasks/", params={"cursor": "nao-e-um-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor de paginação inválido"
+
+    app.dependency_overrides = {}
+
+def test_export_tasks_csv(client, db_session):
+    """Testa GET /tasks/export.csv: CSV escapado, só com as tarefas do usuário."""
+    user = User(email="export@example.com", username="exporter", hashed_password="123")
+    other = User(email="other_export@example.com", username="other_exporter", hashed_password="123")
+    db_session.add_all([user, other])
+    db_session.commit()
+    db_session.refresh(user)
+
+    db_session.add_all([
+        Task(title='Resumo "capítulo 1", parte 2', subject="Geral", owner_id=user.id,
+             is_completed=True, points_awarded=20),
+        Task(title="Lista\ncom quebra", subject="Geral", owner_id=user.id),
+        Task(title="De outro usuário", subject="Geral", owner_id=other.id),
+    ])
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    response = client.get("/tasks/export.csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["ID", "Title", "Points", "Status"]
+    assert [row[1:] for row in rows[1:]] == [
+        ['Resumo "capítulo 1", parte 2', "20", "Completed"],
+        ["Lista\ncom quebra", "0", "Pending"],
+    ]
+
+    app.dependency_overrides = {}
+
+def test_export_tasks_ndjson_and_gzip(client, db_session):
+    """Testa os formatos NDJSON e gzip de GET /tasks/export."""
+    user = User(email="ndjson@example.com", username="ndjson_user", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    db_session.add_all([
+        Task(title=f"Tarefa {i}", subject="Geral", owner_id=user.id) for i in range(3)
+    ])
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    # Accept escolhe o formato; Accept-Encoding liga a compressão transparente
+    response = client.get("/tasks/export", headers={"Accept": "application/x-ndjson",
+                                                    "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-encoding"] == "gzip"
+    assert [json.loads(line)["title"] for line in response.text.splitlines()] == [
+        "Tarefa 0", "Tarefa 1", "Tarefa 2"
+    ]
+
+    # format=*.gz: o próprio arquivo baixado é um .gz
+    response = client.get("/tasks/export", params={"format": "csv.gz"},
+                          headers={"Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == "application/gzip"
+    assert "content-encoding" not in response.headers
+    assert gzip.decompress(response.content).decode().startswith("ID,Title,Points,Status\n")
+
+    assert client.get("/tasks/export", params={"format": "xml"}).status_code == 400
+
+    app.dependency_overrides = {}
+
+def test_export_csv_ignores_accept(client, db_session):
+    """GET /tasks/export.csv é sempre CSV: o Accept não muda o formato, só o gzip é negociado."""
+    user = User(email="csvonly@example.com", username="csv_only", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    db_session.add(Task(title="Tarefa 1", subject="Geral", owner_id=user.id))
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    response = client.get("/tasks/export.csv", params={"format": "ndjson"},
+                          headers={"Accept": "application/x-ndjson", "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"].split(", ")[0] == "accept-encoding"
+    assert response.text.startswith("ID,Title,Points,Status\n")
+
+    plain = client.get("/tasks/export.csv", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["ETag"] != response.headers["ETag"]
+
+    app.dependency_overrides = {}
+
+def test_create_tasks_bulk(client, db_session, query_budget):
+    """Testa POST /tasks/bulk: todas as tarefas numa única transação, na ordem enviada."""
+    user = User(email="bulk@example.com", username="bulk_user", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+    app.dependency_overrides[get_current_user] = lambda: db_session.get(User, user_id)
+
+    payload = {"tasks": [
+        {"title": f"Aula {i}", "subject": "Cálculo I", "weight": i % 10 + 1} for i in range(120)
+    ]}
+
+    # INSERT de várias linhas em lote, e não um por tarefa (inclui criar a linha de user_stats)
+    with query_budget(7, "POST /tasks/bulk"):
+        response = client.post("/tasks/bulk", json=payload)
+
+    assert response.status_code == 201
+    created = response.json()["created"]
+    assert [task["title"] for task in created] == [f"Aula {i}" for i in range(120)]
+    assert all(task["owner_id"] == user_id and task["id"] for task in created)
+    assert response.json()["errors"] == []
+
+    assert db_session.query(Task).filter(Task.owner_id == user_id).count() == 120
+    assert db_session.get(UserStats, user_id).pending_count == 120
+
+    app.dependency_overrides = {}
+
+def test_create_tasks_bulk_validation_errors(client, db_session):
+    """Sem partial, um item inválido rejeita o lote; com partial, os válidos são criados."""
+    user = User(email="bulkerr@example.com", username="bulk_err", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+    app.dependency_overrides[get_current_user] = lambda: db_session.get(User, user_id)
+
+    items = [
+        {"title": "Lista 1", "subject": "Física"},
+        {"title": "x", "subject": "Física"},
+        {"title": "Lista 3", "subject": "Física", "weight": 42},
+        {"title": "Lista 4", "subject": "Física"},
+    ]
+
+    response = client.post("/tasks/bulk", json={"tasks": items})
+    assert response.status_code == 422
+    assert [error["index"] for error in response.json()["detail"]] == [1, 2]
+    assert db_session.query(Task).filter(Task.owner_id == user_id).count() == 0
+
+    response = client.post("/tasks/bulk", json={"tasks": items, "partial": True})
+    assert response.status_code == 201
+    body = response.json()
+    assert [task["title"] for task in body["created"]] == ["Lista 1", "Lista 4"]
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+    assert body["errors"][0]["errors"][0]["loc"] == ["title"]
+
+    assert client.post("/tasks/bulk", json={"tasks": []}).status_code == 422
+
+    app.dependency_overrides = {}
+
+def test_complete_tasks_batch(client, db_session, query_budget):
+    """Testa PATCH /tasks/complete: pontos somados, badges avaliados uma vez, um único commit."""
+    initialize_badges(db_session)
+    user = User(email="batch@example.com", username="batch_user", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+    app.dependency_overrides[get_current_user] = lambda: db_session.get(User, user_id)
+
+    tasks = [Task(title=f"Lista {i}", subject="Física", weight=2, owner_id=user_id) for i in range(12)]
+    db_session.add_all(tasks)
+    db_session.commit()
+    task_ids = [task.id for task in tasks]
+
+    # Fixo para as 12 tarefas: um UPDATE tasks em lote; o resto é user_stats (criada
+    # aqui), catálogo de badges e um INSERT por badge ganho
+    with query_budget(17, "PATCH /tasks/complete") as queries:
+        # Ids repetidos contam uma vez só
+        response = client.patch("/tasks/complete", json={"task_ids": task_ids + task_ids[:2]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [task["id"] for task in body["tasks"]] == task_ids
+    assert all(task["is_completed"] and task["points_awarded"] == 20 for task in body["tasks"])
+    assert body["points_earned"] == 240
+    assert body["streak_updated"] is True
+    # Primeira Tarefa (1), Estudioso (10) e Dedicado (100 pts), avaliados sobre o estado final
+    assert sorted(badge["name"] for badge in body["badges_earned"]) == [
+        "Dedicado", "Estudioso", "Primeira Tarefa"
+    ]
+    assert len(queries.matching("UPDATE tasks")) == 1
+    assert queries.commits == 1
+
+    stats = db_session.get(UserStats, user_id)
+    db_session.refresh(stats)
+    assert (stats.completed_count, stats.pending_count, stats.task_points) == (12, 0, 240)
+    user = db_session.get(User, user_id)
+    db_session.refresh(user)
+    assert (user.total_points, user.current_streak) == (240, 1)
+    assert db_session.query(UserBadge).filter(UserBadge.user_id == user_id).count() == 3
+
+    app.dependency_overrides = {}
+
+def test_complete_tasks_batch_rejects_invalid_ids(client, db_session):
+    """O lote é recusado inteiro quando há id inexistente, de outro usuário ou já concluído."""
+    owner = User(email="batcherr@example.com", username="batch_err", hashed_password="123")
+    other = User(email="batchother@example.com", username="batch_other", hashed_password="123")
+    db_session.add_all([owner, other])
+    db_session.commit()
+    owner_id = owner.id
+
+    pending = Task(title="Pendente", subject="X", owner_id=owner_id)
+    done = Task(title="Feita", subject="X", owner_id=owner_id, is_completed=True)
+    foreign = Task(title="Alheia", subject="X", owner_id=other.id)
+    db_session.add_all([pending, done, foreign])
+    db_session.commit()
+    pending_id, done_id, foreign_id = pending.id, done.id, foreign.id
+    app.dependency_overrides[get_current_user] = lambda: db_session.get(User, owner_id)
+
+    response = client.patch("/tasks/complete", json={"task_ids": [pending_id, foreign_id, 9999]})
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Tarefas não encontradas: [{foreign_id}, 9999]"
+
+    response = client.patch("/tasks/complete", json={"task_ids": [pending_id, done_id]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Tarefas já concluídas: [{done_id}]"
+
+    assert client.patch("/tasks/complete", json={"task_ids": []}).status_code == 422
+    db_session.expire_all()
+    assert db_session.get(Task, pending_id).is_completed is False
+
+    app.dependency_overrides = {}
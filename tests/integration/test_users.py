@@ -1,7 +1,10 @@
 # tests/unit/test_users.py
+import pytest
+
 from app.models import User, Task, Badge, UserBadge
 from app.main import app
 from app.auth.auth_bearer import get_current_user
+from app.auth.user_cache import UserSnapshot
 
 def test_read_users_me(client, db_session):
     """
@@ -76,4 +79,87 @@ def test_read_user_dashboard(client, db_session):
     assert len(data["badges"]) == 1
     assert data["badges"][0]["badge"]["name"] == "Dash Badge"
 
-    app.dependency_overrides = {}
\ No newline at end of file
+    app.dependency_overrides = {}
+
+
+@pytest.fixture
+def stats_user_id(db_session):
+    """Usuário com 4 tarefas em 2 disciplinas (2 concluídas, 70 pontos) e 1 badge."""
+    user = User(email="stats@example.com", username="stats_user", hashed_password="123",
+                total_points=70, current_streak=2)
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+
+    db_session.add_all([
+        Task(title="Lista 1", subject="Cálculo I", owner_id=user.id, is_completed=True, points_awarded=30),
+        Task(title="Lista 2", subject="Cálculo I", owner_id=user.id),
+        Task(title="Relatório", subject="Física", owner_id=user.id, is_completed=True, points_awarded=40),
+        Task(title="Prova", subject="Física", owner_id=user.id),
+    ])
+    badge = Badge(name="Stats Badge", description="Teste", icon="🧪")
+    db_session.add(badge)
+    db_session.commit()
+    db_session.add(UserBadge(user_id=user.id, badge_id=badge.id))
+    db_session.commit()
+    return user.id
+
+
+def test_user_stats(client, stats_user_id, login_as):
+    """GET /users/stats: totais e taxa de conclusão (a linha user_stats é criada na primeira chamada)."""
+    login_as(stats_user_id)
+
+    for _ in range(2):
+        response = client.get("/users/stats")
+        assert response.status_code == 200
+        assert response.json() == {
+            "total_tasks": 4,
+            "completed_tasks": 2,
+            "pending_tasks": 2,
+            "total_points": 70,
+            "current_streak": 2,
+            "badges_count": 1,
+            "completion_rate": 50.0,
+        }
+
+
+def test_user_stats_single_query(client, db_session, stats_user_id, query_budget):
+    """Com a linha user_stats existente, /users/stats faz um único SELECT e nunca lê tarefas."""
+    # Snapshot, como o devolvido pelo cache de get_current_user: nenhuma query de usuário
+    snapshot = UserSnapshot.from_model(db_session.get(User, stats_user_id))
+    app.dependency_overrides[get_current_user] = lambda: snapshot
+    client.get("/users/stats")
+
+    # Cada rota: a leitura da versão para o ETag (user_stats.data_version) e a sua query
+    with query_budget(4, "GET /users/stats e /users/stats/by-subject") as queries:
+        client.get("/users/stats")
+        client.get("/users/stats/by-subject")
+
+    statements = [sql for sql, _, _ in queries.statements if "data_version" not in sql]
+    assert len(statements) == 2
+    assert "FROM tasks" not in statements[0]
+    assert "GROUP BY tasks.subject" in statements[1]
+
+    app.dependency_overrides = {}
+
+
+def test_user_stats_by_subject(client, stats_user_id, login_as):
+    login_as(stats_user_id)
+
+    response = client.get("/users/stats/by-subject")
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"subject": "Cálculo I", "total_tasks": 2, "completed_tasks": 1, "total_points": 30},
+        {"subject": "Física", "total_tasks": 2, "completed_tasks": 1, "total_points": 40},
+    ]
+
+
+def test_user_stats_without_tasks(client, db_session, login_as):
+    user = User(email="empty@example.com", username="empty_user", hashed_password="123")
+    db_session.add(user)
+    db_session.commit()
+    login_as(user.id)
+
+    assert client.get("/users/stats").json()["completion_rate"] == 0.0
+    assert client.get("/users/stats/by-subject").json() == []
@@ -0,0 +1,61 @@
+# tests/unit/test_auth_cache.py
+import time
+
+from app.auth import auth_handler
+from app.auth.auth_handler import clear_token_cache, create_access_token, verify_token
+from app.utils.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Testa se o cache respeita o limite de tamanho descartando o item menos usado."""
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")       # "a" passa a ser o mais recente
+    cache.set("c", 3)    # estoura o limite: "b" sai
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    """Testa se entradas vencidas não são devolvidas."""
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("curto", "valor", ttl_seconds=0.01)
+
+    time.sleep(0.02)
+
+    assert cache.get("curto") is None
+
+
+def test_verify_token_decodes_once(monkeypatch):
+    """
+    Testa se o mesmo token é decodificado (assinatura + claims) apenas uma vez
+    enquanto estiver no cache.
+    """
+    clear_token_cache()
+    token = create_access_token({"sub": "42"})
+    calls = []
+    original_decode = auth_handler.decode_jwt
+
+    def counting_decode(value):
+        calls.append(value)
+        return original_decode(value)
+
+    monkeypatch.setattr(auth_handler, "decode_jwt", counting_decode)
+
+    first = verify_token(token)
+    second = verify_token(token)
+
+    assert first["sub"] == "42"
+    assert second is first
+    assert len(calls) == 1
+
+
+def test_verify_token_rejects_invalid_token():
+    """Testa se tokens inválidos não entram no cache."""
+    clear_token_cache()
+
+    assert verify_token("token_invalido") is None
+    assert verify_token("token_invalido") is None
@@ -0,0 +1,91 @@
+# tests/unit/test_export.py
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.export import (
+    CsvEncoder,
+    NdjsonEncoder,
+    export_tasks_generator,
+    gzip_chunks,
+    negotiate_export,
+)
+
+
+def _task(task_id, title="Tarefa", completed=False):
+    return SimpleNamespace(id=task_id, title=title, points_awarded=10 if completed else 0,
+                           is_completed=completed)
+
+
+def test_export_generator_yields_chunks():
+    """O relatório sai em blocos de chunk_rows linhas, com o cabeçalho no primeiro."""
+    chunks = list(export_tasks_generator((_task(i) for i in range(1, 6)), chunk_rows=2))
+
+    assert len(chunks) == 3
+    assert chunks[0] == "ID,Title,Points,Status\n1,Tarefa,0,Pending\n2,Tarefa,0,Pending\n"
+    assert chunks[2] == "5,Tarefa,0,Pending\n"
+
+
+def test_export_generator_escapes_fields():
+    """Vírgulas, aspas e quebras de linha no título são escapadas pelo módulo csv."""
+    output = "".join(export_tasks_generator([_task(1, 'Prova, "final"\nP2', completed=True)]))
+
+    assert output == 'ID,Title,Points,Status\n1,"Prova, ""final""\nP2",10,Completed\n'
+
+
+def test_export_generator_empty():
+    assert list(export_tasks_generator([])) == ["ID,Title,Points,Status\n"]
+
+
+def test_ndjson_encoder():
+    output = "".join(export_tasks_generator([_task(1, "Prova\n\"final\"", completed=True), _task(2)],
+                                            encoder=NdjsonEncoder))
+
+    lines = output.splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == {"id": 1, "title": "Prova\n\"final\"", "points_awarded": 10,
+                                    "is_completed": True}
+    assert json.loads(lines[1])["is_completed"] is False
+
+
+def test_gzip_chunks_compresses_incrementally():
+    """Cada bloco é comprimido assim que chega; o resultado é um gzip válido."""
+    consumed = []
+
+    def chunks():
+        for i in range(200):
+            consumed.append(i)
+            yield f"{i},Tarefa repetida {i % 7},10,Completed\n" * 500
+
+    compressed = gzip_chunks(chunks())
+    first = next(compressed)
+    # O primeiro bloco comprimido sai sem que o gerador de origem tenha sido esgotado
+    assert first and len(consumed) < 200
+
+    data = first + b"".join(compressed)
+    expected = "".join(f"{i},Tarefa repetida {i % 7},10,Completed\n" * 500 for i in range(200))
+    assert gzip.decompress(data).decode() == expected
+    assert len(data) < len(expected) / 10
+
+
+def test_negotiate_export():
+    plan = negotiate_export(None, None, None)
+    assert (plan.encoder, plan.compressed) == (CsvEncoder, False)
+
+    plan = negotiate_export(None, "application/x-ndjson", "gzip, deflate")
+    assert (plan.encoder, plan.gzip_transport, plan.gzip_file) == (NdjsonEncoder, True, False)
+    assert plan.headers()["Content-Encoding"] == "gzip"
+
+    # O parâmetro format tem precedência sobre o Accept
+    plan = negotiate_export("csv", "application/x-ndjson", "gzip;q=0")
+    assert (plan.encoder, plan.compressed) == (CsvEncoder, False)
+
+    plan = negotiate_export("ndjson.gz", None, "gzip")
+    assert plan.gzip_file and not plan.gzip_transport
+    assert plan.media_type == "application/gzip"
+    assert "tasks.ndjson.gz" in plan.headers()["Content-Disposition"]
+
+    with pytest.raises(ValueError):
+        negotiate_export("xlsx", None, None)
@@ -0,0 +1,30 @@
+"""Testes unitários da validação de campos esparsos (app/utils/fieldsets.py)."""
+from datetime import datetime
+
+import pytest
+
+from app.utils.fieldsets import TASK_FIELDS, parse_task_fields, partial_task_model
+
+
+def test_parse_task_fields_orders_by_schema_and_adds_id():
+    assert parse_task_fields("due_date, title,subject,title") == ("title", "subject", "due_date", "id")
+
+
+def test_parse_task_fields_accepts_every_schema_field():
+    assert set(parse_task_fields(",".join(TASK_FIELDS))) == set(TASK_FIELDS)
+
+
+@pytest.mark.parametrize("raw", ["", " , ", "title,owner", "hashed_password"])
+def test_parse_task_fields_rejects_unknown_or_empty(raw):
+    with pytest.raises(ValueError, match="Campos inválidos"):
+        parse_task_fields(raw)
+
+
+def test_partial_task_model_is_cached_and_serializes_like_task():
+    fields = parse_task_fields("title,due_date")
+    model = partial_task_model(fields)
+
+    assert partial_task_model(fields) is model
+    assert list(model.model_fields) == ["title", "due_date", "id"]
+    dumped = model(title="Lista 1", due_date=datetime(2025, 3, 1, 8, 30), id=7).model_dump_json()
+    assert dumped == '{"title":"Lista 1","due_date":"2025-03-01T08:30:00","id":7}'
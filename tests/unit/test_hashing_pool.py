@@ -0,0 +1,47 @@
+# tests/unit/test_hashing_pool.py
+import asyncio
+import threading
+
+import pytest
+
+from app.auth.auth_handler import get_password_hash_async, verify_password_async
+from app.auth.hashing_pool import HashingPoolSaturated, PasswordHashingPool
+
+
+def test_async_hash_and_verify_roundtrip():
+    """Testa se hash e verificação pelo pool dedicado continuam compatíveis."""
+    async def scenario():
+        hashed = await get_password_hash_async("senha_segura")
+        return (
+            await verify_password_async("senha_segura", hashed),
+            await verify_password_async("senha_errada", hashed),
+        )
+
+    assert asyncio.run(scenario()) == (True, False)
+
+
+def test_pool_fails_fast_when_queue_is_full():
+    """
+    Testa se o pool recusa trabalho imediatamente quando a fila está cheia,
+    em vez de acumular requisições esperando.
+    """
+    pool = PasswordHashingPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(HashingPoolSaturated):
+            await pool.run(lambda: None)
+
+        release.set()
+        await busy
+        # Vaga liberada: volta a aceitar trabalho
+        return await pool.run(lambda: "ok")
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
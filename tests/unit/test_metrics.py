@@ -0,0 +1,32 @@
+from app.utils.metrics import Histogram, MetricsRegistry, RequestStats
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    lines = list(histogram.samples("latency", 'route="/x"'))
+
+    assert lines == [
+        'latency_bucket{route="/x",le="0.1"} 2',
+        'latency_bucket{route="/x",le="1"} 3',
+        'latency_bucket{route="/x",le="+Inf"} 4',
+        'latency_sum{route="/x"} 3.650000',
+        'latency_count{route="/x"} 4',
+    ]
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.observe("GET", "/tasks/{task_id}", 200, 0.02, 300, RequestStats(3, 0.004, 0.0))
+
+    text = registry.render()
+
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    labels = 'method="GET",route="/tasks/{task_id}",status="200"'
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'http_response_size_bytes_bucket{{{labels},le="512"}} 1' in text
+    assert f'db_statements_per_request_sum{{{labels}}} 3.000000' in text
+    assert f'db_time_per_request_seconds_count{{{labels}}} 1' in text
+    assert text.endswith("\n")
@@ -0,0 +1,101 @@
+import logging
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.utils.pool_monitor import InstrumentedQueuePool, PoolMonitor
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engines = []
+
+    def factory(monitor, **pool_kwargs):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            **pool_kwargs,
+        )
+        monitor.attach(engine)
+        engines.append(engine)
+        return engine
+
+    yield factory
+    for engine in engines:
+        engine.dispose()
+
+
+def test_snapshot_reports_pool_usage(make_engine):
+    monitor = PoolMonitor()
+    engine = make_engine(monitor, pool_size=2, max_overflow=1)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        data = monitor.snapshot(engine)
+        assert data["checked_out"] == 1
+        assert data["held"]["active"] == 1
+
+    data = monitor.snapshot(engine)
+    assert data["pool_class"] == "InstrumentedQueuePool"
+    assert data["size"] == 2
+    assert data["max_overflow"] == 1
+    assert data["checked_out"] == 0
+    assert data["checkouts"] == 1
+    assert data["wait"]["count"] == 1
+    assert data["leaks"] == []
+
+
+def test_wait_timeout_is_counted(make_engine):
+    monitor = PoolMonitor()
+    engine = make_engine(monitor, pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    data = monitor.snapshot(engine)
+    assert data["wait"]["timeouts"] == 1
+    assert data["wait"]["max_ms"] >= 50
+
+
+def test_leak_reported_with_checkout_stack(make_engine, caplog):
+    monitor = PoolMonitor(leak_threshold_seconds=0.001, capture_stacks=True)
+    engine = make_engine(monitor)
+
+    conn = engine.connect()
+    conn.execute(text("SELECT 1"))
+    time.sleep(0.01)
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.pool_monitor"):
+        leaks = monitor.find_leaks()
+        # Cada conexão é logada uma única vez, mesmo consultada de novo
+        monitor.find_leaks()
+        conn.close()
+
+    assert len(leaks) == 1
+    assert any("test_leak_reported_with_checkout_stack" in line for line in leaks[0]["stack"])
+    assert not any("sqlalchemy" in line for line in leaks[0]["stack"])
+    assert monitor.leaks_detected == 1
+    assert len(caplog.records) == 1
+
+
+def test_leak_detected_without_stack_by_default(make_engine, caplog):
+    """Sem capture_stacks o checkout guarda só o horário: nenhuma pilha é extraída."""
+    monitor = PoolMonitor(leak_threshold_seconds=0.001)
+    engine = make_engine(monitor)
+
+    with engine.connect():
+        time.sleep(0.01)
+        with caplog.at_level(logging.WARNING, logger="app.utils.pool_monitor"):
+            leaks = monitor.find_leaks()
+
+    assert len(leaks) == 1
+    assert leaks[0]["stack"] == []
+    assert "DB_LEAK_CAPTURE_STACKS" in caplog.records[0].getMessage()
+
+
+def test_leak_detection_disabled():
+    monitor = PoolMonitor(leak_threshold_seconds=0)
+    assert monitor.find_leaks() == []